@@ -0,0 +1,316 @@
+# BACKEND COMPILADO DO A* - EDROM 2025
+# O mesmo A* de candidato.Planner.search (estado célula x direção de chegada,
+# heurística octile, custos do CostModel e do DangerField) sobre arrays numpy
+# planos, compilado com Numba quando ele está instalado. candidato.a_star_search
+# (e com ele encontrar_caminho, PlanCache, plan_many e os simuladores) usa este
+# núcleo sozinho quando o Numba existe; sem ele tudo fica no caminho Python, com
+# os mesmos resultados.
+#
+# O núcleo (_search_kernel) é Python comum restrito ao que o Numba compila:
+# sem dicts, tuplas ou objetos, só arrays e escalares. A fila de prioridade é um
+# heap binário em três arrays (f, g, estado) com a mesma ordem das tuplas do
+# heapq, então os empates saem na mesma ordem e os caminhos são idênticos.
+#
+#   python acelerado.py --casos 200   confere a paridade com o caminho Python
+#   python -m pytest test_acelerado.py   a mesma conferência em sementes fixas
+import argparse
+import sys
+import threading
+from array import array
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+import candidato
+from candidato import HEADING_NONE, NUM_HEADINGS, SearchResult
+
+try:
+    import numba
+except ImportError:  # sem Numba: backend "python"
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+BACKENDS = ("python", "numba", "interpreted")  # "interpreted": o núcleo sem compilar, só para conferência
+BACKEND = "numba" if NUMBA_AVAILABLE else "python"
+
+INF = float('inf')
+
+def _search_kernel(blocked, offsets, danger, steps, multiplier, straight, diagonal, stride, start_state, goal,
+                   g_score, parent, stamp, generation):
+    """
+    Laço da estratégia "full" de Planner.search. Devolve (custo, células do
+    caminho da posição inicial ao objetivo, expansões, inserções); sem caminho, o
+    custo é inf e o array de células fica vazio.
+    """
+    capacidade = 1024
+    heap_f = np.empty(capacidade, dtype=np.float64)
+    heap_g = np.empty(capacidade, dtype=np.float64)
+    heap_s = np.empty(capacidade, dtype=np.int64)
+    goal_y = goal // stride
+    goal_x = goal % stride
+
+    start = start_state // NUM_HEADINGS
+    dx = abs(goal_x - start % stride)
+    dy = abs(goal_y - start // stride)
+    heap_f[0] = diagonal * dx + straight * (dy - dx) if dx < dy else diagonal * dy + straight * (dx - dy)
+    heap_g[0] = 0.0
+    heap_s[0] = start_state
+    n = 1
+    expansions = 0
+    pushes = 1
+
+    while n > 0:
+        # Retira o menor (f, g, estado)
+        g, state = heap_g[0], heap_s[0]
+        n -= 1
+        if n > 0:
+            uf, ug, us = heap_f[n], heap_g[n], heap_s[n]
+            i = 0
+            while True:
+                filho = 2 * i + 1
+                if filho >= n:
+                    break
+                outro = filho + 1
+                if outro < n and (heap_f[outro] < heap_f[filho] or (heap_f[outro] == heap_f[filho] and (
+                        heap_g[outro] < heap_g[filho] or (heap_g[outro] == heap_g[filho]
+                                                          and heap_s[outro] < heap_s[filho])))):
+                    filho = outro
+                if heap_f[filho] < uf or (heap_f[filho] == uf and (
+                        heap_g[filho] < ug or (heap_g[filho] == ug and heap_s[filho] < us))):
+                    heap_f[i], heap_g[i], heap_s[i] = heap_f[filho], heap_g[filho], heap_s[filho]
+                    i = filho
+                else:
+                    break
+            heap_f[i], heap_g[i], heap_s[i] = uf, ug, us
+
+        if g > g_score[state]:
+            continue  # entrada desatualizada: o estado já foi melhorado
+        cell = state // NUM_HEADINGS
+        heading = state % NUM_HEADINGS
+        if cell == goal:
+            tamanho = 0
+            atual = state
+            while atual != -1:
+                tamanho += 1
+                atual = parent[atual]
+            cells = np.empty(tamanho, dtype=np.int32)
+            atual = state
+            for k in range(tamanho - 1, -1, -1):
+                cells[k] = atual // NUM_HEADINGS
+                atual = parent[atual]
+            return g, cells, expansions, pushes
+        expansions += 1
+
+        for move in range(8):
+            next_cell = cell + offsets[move]
+            if blocked[next_cell]:
+                continue
+            tentative_g = g + (steps[heading, move] + danger[next_cell]) * multiplier
+            next_state = next_cell * NUM_HEADINGS + move
+            if stamp[next_state] != generation or tentative_g < g_score[next_state]:
+                stamp[next_state] = generation
+                g_score[next_state] = tentative_g
+                parent[next_state] = state
+                dx = abs(goal_x - next_cell % stride)
+                dy = abs(goal_y - next_cell // stride)
+                h = diagonal * dx + straight * (dy - dx) if dx < dy else diagonal * dy + straight * (dx - dy)
+                # Insere (f, g, estado), dobrando os arrays se encheram
+                if n == capacidade:
+                    capacidade *= 2
+                    novo_f = np.empty(capacidade, dtype=np.float64)
+                    novo_g = np.empty(capacidade, dtype=np.float64)
+                    novo_s = np.empty(capacidade, dtype=np.int64)
+                    novo_f[:n] = heap_f[:n]
+                    novo_g[:n] = heap_g[:n]
+                    novo_s[:n] = heap_s[:n]
+                    heap_f, heap_g, heap_s = novo_f, novo_g, novo_s
+                nf = tentative_g + h
+                i = n
+                n += 1
+                while i > 0:
+                    pai = (i - 1) // 2
+                    if nf < heap_f[pai] or (nf == heap_f[pai] and (
+                            tentative_g < heap_g[pai] or (tentative_g == heap_g[pai] and next_state < heap_s[pai]))):
+                        heap_f[i], heap_g[i], heap_s[i] = heap_f[pai], heap_g[pai], heap_s[pai]
+                        i = pai
+                    else:
+                        break
+                heap_f[i], heap_g[i], heap_s[i] = nf, tentative_g, next_state
+                pushes += 1
+
+    return INF, np.empty(0, dtype=np.int32), expansions, pushes
+
+# cache=True guarda a compilação em __pycache__; sem ele a primeira busca de cada
+# processo leva ~1 s compilando
+_compiled_kernel = numba.njit(cache=True)(_search_kernel) if NUMBA_AVAILABLE else None
+
+class CompiledPlanner:
+    """
+    Buffers do núcleo para um tamanho de grid fixo, no esquema de gerações do
+    candidato.Planner: g-scores, pais e carimbos em arrays numpy alocados uma vez.
+    """
+
+    def __init__(self, largura_grid: int, altura_grid: int):
+        self.largura = largura_grid
+        self.altura = altura_grid
+        states = (largura_grid + 2) * (altura_grid + 2) * NUM_HEADINGS
+        self._g_score = np.full(states, INF)
+        self._parent = np.full(states, -1, dtype=np.int64)
+        self._stamp = np.zeros(states, dtype=np.int64)
+        self._generation = 0
+        self._steps = {}  # (chave do modelo, tem_bola) -> array 9 x 8
+        self._zero_danger = None
+        self._offsets = np.array([dy * (largura_grid + 2) + dx for dx, dy in candidato.MOVES], dtype=np.int64)
+
+    def search(self, grid: candidato.OccupancyGrid, pos_inicial: Tuple[int, int], pos_objetivo: Tuple[int, int],
+               tem_bola: bool = False, danger_field: candidato.DangerField = None,
+               cost_model: candidato.CostModel = None, start_heading: int = None,
+               compiled: bool = True) -> SearchResult:
+        """Mesmo contrato de candidato.Planner.search com a estratégia "full" e a heurística padrão"""
+        if compiled and not NUMBA_AVAILABLE:
+            raise ValueError("Numba não está instalado; use compiled=False ou o backend 'python'")
+        if (grid.largura, grid.altura) != (self.largura, self.altura):
+            raise ValueError(
+                f"Planner {self.largura}x{self.altura} não serve para o grid {grid.largura}x{grid.altura}"
+            )
+        model = cost_model or candidato.DEFAULT_COST_MODEL
+        chave = (model.key(), bool(tem_bola))
+        steps = self._steps.get(chave)
+        if steps is None:
+            steps = self._steps[chave] = np.array(model.step_costs(tem_bola), dtype=np.float64)
+        multiplier = model.multiplier(tem_bola)
+        blocked = np.frombuffer(grid.blocked, dtype=np.uint8)
+        if danger_field is not None:
+            danger = danger_field.padded_array()
+        else:
+            if self._zero_danger is None:
+                self._zero_danger = np.zeros(len(grid.blocked))
+            danger = self._zero_danger
+
+        start = grid.index(*pos_inicial)
+        goal = grid.index(*pos_objetivo)
+        if grid.blocked[goal]:
+            return SearchResult(candidato.Path(stride=grid.stride), INF, 0, 0)
+
+        self._generation += 1
+        start_state = start * NUM_HEADINGS + (HEADING_NONE if start_heading is None else start_heading)
+        self._stamp[start_state] = self._generation
+        self._g_score[start_state] = 0.0
+        self._parent[start_state] = -1
+        kernel = _compiled_kernel if compiled else _search_kernel
+        cost, path_cells, expansions, pushes = kernel(
+            blocked, self._offsets, danger, steps, multiplier,
+            model.straight_cost * multiplier, min(model.diagonal_cost, 2 * model.straight_cost) * multiplier,
+            grid.stride, start_state, goal, self._g_score, self._parent, self._stamp, self._generation)
+        path = array('i')
+        path.frombytes(path_cells.tobytes())
+        return SearchResult(candidato.Path(path, grid.stride), float(cost), int(expansions), int(pushes))
+
+_planners = threading.local()
+
+def _shared_planner(largura_grid: int, altura_grid: int) -> CompiledPlanner:
+    """CompiledPlanner da thread atual, só o do último tamanho de grid (como candidato._shared_planner)"""
+    planner = getattr(_planners, 'planner', None)
+    if planner is None or (planner.largura, planner.altura) != (largura_grid, altura_grid):
+        planner = _planners.planner = CompiledPlanner(largura_grid, altura_grid)
+    return planner
+
+def a_star_search(grid: candidato.OccupancyGrid, pos_inicial: Tuple[int, int], pos_objetivo: Tuple[int, int],
+                  tem_bola: bool = False, danger_field: candidato.DangerField = None,
+                  cost_model: candidato.CostModel = None, start_heading: int = None,
+                  backend: str = None) -> SearchResult:
+    """
+    A* "full" com a heurística padrão no backend pedido (padrão: BACKEND, o
+    compilado quando há Numba). O backend "python" é candidato.a_star_search.
+    """
+    backend = backend or BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {backend!r} (use um de {BACKENDS})")
+    if backend == "python":
+        return candidato.a_star_search(grid, pos_inicial, pos_objetivo, tem_bola, danger_field, cost_model,
+                                       start_heading, backend="python")
+    return _shared_planner(grid.largura, grid.altura).search(
+        grid, pos_inicial, pos_objetivo, tem_bola, danger_field, cost_model, start_heading,
+        compiled=backend == "numba")
+
+def encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False,
+                      danger_field=None, cost_model=None, backend: str = None) -> candidato.Path:
+    """Mesmo contrato de candidato.encontrar_caminho, no backend pedido"""
+    grid = candidato.as_occupancy_grid(obstaculos, largura_grid, altura_grid)
+    if danger_field is None and grid:
+        danger_field = (cost_model or candidato.DEFAULT_COST_MODEL).danger_field(grid, largura_grid, altura_grid)
+    return a_star_search(grid, pos_inicial, pos_objetivo, tem_bola, danger_field, cost_model,
+                         backend=backend).path
+
+class ParityReport(NamedTuple):
+    backend: str
+    cases: int
+    path_mismatches: int
+    cost_mismatches: int
+    expansion_mismatches: int
+    python_s: float   # tempo total das buscas no caminho Python
+    backend_s: float  # tempo total das buscas no backend
+
+    @property
+    def ok(self) -> bool:
+        return self.path_mismatches == 0 and self.cost_mismatches == 0 and self.expansion_mismatches == 0
+
+def check_parity(n_cases: int = 200, sizes=((20, 15), (60, 40)), density: float = 0.08, seed: int = 0,
+                 backend: str = None, cost_model: candidato.CostModel = None) -> ParityReport:
+    """
+    Cenários aleatórios (benchmark.gerar_cenario) resolvidos no caminho Python e
+    no backend: conta caminhos, custos e expansões diferentes. Sem Numba confere
+    o núcleo interpretado, que é o mesmo código que o Numba compila.
+    """
+    import random
+    import time
+    from benchmark import gerar_cenario
+
+    backend = backend or ("numba" if NUMBA_AVAILABLE else "interpreted")
+    rng = random.Random(seed)
+    model = cost_model or candidato.DEFAULT_COST_MODEL
+    caminhos = custos = expansoes = 0
+    tempo_python = tempo_backend = 0.0
+    if backend == "numba":
+        # Compila fora da medição
+        a_star_search(candidato.OccupancyGrid(3, 3), (0, 0), (2, 2), backend=backend)
+    for caso in range(n_cases):
+        largura_grid, altura_grid = sizes[caso % len(sizes)]
+        cenario = gerar_cenario(largura_grid, altura_grid, int(density * largura_grid * altura_grid), rng)
+        grid = candidato.OccupancyGrid(largura_grid, altura_grid, cenario["obstaculos"])
+        danger_field = model.danger_field(grid, largura_grid, altura_grid)
+        tem_bola = rng.random() < 0.5
+        start_heading = rng.choice([None] + list(range(len(candidato.MOVES))))
+        args = (grid, cenario["pos_robo"], cenario["pos_bola"], tem_bola, danger_field, model, start_heading)
+
+        t0 = time.perf_counter()
+        esperado = a_star_search(*args, backend="python")
+        t1 = time.perf_counter()
+        obtido = a_star_search(*args, backend=backend)
+        t2 = time.perf_counter()
+        tempo_python += t1 - t0
+        tempo_backend += t2 - t1
+        caminhos += esperado.path != obtido.path
+        custos += esperado.cost != obtido.cost
+        expansoes += esperado.expansions != obtido.expansions
+    return ParityReport(backend, n_cases, caminhos, custos, expansoes, tempo_python, tempo_backend)
+
+def main():
+    parser = argparse.ArgumentParser(description="Confere o backend compilado do A* contra o caminho Python")
+    parser.add_argument("--casos", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--densidade", type=float, default=0.08)
+    parser.add_argument("--backend", choices=BACKENDS[1:],
+                        help="Padrão: numba se instalado, senão o núcleo interpretado")
+    args = parser.parse_args()
+
+    relatorio = check_parity(args.casos, density=args.densidade, seed=args.seed, backend=args.backend)
+    print(f"Backend {relatorio.backend} (Numba {'instalado' if NUMBA_AVAILABLE else 'ausente'}): "
+          f"{relatorio.cases} casos, caminhos diferentes {relatorio.path_mismatches}, "
+          f"custos diferentes {relatorio.cost_mismatches}, expansões diferentes {relatorio.expansion_mismatches}")
+    print(f"  python {relatorio.python_s * 1000 / relatorio.cases:.2f} ms/caso | "
+          f"{relatorio.backend} {relatorio.backend_s * 1000 / relatorio.cases:.2f} ms/caso")
+    sys.exit(0 if relatorio.ok else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,779 @@
+# BENCHMARK DO PLANEJADOR - EDROM 2025
+# Mede o desempenho de candidato.py sem abrir a janela do pygame: episódios
+# bola -> gol em lote, com percentis de latência e saída em JSON para acompanhar
+# regressões entre versões. Também compara com a implementação anterior (--legado).
+import argparse
+import heapq
+import json
+import platform
+import random
+import time
+
+import candidato
+from custo_ate_objetivo import CostToGoMap
+from frente_de_onda import compute_cost_map
+from heuristicas import LandmarkHeuristic, check_heuristic, euclidean_heuristic, octile_heuristic
+from hierarquico import HierarchicalPlanner
+from multi_robo import TeamPlanner
+from perfis_custo import get_profile, list_profiles
+from replanejamento import IncrementalPlanner
+from suavizacao import PathSmoother, corner_points
+
+def _campo_perigo(grid, largura_grid, altura_grid, cost_model=None):
+    """DangerField novo (fora do cache do modelo, para o tempo de montagem contar) com as faixas do modelo"""
+    modelo = cost_model or candidato.DEFAULT_COST_MODEL
+    return candidato.DangerField(grid, largura_grid, altura_grid, modelo.danger_tiers)
+
+def gerar_cenario(largura_grid, altura_grid, max_obstaculos, rng):
+    """
+    Gera um cenário com as mesmas regras de simulador.resetar_cenario, mas com
+    dimensões configuráveis e um gerador aleatório próprio (reprodutível por seed).
+    """
+    pos_robo = (2, altura_grid // 2)
+    pos_gol = (largura_grid - 1, altura_grid // 2)
+
+    while True:
+        pos_bola = (rng.randint(largura_grid // 2, largura_grid - 1), rng.randint(0, altura_grid - 1))
+        if pos_bola != pos_gol and pos_bola != pos_robo:
+            break
+
+    obstaculos = []
+    posicoes_ocupadas = {pos_robo, pos_gol, pos_bola}
+    tentativas = 0
+    while len(obstaculos) < max_obstaculos:
+        pos_obs = (rng.randint(3, largura_grid - 1), rng.randint(0, altura_grid - 1))
+        dist_do_robo = abs(pos_obs[0] - pos_robo[0]) + abs(pos_obs[1] - pos_robo[1])
+        dist_do_gol = abs(pos_obs[0] - pos_gol[0]) + abs(pos_obs[1] - pos_gol[1])
+
+        if pos_obs in posicoes_ocupadas or dist_do_robo < 3 or dist_do_gol <= 1:
+            tentativas += 1
+            if tentativas > 1000:
+                break
+            continue
+
+        obstaculos.append(pos_obs)
+        posicoes_ocupadas.add(pos_obs)
+        tentativas = 0
+
+    return {"pos_robo": pos_robo, "pos_bola": pos_bola, "pos_gol": pos_gol, "obstaculos": obstaculos}
+
+def encontrar_caminho_legado(pos_inicial, pos_objetivo, grid, danger_field, tem_bola=False):
+    """
+    Cópia da busca anterior (nós indexados só pela posição, dicts por nó),
+    usando as mesmas estruturas O(1) da versão atual para que a comparação
+    meça apenas a estratégia de busca. Retorna (caminho, nós expandidos).
+    """
+    largura_grid, altura_grid = grid.largura, grid.altura
+    start_node = candidato.create_node(
+        position=pos_inicial, g=0, h=candidato.euclidean_distance(pos_inicial, pos_objetivo))
+    open_list = [(start_node['f'], pos_inicial)]
+    open_dict = {pos_inicial: start_node}
+    closed_set = set()
+    expansoes = 0
+
+    while open_list:
+        _, current_pos = heapq.heappop(open_list)
+        current_node = open_dict[current_pos]
+        if current_pos == pos_objetivo:
+            return candidato.reconstruct_path(current_node), expansoes
+        closed_set.add(current_pos)
+        expansoes += 1
+
+        for neighbor_pos in candidato.get_avaiable_neighbors([largura_grid, altura_grid], current_pos, grid):
+            if neighbor_pos in closed_set:
+                continue
+            movement_cost = candidato.calculate_movement_cost(
+                current_pos=current_pos,
+                next_pos=neighbor_pos,
+                previous_pos=current_node['parent']['position'] if current_node['parent'] else None,
+                tem_bola=tem_bola,
+                danger_field=danger_field
+            )
+            tentative_g = current_node['g'] + movement_cost
+            if neighbor_pos not in open_dict:
+                neighbor = candidato.create_node(
+                    position=neighbor_pos, g=tentative_g,
+                    h=candidato.euclidean_distance(neighbor_pos, pos_objetivo), parent=current_node)
+                heapq.heappush(open_list, (neighbor['f'], neighbor_pos))
+                open_dict[neighbor_pos] = neighbor
+            elif tentative_g < open_dict[neighbor_pos]['g']:
+                neighbor = open_dict[neighbor_pos]
+                neighbor['g'] = tentative_g
+                neighbor['f'] = tentative_g + neighbor['h']
+                neighbor['parent'] = current_node
+
+    return [], expansoes
+
+def comparar_com_legado(n_cenarios=200, largura_grid=20, altura_grid=15, max_obstaculos=20, seed=0):
+    """
+    Roda as duas buscas nas pernas bola e gol de cada cenário e acumula
+    expansões, tempo e custo do caminho encontrado.
+    """
+    rng = random.Random(seed)
+    resumo = {
+        "consultas": 0,
+        "legado": {"expansoes": 0, "tempo_s": 0.0, "custo": 0.0},
+        "atual": {"expansoes": 0, "tempo_s": 0.0, "custo": 0.0},
+        "mais_barato": 0,
+        "mais_caro": 0,
+    }
+
+    for _ in range(n_cenarios):
+        cenario = gerar_cenario(largura_grid, altura_grid, max_obstaculos, rng)
+        grid = candidato.OccupancyGrid(largura_grid, altura_grid, cenario["obstaculos"])
+        campo_perigo = candidato.DangerField(grid, largura_grid, altura_grid)
+
+        for inicio, objetivo, tem_bola in ((cenario["pos_robo"], cenario["pos_bola"], False),
+                                           (cenario["pos_bola"], cenario["pos_gol"], True)):
+            t0 = time.perf_counter()
+            caminho_legado, expansoes_legado = encontrar_caminho_legado(inicio, objetivo, grid, campo_perigo, tem_bola)
+            t1 = time.perf_counter()
+            resultado = candidato.a_star_search(grid, inicio, objetivo, tem_bola, campo_perigo)
+            t2 = time.perf_counter()
+
+            if not caminho_legado or not resultado.path:
+                continue
+            custo_legado = candidato.calculate_path_cost(caminho_legado, tem_bola, danger_field=campo_perigo)
+
+            resumo["consultas"] += 1
+            resumo["legado"]["expansoes"] += expansoes_legado
+            resumo["legado"]["tempo_s"] += t1 - t0
+            resumo["legado"]["custo"] += custo_legado
+            resumo["atual"]["expansoes"] += resultado.expansions
+            resumo["atual"]["tempo_s"] += t2 - t1
+            resumo["atual"]["custo"] += resultado.cost
+            if resultado.cost < custo_legado - 1e-9:
+                resumo["mais_barato"] += 1
+            elif resultado.cost > custo_legado + 1e-9:
+                resumo["mais_caro"] += 1
+
+    return resumo
+
+def _mover_adversarios(grid, rng, n_moveis, reservadas):
+    """Move até n_moveis adversários uma célula em direção aleatória; retorna (entraram, saíram)"""
+    entraram, sairam = [], []
+    for obs in rng.sample(list(grid), min(n_moveis, len(grid))):
+        dx, dy = rng.choice(candidato.MOVES)
+        destino = (obs[0] + dx, obs[1] + dy)
+        if (0 <= destino[0] < grid.largura and 0 <= destino[1] < grid.altura and destino not in grid
+                and destino not in entraram and destino not in reservadas):
+            sairam.append(obs)
+            entraram.append(destino)
+    return entraram, sairam
+
+def comparar_incremental(n_cenarios=20, largura_grid=40, altura_grid=30, max_obstaculos=60,
+                         n_moveis=3, seed=0, cost_model=None):
+    """
+    Perna robô -> bola com adversários andando uma célula por tick. A cada tick o
+    robô dá um passo e replaneja com o IncrementalPlanner (D* Lite) e, para
+    comparação, com um A* completo a partir do mesmo estado (posição e direção).
+    """
+    rng = random.Random(seed)
+    resumo = {"replanejamentos": 0, "divergencias": 0,
+              "incremental": {"expansoes": [], "tempo_ms": []},
+              "completo": {"expansoes": [], "tempo_ms": []}}
+
+    for _ in range(n_cenarios):
+        cenario = gerar_cenario(largura_grid, altura_grid, max_obstaculos, rng)
+        robo, objetivo = cenario["pos_robo"], cenario["pos_bola"]
+        planner = IncrementalPlanner(robo, objetivo, cenario["obstaculos"], largura_grid, altura_grid,
+                                     cost_model=cost_model)
+        caminho = planner.plan()
+        direcao = candidato.HEADING_NONE
+
+        while caminho and len(caminho) > 1:
+            proximo = caminho[1]
+            direcao = candidato.heading_of(robo, proximo)
+            robo = proximo
+            planner.move_start(robo)
+            if robo == objetivo:
+                break
+
+            entraram, sairam = _mover_adversarios(planner.grid, rng, n_moveis, {robo, objetivo})
+            t0 = time.perf_counter()
+            planner.update_obstacles(entraram, sairam)
+            caminho = planner.plan()
+            t1 = time.perf_counter()
+            campo_perigo = _campo_perigo(planner.grid, largura_grid, altura_grid, cost_model)
+            completo = candidato.a_star_search(planner.grid, robo, objetivo, False, campo_perigo,
+                                               cost_model, start_heading=direcao)
+            t2 = time.perf_counter()
+
+            resumo["replanejamentos"] += 1
+            resumo["incremental"]["expansoes"].append(planner.expansions)
+            resumo["incremental"]["tempo_ms"].append((t1 - t0) * 1000)
+            resumo["completo"]["expansoes"].append(completo.expansions)
+            resumo["completo"]["tempo_ms"].append((t2 - t1) * 1000)
+            if abs(planner.path_cost() - completo.cost) > 1e-6:
+                resumo["divergencias"] += 1
+
+    for nome in ("incremental", "completo"):
+        resumo[nome] = {chave: resumir(valores) for chave, valores in resumo[nome].items()}
+    return resumo
+
+def comparar_hierarquico(n_consultas=50, largura_grid=200, altura_grid=200, max_obstaculos=2000,
+                         cluster_size=16, seed=0, cost_model=None):
+    """
+    Consultas aleatórias num mesmo campo: HierarchicalPlanner (com as tabelas
+    dos clusters já montadas) contra o A* plano, em tempo e custo do caminho.
+    """
+    rng = random.Random(seed)
+    cenario = gerar_cenario(largura_grid, altura_grid, max_obstaculos, rng)
+
+    t0 = time.perf_counter()
+    planner = HierarchicalPlanner(cenario["obstaculos"], largura_grid, altura_grid, cluster_size,
+                                  cost_model=cost_model)
+    t1 = time.perf_counter()
+    planner.precompute()
+    t2 = time.perf_counter()
+
+    grid, campo_perigo = planner.grid, planner.danger_field
+    livres = [(x, y) for x in range(largura_grid) for y in range(altura_grid) if (x, y) not in grid]
+    resumo = {"montagem_s": t1 - t0, "tabelas_s": t2 - t1, "tabelas": planner.tables_built,
+              "hierarquico": {"tempo_ms": [], "expansoes": []},
+              "plano": {"tempo_ms": [], "expansoes": []},
+              "razao_custo": []}
+    for _ in range(n_consultas):
+        inicio, objetivo = rng.sample(livres, 2)
+        tem_bola = rng.random() < 0.5
+        t0 = time.perf_counter()
+        hierarquico = planner.plan(inicio, objetivo, tem_bola)
+        t1 = time.perf_counter()
+        plano = candidato.a_star_search(grid, inicio, objetivo, tem_bola, campo_perigo, cost_model)
+        t2 = time.perf_counter()
+
+        resumo["hierarquico"]["tempo_ms"].append((t1 - t0) * 1000)
+        resumo["hierarquico"]["expansoes"].append(hierarquico.expansions)
+        resumo["plano"]["tempo_ms"].append((t2 - t1) * 1000)
+        resumo["plano"]["expansoes"].append(plano.expansions)
+        if plano.path:
+            resumo["razao_custo"].append(hierarquico.cost / plano.cost if plano.cost else 1.0)
+
+    for nome in ("hierarquico", "plano"):
+        resumo[nome] = {chave: resumir(valores) for chave, valores in resumo[nome].items()}
+    resumo["razao_custo"] = resumir(resumo["razao_custo"])
+    return resumo
+
+def comparar_frente_onda(n_campos=3, largura_grid=500, altura_grid=500, max_obstaculos=17500, seed=0,
+                         cost_model=None, n_conferencias=5):
+    """
+    Mapa de custo do campo inteiro: frente de onda vetorizada (NumPy) contra o
+    Dijkstra em Python de CostToGoMap. O custo de algumas células sorteadas é
+    conferido com o A* plano.
+    """
+    rng = random.Random(seed)
+    resumo = {"frente_onda_s": [], "dijkstra_s": [], "iteracoes": [], "divergencias": 0}
+    for _ in range(n_campos):
+        cenario = gerar_cenario(largura_grid, altura_grid, max_obstaculos, rng)
+        grid = candidato.OccupancyGrid(largura_grid, altura_grid, cenario["obstaculos"])
+        campo_perigo = _campo_perigo(grid, largura_grid, altura_grid, cost_model)
+        livres = [(x, y) for x in range(largura_grid) for y in range(altura_grid) if (x, y) not in grid]
+        origem = rng.choice(livres)
+        tem_bola = rng.random() < 0.5
+
+        t0 = time.perf_counter()
+        mapa = compute_cost_map(origem, grid, largura_grid, altura_grid, tem_bola, campo_perigo, cost_model)
+        t1 = time.perf_counter()
+        CostToGoMap(origem, grid, largura_grid, altura_grid, tem_bola, campo_perigo, cost_model)
+        t2 = time.perf_counter()
+
+        resumo["frente_onda_s"].append(t1 - t0)
+        resumo["dijkstra_s"].append(t2 - t1)
+        resumo["iteracoes"].append(mapa.iterations)
+        for destino in rng.sample(livres, n_conferencias):
+            plano = candidato.a_star_search(grid, origem, destino, tem_bola, campo_perigo, cost_model)
+            if abs(mapa.cost(destino) - plano.cost) > 1e-6:
+                resumo["divergencias"] += 1
+
+    for chave in ("frente_onda_s", "dijkstra_s", "iteracoes"):
+        resumo[chave] = resumir(resumo[chave])
+    return resumo
+
+def comparar_time(n_campos=20, n_robos=5, largura_grid=100, altura_grid=100, max_obstaculos=700, seed=0,
+                  cost_model=None, executor="serial", workers=None):
+    """
+    N robôs no mesmo campo: uma chamada de encontrar_caminho por robô (cada uma
+    refaz grade e campo de perigo a partir da lista de obstáculos) contra o
+    TeamPlanner, que monta o campo uma vez para o time.
+    """
+    rng = random.Random(seed)
+    resumo = {"individual_ms": [], "time_ms": [], "montagem_ms": [], "busca_ms": [], "divergencias": 0}
+    for _ in range(n_campos):
+        cenario = gerar_cenario(largura_grid, altura_grid, max_obstaculos, rng)
+        obstaculos = cenario["obstaculos"]
+        ocupadas = set(obstaculos)
+        livres = [(x, y) for x in range(largura_grid) for y in range(altura_grid) if (x, y) not in ocupadas]
+        consultas = [(inicio, objetivo, rng.random() < 0.5)
+                     for inicio, objetivo in (rng.sample(livres, 2) for _ in range(n_robos))]
+
+        t0 = time.perf_counter()
+        individuais = [candidato.encontrar_caminho(inicio, objetivo, obstaculos, largura_grid, altura_grid, tem_bola,
+                                                   cost_model=cost_model)
+                       for inicio, objetivo, tem_bola in consultas]
+        t1 = time.perf_counter()
+        plano = TeamPlanner(obstaculos, largura_grid, altura_grid, cost_model).plan(consultas, executor, workers)
+        t2 = time.perf_counter()
+
+        resumo["individual_ms"].append((t1 - t0) * 1000)
+        resumo["time_ms"].append((t2 - t1) * 1000)
+        resumo["montagem_ms"].append(plano.setup_s * 1000)
+        resumo["busca_ms"].append(plano.search_s * 1000)
+        resumo["divergencias"] += sum(len(a) != len(b.path) for a, b in zip(individuais, plano.results))
+
+    for chave in ("individual_ms", "time_ms", "montagem_ms", "busca_ms"):
+        resumo[chave] = resumir(resumo[chave])
+    return resumo
+
+def comparar_heuristicas(n_consultas=50, largura_grid=100, altura_grid=100, max_obstaculos=700, n_landmarks=8,
+                         seed=0, cost_model=None, n_conferencias=3):
+    """
+    Consultas aleatórias num mesmo campo com a heurística euclidiana antiga, a
+    octile (padrão) e a ALT com n_landmarks: expansões, tempo e custo. Para
+    alguns objetivos sorteados, as três são conferidas com check_heuristic.
+    """
+    rng = random.Random(seed)
+    cenario = gerar_cenario(largura_grid, altura_grid, max_obstaculos, rng)
+    grid = candidato.OccupancyGrid(largura_grid, altura_grid, cenario["obstaculos"])
+    campo_perigo = _campo_perigo(grid, largura_grid, altura_grid, cost_model)
+    livres = [(x, y) for x in range(largura_grid) for y in range(altura_grid) if (x, y) not in grid]
+
+    t0 = time.perf_counter()
+    alt = LandmarkHeuristic(grid, largura_grid, altura_grid, n_landmarks, campo_perigo, cost_model, seed)
+    resumo = {"montagem_alt_s": time.perf_counter() - t0, "divergencias": 0,
+              "conferencias": {"euclidiana": [], "octile": [], "alt": []}}
+    heuristicas = {
+        "euclidiana": lambda objetivo, tem_bola: euclidean_heuristic(grid, objetivo),
+        "octile": lambda objetivo, tem_bola: None,  # padrão de Planner.search
+        "alt": alt.heuristic,
+    }
+    for nome in heuristicas:
+        resumo[nome] = {"tempo_ms": [], "expansoes": []}
+
+    for _ in range(n_consultas):
+        inicio, objetivo = rng.sample(livres, 2)
+        tem_bola = rng.random() < 0.5
+        custos = []
+        for nome, montar in heuristicas.items():
+            # O tempo inclui montar a lista da heurística para o objetivo
+            t0 = time.perf_counter()
+            plano = candidato.a_star_search(grid, inicio, objetivo, tem_bola, campo_perigo, cost_model,
+                                            heuristic=montar(objetivo, tem_bola))
+            resumo[nome]["tempo_ms"].append((time.perf_counter() - t0) * 1000)
+            resumo[nome]["expansoes"].append(plano.expansions)
+            custos.append(plano.cost)
+        if max(custos) - min(custos) > 1e-6:
+            resumo["divergencias"] += 1
+
+    for _ in range(n_conferencias):
+        objetivo = rng.choice(livres)
+        tem_bola = rng.random() < 0.5
+        listas = {"euclidiana": euclidean_heuristic(grid, objetivo),
+                  "octile": octile_heuristic(grid, objetivo, tem_bola, cost_model),
+                  "alt": alt.heuristic(objetivo, tem_bola)}
+        for nome, lista in listas.items():
+            resumo["conferencias"][nome].append(
+                check_heuristic(lista, grid, objetivo, tem_bola, campo_perigo, cost_model)._asdict())
+
+    for nome in heuristicas:
+        resumo[nome] = {chave: resumir(valores) for chave, valores in resumo[nome].items()}
+    return resumo
+
+def comparar_suavizacao(n_cenarios=50, largura_grid=100, altura_grid=100, max_obstaculos=700, seed=0,
+                        cost_model=None):
+    """
+    Caminhos do A* antes e depois do PathSmoother: número de waypoints, custo
+    por waypoints, custo célula a célula e tempo da suavização.
+    """
+    rng = random.Random(seed)
+    chaves = ("waypoints_antes", "waypoints_depois", "custo_antes", "custo_depois",
+              "custo_grade_antes", "custo_grade_depois", "tempo_ms")
+    resumo = {chave: [] for chave in chaves}
+    for _ in range(n_cenarios):
+        cenario = gerar_cenario(largura_grid, altura_grid, max_obstaculos, rng)
+        grid = candidato.OccupancyGrid(largura_grid, altura_grid, cenario["obstaculos"])
+        campo_perigo = _campo_perigo(grid, largura_grid, altura_grid, cost_model)
+        tem_bola = rng.random() < 0.5
+        plano = candidato.a_star_search(grid, cenario["pos_robo"], cenario["pos_bola"], tem_bola, campo_perigo,
+                                        cost_model)
+        if not plano.path:
+            continue
+        suavizador = PathSmoother(grid, largura_grid, altura_grid, campo_perigo, cost_model)
+        t0 = time.perf_counter()
+        suavizado = suavizador.smooth(plano.path, tem_bola)
+        resumo["tempo_ms"].append((time.perf_counter() - t0) * 1000)
+        resumo["waypoints_antes"].append(len(corner_points(plano.path)))
+        resumo["waypoints_depois"].append(len(suavizado.waypoints))
+        resumo["custo_antes"].append(suavizado.cost_before)
+        resumo["custo_depois"].append(suavizado.cost_after)
+        resumo["custo_grade_antes"].append(suavizado.grid_cost_before)
+        resumo["custo_grade_depois"].append(suavizado.grid_cost_after)
+
+    return {chave: resumir(valores) for chave, valores in resumo.items()}
+
+def comparar_tabela_arestas(n_consultas=50, largura_grid=100, altura_grid=100, max_obstaculos=700, seed=0,
+                            cost_model=None):
+    """
+    Consultas aleatórias num mesmo campo com o A* normal e com a EdgeCostTable
+    pré-calculada: tempo de montagem da tabela, memória, tempo por consulta e
+    quantas consultas pagam a montagem (montagem / ganho por consulta).
+    """
+    rng = random.Random(seed)
+    cenario = gerar_cenario(largura_grid, altura_grid, max_obstaculos, rng)
+    grid = candidato.OccupancyGrid(largura_grid, altura_grid, cenario["obstaculos"])
+    campo_perigo = _campo_perigo(grid, largura_grid, altura_grid, cost_model)
+    livres = [(x, y) for x in range(largura_grid) for y in range(altura_grid) if (x, y) not in grid]
+
+    tabela = candidato.EdgeCostTable(grid, largura_grid, altura_grid, campo_perigo, cost_model)
+    resumo = {"montagem_s": tabela.build_s, "memoria_mb": tabela.nbytes() / 1e6, "divergencias": 0,
+              "normal_ms": [], "tabela_ms": []}
+    for _ in range(n_consultas):
+        inicio, objetivo = rng.sample(livres, 2)
+        tem_bola = rng.random() < 0.5
+        t0 = time.perf_counter()
+        normal = candidato.a_star_search(grid, inicio, objetivo, tem_bola, campo_perigo, cost_model)
+        t1 = time.perf_counter()
+        pre = candidato.a_star_search(grid, inicio, objetivo, tem_bola, campo_perigo, cost_model,
+                                      edge_costs=tabela)
+        t2 = time.perf_counter()
+        resumo["normal_ms"].append((t1 - t0) * 1000)
+        resumo["tabela_ms"].append((t2 - t1) * 1000)
+        if normal.cost != pre.cost or normal.path != pre.path:
+            resumo["divergencias"] += 1
+
+    ganho_ms = (sum(resumo["normal_ms"]) - sum(resumo["tabela_ms"])) / max(n_consultas, 1)
+    resumo["ganho_ms"] = ganho_ms
+    resumo["consultas_para_pagar"] = resumo["montagem_s"] * 1000 / ganho_ms if ganho_ms > 0 else float('inf')
+    resumo["normal_ms"] = resumir(resumo["normal_ms"])
+    resumo["tabela_ms"] = resumir(resumo["tabela_ms"])
+    return resumo
+
+def percentil(valores, p):
+    """Percentil p (0-100) com interpolação linear; 0.0 para lista vazia"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+def resumir(valores):
+    return {
+        "media": sum(valores) / len(valores) if valores else 0.0,
+        "p50": percentil(valores, 50),
+        "p95": percentil(valores, 95),
+        "p99": percentil(valores, 99),
+        "max": max(valores) if valores else 0.0,
+    }
+
+def executar_episodio(cenario, largura_grid, altura_grid, cost_model=None, strategy="full", deadline_us=None):
+    """
+    Um episódio como no simulador: robô -> bola sem a bola, depois bola -> gol com ela.
+    Grade e campo de perigo são montados uma vez e compartilhados pelas duas pernas.
+    Com deadline_us cada perna usa o ARA* com esse orçamento (anytime_search).
+    Retorna o tempo de montagem do campo e uma medição por perna.
+    """
+    t0 = time.perf_counter()
+    grid = candidato.OccupancyGrid(largura_grid, altura_grid, cenario["obstaculos"])
+    campo_perigo = _campo_perigo(grid, largura_grid, altura_grid, cost_model)
+    tempo_campo = time.perf_counter() - t0
+
+    pernas = []
+    for inicio, objetivo, tem_bola in ((cenario["pos_robo"], cenario["pos_bola"], False),
+                                       (cenario["pos_bola"], cenario["pos_gol"], True)):
+        t0 = time.perf_counter()
+        if deadline_us is None:
+            resultado = candidato.a_star_search(grid, inicio, objetivo, tem_bola, campo_perigo, cost_model,
+                                                strategy=strategy)
+        else:
+            resultado = candidato.anytime_search(grid, inicio, objetivo, tem_bola, campo_perigo, cost_model,
+                                                 deadline_us=deadline_us)
+        pernas.append({
+            "tem_bola": tem_bola,
+            "latencia_s": time.perf_counter() - t0,
+            "expansoes": resultado.expansions,
+            "pushes": resultado.pushes,
+            "custo": resultado.cost,
+            "passos": max(len(resultado.path) - 1, 0),
+            "encontrou": bool(resultado.path),
+            "otimo": getattr(resultado, "optimal", True),
+            "limite": getattr(resultado, "bound", 1.0),
+        })
+        if not resultado.path:
+            break  # sem a bola não há perna até o gol
+    return tempo_campo, pernas
+
+def executar_benchmark(tamanhos, densidades, episodios, seed=0, cost_model=None, progresso=None,
+                       strategy="full", deadline_us=None):
+    """
+    Roda `episodios` episódios para cada combinação (largura, altura) x densidade.
+    A densidade é a fração das células ocupadas por adversários. Cada combinação
+    usa um gerador com a mesma seed, então versões diferentes do planejador
+    enfrentam exatamente os mesmos cenários.
+    """
+    resultados = []
+    for largura_grid, altura_grid in tamanhos:
+        for densidade in densidades:
+            rng = random.Random(seed)
+            max_obstaculos = int(round(densidade * largura_grid * altura_grid))
+            latencias, expansoes, pushes, custos, tempos_campo = [], [], [], [], []
+            sem_caminho = 0
+            nao_otimos = 0
+            limites = []
+
+            for _ in range(episodios):
+                cenario = gerar_cenario(largura_grid, altura_grid, max_obstaculos, rng)
+                tempo_campo, pernas = executar_episodio(cenario, largura_grid, altura_grid, cost_model, strategy,
+                                                        deadline_us)
+                tempos_campo.append(tempo_campo * 1000)
+                for perna in pernas:
+                    latencias.append(perna["latencia_s"] * 1000)
+                    expansoes.append(perna["expansoes"])
+                    pushes.append(perna["pushes"])
+                    if perna["encontrou"]:
+                        custos.append(perna["custo"])
+                        if not perna["otimo"]:
+                            nao_otimos += 1
+                            limites.append(perna["limite"])
+                    else:
+                        sem_caminho += 1
+
+            resultado = {
+                "largura": largura_grid,
+                "altura": altura_grid,
+                "densidade": densidade,
+                "estrategia": strategy,
+                "episodios": episodios,
+                "consultas": len(latencias),
+                "sem_caminho": sem_caminho,
+                "latencia_ms": resumir(latencias),
+                "montagem_campo_ms": resumir(tempos_campo),
+                "expansoes": resumir(expansoes),
+                "pushes": resumir(pushes),
+                "custo": resumir(custos),
+            }
+            if deadline_us is not None:
+                resultado["prazo_us"] = deadline_us
+                resultado["nao_otimos"] = nao_otimos
+                resultado["limite_nao_otimos"] = resumir([limite for limite in limites if limite != float('inf')])
+            resultados.append(resultado)
+            if progresso:
+                progresso(resultado)
+    return resultados
+
+def comparar_estrategias(tamanhos, densidades, episodios, seed=0, cost_model=None):
+    """
+    Roda o benchmark com cada estratégia de candidato.SEARCH_STRATEGIES nos mesmos
+    cenários e devolve, por estratégia, os resultados e a razão das expansões
+    médias em relação à busca "full" (só para frente).
+    """
+    por_estrategia = {estrategia: executar_benchmark(tamanhos, densidades, episodios, seed, cost_model,
+                                                     strategy=estrategia)
+                      for estrategia in candidato.SEARCH_STRATEGIES}
+    comparacao = []
+    for i, base in enumerate(por_estrategia["full"]):
+        linha = {"largura": base["largura"], "altura": base["altura"], "densidade": base["densidade"]}
+        for estrategia, resultados in por_estrategia.items():
+            resultado = resultados[i]
+            linha[estrategia] = {
+                "expansoes": resultado["expansoes"]["media"],
+                "razao_expansoes": resultado["expansoes"]["media"] / max(base["expansoes"]["media"], 1e-9),
+                "latencia_p50_ms": resultado["latencia_ms"]["p50"],
+                "custo": resultado["custo"]["media"],
+            }
+        comparacao.append(linha)
+    return comparacao
+
+def imprimir_resultado(resultado):
+    lat = resultado["latencia_ms"]
+    print(f"{resultado['largura']}x{resultado['altura']} densidade {resultado['densidade']:.2f}: "
+          f"{resultado['consultas']} consultas ({resultado['sem_caminho']} sem caminho) | "
+          f"latência p50 {lat['p50']:.3f} p95 {lat['p95']:.3f} p99 {lat['p99']:.3f} ms | "
+          f"expansões {resultado['expansoes']['media']:.1f} | pushes {resultado['pushes']['media']:.1f} | "
+          f"custo {resultado['custo']['media']:.3f}")
+    if "prazo_us" in resultado:
+        limite = resultado["limite_nao_otimos"]
+        print(f"  prazo {resultado['prazo_us']:.0f} µs: {resultado['nao_otimos']} caminhos sem garantia de ótimo "
+              f"(limite de subotimalidade p50 {limite['p50']:.3f} max {limite['max']:.3f})")
+
+def _ler_tamanhos(texto):
+    """'20x15,100x100' -> [(20, 15), (100, 100)]"""
+    return [tuple(int(v) for v in item.lower().split("x")) for item in texto.split(",")]
+
+def _ler_densidades(texto):
+    return [float(v) for v in texto.split(",")]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless do planejador de candidato.py.")
+    parser.add_argument("--tamanhos", type=_ler_tamanhos, default=[(20, 15)],
+                        help="Lista de grids LARGURAxALTURA separados por vírgula (ex: 20x15,200x200,1000x1000)")
+    parser.add_argument("--densidades", type=_ler_densidades, default=[20 / (20 * 15)],
+                        help="Frações de células com adversários, separadas por vírgula (ex: 0.05,0.2)")
+    parser.add_argument("--episodios", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="ARQUIVO", help="Grava os resultados em JSON neste arquivo")
+    parser.add_argument("--estrategia", choices=candidato.SEARCH_STRATEGIES, default="full",
+                        help="Estratégia de busca de candidato.a_star_search")
+    parser.add_argument("--comparar-estrategias", action="store_true",
+                        help="Roda todas as estratégias nos mesmos cenários e compara as expansões com a \"full\"")
+    parser.add_argument("--legado", action="store_true",
+                        help="Compara com a implementação anterior em vez de rodar o benchmark")
+    parser.add_argument("--incremental", type=int, metavar="MOVEIS",
+                        help="Compara replanejamento D* Lite x A* completo com MOVEIS adversários andando por tick")
+    parser.add_argument("--hierarquico", type=int, metavar="CLUSTER",
+                        help="Compara o planejador hierárquico (clusters CLUSTERxCLUSTER) com o A* plano")
+    parser.add_argument("--frente-onda", action="store_true",
+                        help="Compara o mapa de custo vetorizado (NumPy) com o Dijkstra em Python")
+    parser.add_argument("--prazo-us", type=float, metavar="US",
+                        help="Usa o ARA* com este orçamento por consulta (microssegundos)")
+    parser.add_argument("--time", type=int, metavar="ROBOS",
+                        help="Compara ROBOS chamadas de encontrar_caminho com o TeamPlanner num mesmo campo")
+    parser.add_argument("--executor", choices=("serial", "thread", "process"), default="serial",
+                        help="Executor do TeamPlanner em --time")
+    parser.add_argument("--heuristicas", type=int, metavar="LANDMARKS",
+                        help="Compara as heurísticas euclidiana, octile e ALT (com LANDMARKS landmarks)")
+    parser.add_argument("--suavizar", action="store_true",
+                        help="Compara os caminhos do A* antes e depois da suavização por waypoints")
+    parser.add_argument("--tabela-arestas", action="store_true",
+                        help="Compara o A* normal com a tabela de custos de aresta pré-calculada")
+    parser.add_argument("--perfil", choices=list_profiles(),
+                        help="Perfil de custo da pasta perfis/ (padrão: o modelo de custo padrão)")
+    args = parser.parse_args()
+    modelo = get_profile(args.perfil) if args.perfil else None
+
+    if args.tabela_arestas:
+        largura_grid, altura_grid = args.tamanhos[0]
+        max_obstaculos = int(round(args.densidades[0] * largura_grid * altura_grid))
+        resumo = comparar_tabela_arestas(args.episodios, largura_grid, altura_grid, max_obstaculos, args.seed,
+                                         modelo)
+        print(f"Montagem da tabela: {resumo['montagem_s']:.2f} s, {resumo['memoria_mb']:.1f} MB "
+              f"(custos divergentes: {resumo['divergencias']})")
+        print(f"  normal: média {resumo['normal_ms']['media']:8.2f} ms | "
+              f"tabela: média {resumo['tabela_ms']['media']:8.2f} ms | ganho {resumo['ganho_ms']:.2f} ms por consulta")
+        print(f"  a montagem se paga depois de {resumo['consultas_para_pagar']:.0f} consultas no mesmo campo")
+        return
+
+    if args.suavizar:
+        largura_grid, altura_grid = args.tamanhos[0]
+        max_obstaculos = int(round(args.densidades[0] * largura_grid * altura_grid))
+        resumo = comparar_suavizacao(args.episodios, largura_grid, altura_grid, max_obstaculos, args.seed, modelo)
+        print(f"Waypoints: média {resumo['waypoints_antes']['media']:.1f} -> {resumo['waypoints_depois']['media']:.1f} | "
+              f"suavização média {resumo['tempo_ms']['media']:.2f} ms")
+        print(f"  custo por waypoints:  média {resumo['custo_antes']['media']:8.2f} -> {resumo['custo_depois']['media']:8.2f}")
+        print(f"  custo célula a célula: média {resumo['custo_grade_antes']['media']:8.2f} -> "
+              f"{resumo['custo_grade_depois']['media']:8.2f}")
+        return
+
+    if args.heuristicas is not None:
+        largura_grid, altura_grid = args.tamanhos[0]
+        max_obstaculos = int(round(args.densidades[0] * largura_grid * altura_grid))
+        resumo = comparar_heuristicas(args.episodios, largura_grid, altura_grid, max_obstaculos,
+                                      args.heuristicas, args.seed, modelo)
+        print(f"Montagem da ALT: {resumo['montagem_alt_s']:.2f} s (custos divergentes: {resumo['divergencias']})")
+        for nome in ("euclidiana", "octile", "alt"):
+            conferencias = resumo["conferencias"][nome]
+            admissivel = all(c["overestimates"] == 0 for c in conferencias)
+            consistente = all(c["inconsistencies"] == 0 for c in conferencias)
+            print(f"  {nome:10s}: expansões média {resumo[nome]['expansoes']['media']:9.1f} | "
+                  f"tempo média {resumo[nome]['tempo_ms']['media']:8.2f} ms | "
+                  f"admissível {'sim' if admissivel else 'NÃO'}, consistente {'sim' if consistente else 'NÃO'}")
+        return
+
+    if args.time is not None:
+        largura_grid, altura_grid = args.tamanhos[0]
+        max_obstaculos = int(round(args.densidades[0] * largura_grid * altura_grid))
+        resumo = comparar_time(args.episodios, args.time, largura_grid, altura_grid, max_obstaculos, args.seed,
+                               modelo, executor=args.executor)
+        individual, equipe = resumo["individual_ms"], resumo["time_ms"]
+        print(f"{args.time} robôs por campo ({args.executor}, caminhos divergentes: {resumo['divergencias']})")
+        print(f"  encontrar_caminho por robô: média {individual['media']:8.2f} ms por tick")
+        print(f"  TeamPlanner:                média {equipe['media']:8.2f} ms por tick "
+              f"(montagem {resumo['montagem_ms']['media']:.2f} ms uma vez + busca {resumo['busca_ms']['media']:.2f} ms)"
+              f" | speedup {individual['media'] / equipe['media']:.2f}x")
+        return
+
+    if args.frente_onda:
+        largura_grid, altura_grid = args.tamanhos[0]
+        max_obstaculos = int(round(args.densidades[0] * largura_grid * altura_grid))
+        resumo = comparar_frente_onda(args.episodios, largura_grid, altura_grid, max_obstaculos, args.seed,
+                                      modelo)
+        onda, dijkstra = resumo["frente_onda_s"], resumo["dijkstra_s"]
+        print(f"Frente de onda: média {onda['media']:.2f} s ({resumo['iteracoes']['media']:.1f} iterações) | "
+              f"Dijkstra: média {dijkstra['media']:.2f} s | "
+              f"speedup {dijkstra['media'] / onda['media']:.2f}x (custos divergentes: {resumo['divergencias']})")
+        return
+
+    if args.hierarquico is not None:
+        largura_grid, altura_grid = args.tamanhos[0]
+        max_obstaculos = int(round(args.densidades[0] * largura_grid * altura_grid))
+        resumo = comparar_hierarquico(args.episodios, largura_grid, altura_grid, max_obstaculos,
+                                      args.hierarquico, args.seed, modelo)
+        print(f"Fronteiras: {resumo['montagem_s']:.2f} s | {resumo['tabelas']} tabelas de cluster em "
+              f"{resumo['tabelas_s']:.2f} s")
+        for nome in ("hierarquico", "plano"):
+            exp, tempo = resumo[nome]["expansoes"], resumo[nome]["tempo_ms"]
+            print(f"{nome:>11}: expansões média {exp['media']:8.1f} | "
+                  f"tempo p50 {tempo['p50']:8.3f} p95 {tempo['p95']:8.3f} ms")
+        razao = resumo["razao_custo"]
+        print(f"Custo hierárquico / plano: média {razao['media']:.4f} p95 {razao['p95']:.4f} max {razao['max']:.4f}")
+        return
+
+    if args.incremental is not None:
+        largura_grid, altura_grid = args.tamanhos[0]
+        max_obstaculos = int(round(args.densidades[0] * largura_grid * altura_grid))
+        resumo = comparar_incremental(args.episodios, largura_grid, altura_grid, max_obstaculos,
+                                      args.incremental, args.seed, modelo)
+        print(f"Replanejamentos: {resumo['replanejamentos']} (custos divergentes: {resumo['divergencias']})")
+        for nome in ("incremental", "completo"):
+            exp, tempo = resumo[nome]["expansoes"], resumo[nome]["tempo_ms"]
+            print(f"{nome:>11}: expansões média {exp['media']:8.1f} p95 {exp['p95']:8.1f} | "
+                  f"tempo p50 {tempo['p50']:7.3f} p95 {tempo['p95']:7.3f} ms")
+        return
+
+    if args.comparar_estrategias:
+        for linha in comparar_estrategias(args.tamanhos, args.densidades, args.episodios, args.seed, modelo):
+            print(f"{linha['largura']}x{linha['altura']} densidade {linha['densidade']:.2f}:")
+            for estrategia in candidato.SEARCH_STRATEGIES:
+                dados = linha[estrategia]
+                print(f"  {estrategia:>13}: expansões {dados['expansoes']:9.1f} ({dados['razao_expansoes']:5.2f}x) | "
+                      f"latência p50 {dados['latencia_p50_ms']:8.3f} ms | custo {dados['custo']:.3f}")
+        return
+
+    if args.legado:
+        largura_grid, altura_grid = args.tamanhos[0]
+        max_obstaculos = int(round(args.densidades[0] * largura_grid * altura_grid))
+        resumo = comparar_com_legado(args.episodios, largura_grid, altura_grid, max_obstaculos, args.seed)
+        n = max(resumo["consultas"], 1)
+        print(f"Consultas: {resumo['consultas']}")
+        for nome in ("legado", "atual"):
+            dados = resumo[nome]
+            print(f"{nome:>7}: {dados['expansoes'] / n:8.1f} expansões/consulta | "
+                  f"{dados['tempo_s'] / n * 1000:7.3f} ms/consulta | custo médio {dados['custo'] / n:.3f}")
+        print(f"Caminho atual mais barato em {resumo['mais_barato']} consultas, mais caro em {resumo['mais_caro']}.")
+        return
+
+    resultados = executar_benchmark(args.tamanhos, args.densidades, args.episodios, args.seed, modelo,
+                                    progresso=imprimir_resultado, strategy=args.estrategia,
+                                    deadline_us=args.prazo_us)
+    if args.json:
+        relatorio = {
+            "gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "config": {
+                "tamanhos": [list(t) for t in args.tamanhos],
+                "densidades": args.densidades,
+                "estrategia": args.estrategia,
+                "perfil": args.perfil,
+                "prazo_us": args.prazo_us,
+                "episodios": args.episodios,
+                "seed": args.seed,
+            },
+            "resultados": resultados,
+        }
+        with open(args.json, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2)
+        print(f"Resultados gravados em {args.json}")
+
+if __name__ == '__main__':
+    main()
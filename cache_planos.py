@@ -0,0 +1,79 @@
+# CACHE DE PLANOS - EDROM 2025
+# Memoiza candidato.encontrar_caminho para consultas que se repetem entre
+# episódios e robôs (mesma posição, objetivo, obstáculos e estado de bola).
+import sys
+from collections import OrderedDict
+
+import candidato
+
+def _tamanho_caminho(caminho: candidato.Path) -> int:
+    """Estimativa em bytes de um caminho guardado no cache"""
+    return sys.getsizeof(caminho) + sys.getsizeof(caminho.cells)
+
+class PlanCache:
+    """
+    Cache LRU na frente de candidato.encontrar_caminho.
+
+    A chave é o hash da grade de ocupação (OccupancyGrid.fingerprint) mais a
+    consulta, o modelo de custo e o hash do campo de perigo passado
+    (DangerField.fingerprint; sem campo, o derivado da grade e do modelo). O cache é limitado tanto por número de entradas
+    quanto por bytes; os contadores de acertos, faltas e remoções ficam em stats().
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # chave -> (caminho, bytes)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def encontrar_caminho(self, pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid,
+                          tem_bola=False, danger_field=None, cost_model=None) -> candidato.Path:
+        """
+        Mesma assinatura e retorno de candidato.encontrar_caminho. Cada chamada
+        devolve uma cópia, então consumir o caminho (popleft) não altera o cache.
+        """
+        grid = candidato.as_occupancy_grid(obstaculos, largura_grid, altura_grid)
+        model = cost_model or candidato.DEFAULT_COST_MODEL
+        chave = (grid.fingerprint(), largura_grid, altura_grid, tuple(pos_inicial), tuple(pos_objetivo),
+                 bool(tem_bola), model.key(), danger_field.fingerprint() if danger_field is not None else None)
+
+        entrada = self._entries.get(chave)
+        if entrada is not None:
+            self.hits += 1
+            self._entries.move_to_end(chave)
+            return entrada[0].copy()
+
+        self.misses += 1
+        caminho = candidato.encontrar_caminho(pos_inicial, pos_objetivo, grid, largura_grid, altura_grid,
+                                              tem_bola, danger_field, cost_model)
+        self._guardar(chave, caminho.copy())
+        return caminho
+
+    def _guardar(self, chave, caminho):
+        tamanho = _tamanho_caminho(caminho)
+        if tamanho > self.max_bytes:
+            return  # nunca caberia; não vale expulsar o cache inteiro por ele
+        self._entries[chave] = (caminho, tamanho)
+        self._bytes += tamanho
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, tamanho_removido) = self._entries.popitem(last=False)
+            self._bytes -= tamanho_removido
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        consultas = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hit_rate": self.hits / consultas if consultas else 0.0,
+        }
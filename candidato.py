@@ -4,13 +4,153 @@
 
 # Você pode importar as bibliotecas que julgar necessárias.
 #-----------------------------CÓDIGO DO CANDIDATO---------------------#
-from typing import List, Tuple, Dict, Set # estruturas para criação de nós
+from typing import List, Tuple, Dict, NamedTuple # estruturas para criação de nós
 import numpy as np # básico para calculos
 import heapq # estrutura
+from array import array
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+import gc
+import time
+import sys
 from math import sqrt
 #---------------------------------------------------------------------#
 
-def encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False):
+# Faixas de perigo padrão: (distância máxima até o obstáculo mais próximo, custo),
+# em ordem crescente de distância; além da última não há custo
+DEFAULT_DANGER_TIERS = ((1.0, 3.0), (1.414, 2.0), (2.0, 1.0), (2.5, 0.5))
+
+# Os 8 movimentos possíveis, na mesma ordem usada em get_avaiable_neighbors
+MOVES = [
+    (1, 0), (-1, 0),    # Direita, Esquerda
+    (0, 1), (0, -1),    # Cima, Baixo
+    (1, 1), (-1, -1),   # Diagonais: Nordeste e Sudoeste
+    (1, -1), (-1, 1)    #           Sudeste e Noroeste
+]
+
+# Estado da busca: (célula, direção de chegada). HEADING_NONE marca o estado
+# inicial, em que o robô ainda não se moveu e nenhuma rotação é cobrada.
+HEADING_NONE = len(MOVES)
+NUM_HEADINGS = len(MOVES) + 1
+HEADING_INDEX = {move: heading for heading, move in enumerate(MOVES)}
+
+# Estratégias de busca aceitas por encontrar_caminho / a_star_search:
+# "full" expande todo estado (célula, direção); "pruned" descarta estados
+# dominados por outra direção de chegada já expandida na mesma célula;
+# "bidirectional" busca ao mesmo tempo a partir do início e do objetivo.
+SEARCH_STRATEGIES = ("full", "pruned", "bidirectional")
+
+class SearchResult(NamedTuple):
+    path: 'Path'
+    cost: float
+    expansions: int
+    pushes: int
+
+class AnytimeResult(NamedTuple):
+    path: 'Path'
+    cost: float
+    expansions: int
+    pushes: int
+    bound: float    # cost / cota inferior do ótimo (1.0 = ótimo; inf sem caminho)
+    optimal: bool   # True se a busca provou que o caminho é ótimo
+    iterations: int  # passadas do ARA* concluídas (cada uma com um epsilon menor)
+
+class AnytimeStats:
+    """
+    Contadores das buscas com orçamento (anytime_search), para monitorar com que
+    frequência o laço de jogo recebe caminhos sem garantia de ótimo.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.non_optimal = 0  # devolveu caminho sem provar que é ótimo
+        self.no_path = 0      # orçamento acabou (ou não há caminho) sem caminho algum
+        self._lock = threading.Lock()
+
+    def record(self, result: AnytimeResult):
+        with self._lock:
+            self.calls += 1
+            if not result.path:
+                self.no_path += 1
+            elif not result.optimal:
+                self.non_optimal += 1
+
+    def non_optimal_rate(self) -> float:
+        return self.non_optimal / self.calls if self.calls else 0.0
+
+    def reset(self):
+        with self._lock:
+            self.calls = self.non_optimal = self.no_path = 0
+
+ANYTIME_STATS = AnytimeStats()
+
+class _GcPause:
+    """
+    Desliga o coletor de lixo enquanto houver alguma busca com prazo em andamento
+    (em qualquer thread) e o religa quando a última termina, se estava ligado.
+    """
+
+    def __init__(self):
+        self._active = 0
+        self._reenable = False
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            if self._active == 0:
+                self._reenable = gc.isenabled()
+                gc.disable()
+            self._active += 1
+
+    def __exit__(self, exc_type, exc, traceback):
+        with self._lock:
+            self._active -= 1
+            if self._active == 0 and self._reenable:
+                gc.enable()
+
+_GC_PAUSE = _GcPause()
+
+class SearchStats:
+    """
+    Registro de uma busca A*, preenchido só quando pedido (encontrar_caminho com
+    return_stats=True, ou a_star_search com stats=SearchStats()).
+
+    A coleta roda numa cópia instrumentada do laço (Planner._search_instrumented),
+    escolhida uma vez por chamada: as buscas normais não pagam nada por ela. Os
+    tempos medidos incluem o próprio custo de medir, então servem para comparar
+    as partes entre si, não para comparar com buscas sem instrumentação.
+    """
+
+    def __init__(self):
+        self.expansions = 0
+        self.pushes = 0
+        self.stale_pops = 0     # entradas desatualizadas descartadas ao sair do heap
+        self.pruned = 0         # estados dominados descartados (strategy="pruned")
+        self.max_open = 0       # maior tamanho da fila de prioridade
+        self.cost_time_s = 0.0  # avaliação de custo e heurística dos vizinhos
+        self.heap_time_s = 0.0  # heappush e heappop
+        self.total_time_s = 0.0
+        self.open_sizes: List[int] = []  # tamanho da fila a cada expansão
+        # Estados expandidos na ordem: ((x, y), direção de chegada, g, h)
+        self.expanded: List[Tuple[Tuple[int, int], int, float, float]] = []
+
+    def closed_cells(self) -> Dict[Tuple[int, int], Tuple[int, float, float]]:
+        """Células expandidas -> (ordem da primeira expansão, menor g, h)"""
+        cells = {}
+        for order, (position, _, g, h) in enumerate(self.expanded):
+            if position not in cells:
+                cells[position] = (order, g, h)
+            elif g < cells[position][1]:
+                cells[position] = (cells[position][0], g, h)
+        return cells
+
+#---------------------------------------------------------------------#
+
+def encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False,
+                      danger_field=None, cost_model=None, strategy="full", deadline_us=None, max_expansions=None,
+                      return_stats=False, backend=None):
     """
     Esta é a função principal que você deve implementar para o desafio EDROM.
     Seu objetivo é criar um algoritmo de pathfinding (como o A*) que encontre o
@@ -19,18 +159,45 @@ def encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altur
     Args:
         pos_inicial (tuple): A posição (x, y) inicial do robô.
         pos_objetivo (tuple): A posição (x, y) do objetivo (bola ou gol).
-        obstaculos (list): Uma lista de tuplas (x, y) com as posições dos obstáculos.
+        obstaculos (list | OccupancyGrid): Uma lista de tuplas (x, y) com as posições dos
+                         obstáculos, ou uma OccupancyGrid já construída para o campo.
         largura_grid (int): A largura do campo em células.
         altura_grid (int): A altura do campo em células.
         tem_bola (bool): Um booleano que indica o estado do robô.
                          True se o robô está com a bola, False caso contrário.
                          Este parâmetro é essencial para o Nível 2 do desafio.
+        danger_field (DangerField): Campo de perigo já calculado para estes obstáculos.
+                         Opcional; se omitido é construído uma vez por chamada. Pode ser
+                         compartilhado entre a ida até a bola e a ida até o gol.
+        cost_model (CostModel): Tabelas de custo usadas na busca. Opcional; o padrão
+                         é DEFAULT_COST_MODEL.
+        strategy (str): "full" (padrão); "pruned", que poda direções de chegada
+                         dominadas e expande menos estados em campos grandes e abertos;
+                         ou "bidirectional", que busca dos dois lados e se encontra no
+                         meio. Todas retornam caminhos de mesmo custo.
+        deadline_us (float): Orçamento de tempo da chamada, em microssegundos, contado
+                         desde a entrada na função. Com ele (ou com max_expansions) a busca
+                         vira o ARA* de anytime_search: devolve o melhor caminho achado
+                         dentro do orçamento, possivelmente não ótimo (veja ANYTIME_STATS).
+                         Ignora `strategy`. Montar a grade e o campo de perigo não pode ser
+                         interrompido, então com deadline_us `obstaculos` precisa ser uma
+                         OccupancyGrid e, se houver obstáculos, danger_field já montado.
+                         A primeira chamada num tamanho de campo também aloca os buffers do
+                         Planner (milissegundos em 200x200): faça uma consulta antes do laço.
+        max_expansions (int): Orçamento em expansões de estados, no lugar ou além do tempo.
+        return_stats (bool): Se True, retorna (caminho, SearchStats) com contadores, tempos
+                         e os estados expandidos da busca (para debug). Só para as
+                         estratégias "full" e "pruned", sem orçamento.
+        backend (str): None (padrão) usa o A* compilado de acelerado.py quando o Numba
+                         está instalado e a estratégia é "full", e o laço Python caso
+                         contrário; "python" força o laço Python e "numba" exige o
+                         compilado. Os dois dão os mesmos caminhos (veja acelerado.py).
 
     Returns:
-        list: Uma lista de tuplas (x, y) representando o caminho do início ao fim.
-              A lista deve começar com o próximo passo após a pos_inicial e terminar
-              na pos_objetivo. Se nenhum caminho for encontrado, retorna uma lista vazia.
-              Exemplo de retorno: [(1, 2), (1, 3), (2, 3)]
+        Path: Sequência de tuplas (x, y) representando o caminho do início ao fim,
+              guardada de forma compacta (veja Path); lida como uma lista e consumida
+              com popleft() em O(1). Se nenhum caminho for encontrado, retorna um
+              caminho vazio. Exemplo de retorno: Path([(1, 2), (1, 3), (2, 3)])
 
     ---------------------------------------------------------------------------------
     REQUISITOS DO DESAFIO (AVALIADOS EM NÍVEIS):
@@ -61,64 +228,836 @@ def encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altur
     """
 
     # -------------------------------------------------------- #
-    # Initialize start node
-    start_node = create_node(
-        position=pos_inicial,
-        g=0,
-        h=euclidean_distance(pos_inicial, pos_objetivo)
-    )
-    
-    # Initialize open and closed sets
-    open_list = [(start_node['f'], pos_inicial)]  # Priority queue
-    open_dict = {pos_inicial: start_node}         # For quick node lookup
-    closed_set = set()                      # Explored nodes
-    
-    while open_list:
-        # Get node with lowest f value
-        _, current_pos = heapq.heappop(open_list)
-        current_node = open_dict[current_pos]
-        
-        # Check if we've reached the goal
-        if current_pos == pos_objetivo:
-            return reconstruct_path(current_node)
-            
-        closed_set.add(current_pos)
-        
-        # Explore neighbors
-        for neighbor_pos in get_avaiable_neighbors([largura_grid, altura_grid], current_pos, obstaculos):
-            # Skip if already explored
-            if neighbor_pos in closed_set:
+    # Com prazo o relógio começa aqui: tudo até a busca conta no orçamento
+    inicio_ns = time.perf_counter_ns()
+    if deadline_us is not None and (not isinstance(obstaculos, OccupancyGrid)
+                                    or (danger_field is None and obstaculos)):
+        raise ValueError("Com deadline_us passe a OccupancyGrid e o danger_field já montados")
+
+    # Listas de obstáculos são convertidas uma única vez para a grade de ocupação
+    obstaculos = as_occupancy_grid(obstaculos, largura_grid, altura_grid)
+
+    # NÍVEL 3: o campo de perigo é calculado uma única vez por cenário
+    if danger_field is None and obstaculos:
+        danger_field = (cost_model or DEFAULT_COST_MODEL).danger_field(obstaculos, largura_grid, altura_grid)
+
+    if return_stats:
+        if deadline_us is not None or max_expansions is not None:
+            raise ValueError("return_stats não vale para a busca com orçamento")
+        stats = SearchStats()
+        caminho = a_star_search(obstaculos, pos_inicial, pos_objetivo, tem_bola, danger_field, cost_model,
+                                strategy=strategy, stats=stats).path
+        return caminho, stats
+    if deadline_us is not None or max_expansions is not None:
+        if deadline_us is not None:
+            _shared_planner(largura_grid, altura_grid)  # alocar os buffers na primeira chamada também conta
+            deadline_us -= (time.perf_counter_ns() - inicio_ns) / 1000
+        return anytime_search(obstaculos, pos_inicial, pos_objetivo, tem_bola, danger_field, cost_model,
+                              deadline_us=deadline_us, max_expansions=max_expansions).path
+    return a_star_search(obstaculos, pos_inicial, pos_objetivo, tem_bola, danger_field, cost_model,
+                         strategy=strategy, backend=backend).path
+
+BACKENDS = ("python", "numba")
+_acelerado = None  # módulo acelerado, False sem Numba (veja _compiled_backend)
+
+def _compiled_backend():
+    """acelerado.py se o Numba está instalado, senão None; importado na primeira busca"""
+    global _acelerado
+    if _acelerado is None:
+        import acelerado  # importa este módulo, então não pode ficar no topo
+        _acelerado = acelerado if acelerado.NUMBA_AVAILABLE else False
+    return _acelerado or None
+
+def a_star_search(grid: 'OccupancyGrid', pos_inicial: Tuple[int, int], pos_objetivo: Tuple[int, int],
+                  tem_bola: bool = False, danger_field: 'DangerField' = None,
+                  cost_model: 'CostModel' = None, start_heading: int = None,
+                  heuristic=None, strategy: str = "full", stats: 'SearchStats' = None,
+                  edge_costs: 'EdgeCostTable' = None, backend: str = None) -> 'SearchResult':
+    """
+    A* sobre o estado (x, y, direção de chegada), usando o Planner da thread atual
+    para o tamanho desta grade (veja Planner.search).
+
+    Com o Numba instalado, a estratégia "full" com a heurística padrão (sem stats
+    nem edge_costs) roda no núcleo compilado de acelerado.py, com os mesmos
+    resultados; backend="python" força o laço Python e backend="numba" exige o
+    compilado.
+    """
+    if backend is not None and backend not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {backend!r} (use um de {BACKENDS})")
+    if backend != "python":
+        compilavel = strategy == "full" and heuristic is None and stats is None and edge_costs is None
+        acelerado = _compiled_backend() if compilavel else None
+        if acelerado is not None:
+            return acelerado.a_star_search(grid, pos_inicial, pos_objetivo, tem_bola, danger_field, cost_model,
+                                           start_heading, backend="numba")
+        if backend == "numba":
+            raise ValueError("O backend 'numba' precisa do Numba instalado e da estratégia 'full' "
+                             "com a heurística padrão, sem stats nem edge_costs")
+    return _shared_planner(grid.largura, grid.altura).search(
+        grid, pos_inicial, pos_objetivo, tem_bola, danger_field, cost_model, start_heading, heuristic, strategy,
+        stats, edge_costs)
+
+def anytime_search(grid: 'OccupancyGrid', pos_inicial: Tuple[int, int], pos_objetivo: Tuple[int, int],
+                   tem_bola: bool = False, danger_field: 'DangerField' = None,
+                   cost_model: 'CostModel' = None, start_heading: int = None, deadline_us: float = None,
+                   max_expansions: int = None, epsilon: float = 2.5, epsilon_step: float = 0.5) -> 'AnytimeResult':
+    """
+    ARA* com orçamento usando o Planner da thread atual (veja Planner.search_anytime).
+    Cada chamada é contada em ANYTIME_STATS.
+    """
+    # O GC fica desligado também no registro: religado, a primeira alocação já dispara a coleta
+    with _GC_PAUSE if deadline_us is not None else nullcontext():
+        result = _shared_planner(grid.largura, grid.altura).search_anytime(
+            grid, pos_inicial, pos_objetivo, tem_bola, danger_field, cost_model, start_heading,
+            deadline_us, max_expansions, epsilon, epsilon_step)
+        ANYTIME_STATS.record(result)
+    return result
+
+_planners = threading.local()
+
+def _shared_planner(largura_grid: int, altura_grid: int) -> 'Planner':
+    """
+    Planner reaproveitado entre chamadas na mesma thread. Só o do último tamanho
+    de grid fica guardado, para não reter buffers de campos grandes à toa.
+    """
+    planner = getattr(_planners, 'planner', None)
+    if planner is None or (planner.largura, planner.altura) != (largura_grid, altura_grid):
+        planner = _planners.planner = Planner(largura_grid, altura_grid)
+    return planner
+
+class Planner:
+    """
+    A* reutilizável para um tamanho de grid fixo.
+
+    g-scores, pais e o cache da heurística ficam em listas planas alocadas uma
+    única vez. Cada busca incrementa um contador de geração e uma entrada só vale
+    se o seu carimbo for a geração atual, então nada é realocado ou zerado entre
+    consultas (sem churn do alocador nem pausas do GC no laço de controle).
+    """
+
+    def __init__(self, largura_grid: int, altura_grid: int):
+        self.largura = largura_grid
+        self.altura = altura_grid
+        cells = (largura_grid + 2) * (altura_grid + 2)
+        states = cells * NUM_HEADINGS
+
+        self._g_score = [float('inf')] * states
+        self._parent = [-1] * states
+        self._stamp = [0] * states
+        self._closed = [0] * states  # geração em que o estado foi expandido (estratégia "pruned")
+        self._h_value = [0.0] * cells
+        self._h_stamp = [0] * cells
+        self._zero_danger = [0.0] * cells
+        self._open_list = []
+        self._generation = 0
+        self._backward = None  # buffers da busca reversa, criados no primeiro uso de "bidirectional"
+        self._discarded = []   # filas do ARA* ainda por liberar (veja _release)
+
+    def encontrar_caminho(self, pos_inicial, pos_objetivo, obstaculos, tem_bola=False,
+                          danger_field=None, cost_model=None, strategy="full") -> List[Tuple[int, int]]:
+        """Mesmo contrato de encontrar_caminho, no grid deste Planner"""
+        grid = as_occupancy_grid(obstaculos, self.largura, self.altura)
+        if danger_field is None and grid:
+            danger_field = (cost_model or DEFAULT_COST_MODEL).danger_field(grid, self.largura, self.altura)
+        return self.search(grid, pos_inicial, pos_objetivo, tem_bola, danger_field, cost_model,
+                           strategy=strategy).path
+
+    def search(self, grid: 'OccupancyGrid', pos_inicial: Tuple[int, int], pos_objetivo: Tuple[int, int],
+               tem_bola: bool = False, danger_field: 'DangerField' = None,
+               cost_model: 'CostModel' = None, start_heading: int = None,
+               heuristic=None, strategy: str = "full", stats: 'SearchStats' = None,
+               edge_costs: 'EdgeCostTable' = None) -> 'SearchResult':
+        """
+        A* sobre o estado (x, y, direção de chegada).
+
+        O custo de rotação depende de onde o robô veio, então dois caminhos que chegam
+        à mesma célula por direções diferentes são estados distintos: guardar só a
+        posição faria a lista fechada descartar chegadas mais baratas. g-scores e pais
+        ficam em listas planas indexadas por `índice_da_célula * NUM_HEADINGS + direção`,
+        e a fila de prioridade recebe entradas novas a cada melhora (entradas
+        desatualizadas são descartadas ao sair do heap).
+
+        `start_heading` é a direção em que o robô chegou a pos_inicial (índice em
+        MOVES); o padrão HEADING_NONE não cobra rotação no primeiro passo.
+
+        `heuristic` troca a octile por uma lista indexada pelo estado
+        (ex: CostToGoMap.heuristic); estados com heurística infinita não são abertos.
+
+        Com strategy="pruned" um estado (c, h2) não é expandido se outra direção
+        (c, h1) já expandida tem g1 + CostModel.dominance_margin(h1, h2) <= g2: todo
+        passo a partir de h1 sai tão barato quanto o mesmo passo a partir de h2, então
+        os sucessores de (c, h2) não melhoram nada. O teste é feito ao abrir o estado e
+        de novo ao expandi-lo. Em campos abertos isso corta as chegadas simétricas à
+        mesma célula (a ideia do Jump Point Search); perto de obstáculos o perigo é o
+        mesmo para as duas direções e a poda continua exata.
+
+        Com `stats` a busca roda em _search_instrumented, que preenche o SearchStats.
+
+        Com `edge_costs` (EdgeCostTable desta grade) os custos das arestas vêm da
+        tabela pré-calculada, em _search_table. danger_field e cost_model, se
+        passados, precisam ser os da tabela (o campo é o mesmo objeto; o modelo, a
+        mesma chave). Só vale para a estratégia "full".
+        """
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Estratégia desconhecida: {strategy!r} (use uma de {SEARCH_STRATEGIES})")
+        if strategy == "bidirectional" and heuristic is not None:
+            raise ValueError("A busca bidirecional usa a própria heurística octile; não passe `heuristic`")
+        if strategy == "bidirectional" and stats is not None:
+            raise ValueError("A instrumentação (stats) só vale para as estratégias 'full' e 'pruned'")
+        if (grid.largura, grid.altura) != (self.largura, self.altura):
+            raise ValueError(
+                f"Planner {self.largura}x{self.altura} não serve para o grid {grid.largura}x{grid.altura}"
+            )
+        if edge_costs is not None:
+            if strategy != "full" or stats is not None:
+                raise ValueError("A tabela de custos (edge_costs) só vale para a estratégia 'full', sem stats")
+            if not edge_costs.matches(grid):
+                raise ValueError("A tabela de custos foi montada para outra grade (ou a grade mudou depois)")
+            if cost_model is not None and cost_model.key() != edge_costs.model.key():
+                raise ValueError("A tabela de custos foi montada com outro modelo de custo")
+            if danger_field is not None and danger_field is not edge_costs.danger_field:
+                raise ValueError("A tabela de custos foi montada com outro campo de perigo")
+            cost_model = edge_costs.model
+            danger_field = edge_costs.danger_field
+        blocked = grid.blocked
+        offsets = grid.offsets
+        stride = grid.stride
+        danger = danger_field.padded() if danger_field is not None else self._zero_danger
+        model = cost_model or DEFAULT_COST_MODEL
+        steps = model.step_costs(tem_bola)
+        multiplier = model.multiplier(tem_bola)
+        dominance = model.dominance(tem_bola) if strategy == "pruned" else None
+
+        start = grid.index(*pos_inicial)
+        goal = grid.index(*pos_objetivo)
+        if blocked[goal]:
+            return SearchResult(Path(stride=grid.stride), float('inf'), 0, 0)
+
+        self._generation += 1
+        generation = self._generation
+        unreachable = float('inf')
+        g_score, parent, stamp, closed = self._g_score, self._parent, self._stamp, self._closed
+        h_value, h_stamp = self._h_value, self._h_stamp
+
+        # Heurística octile vezes o multiplicador de bola (as coordenadas com borda têm
+        # as mesmas diferenças), calculada uma vez por célula e reaproveitada pelas 8
+        # direções de chegada. Todo passo custa pelo menos o custo base vezes o
+        # multiplicador, então ela é consistente (veja heuristicas.check_heuristic)
+        goal_y, goal_x = divmod(goal, stride)
+        start_y, start_x = divmod(start, stride)
+        straight = model.straight_cost * multiplier
+        diagonal = min(model.diagonal_cost, 2 * model.straight_cost) * multiplier
+
+        start_state = start * NUM_HEADINGS + (HEADING_NONE if start_heading is None else start_heading)
+        stamp[start_state] = generation
+        g_score[start_state] = 0.0
+        parent[start_state] = -1
+        if strategy == "bidirectional":
+            return self._bidirectional(grid, start_state, goal, steps, multiplier, danger, model)
+        if stats is not None:
+            return self._search_instrumented(grid, start_state, goal, steps, multiplier, danger, model,
+                                             heuristic, dominance, stats)
+        if edge_costs is not None:
+            return self._search_table(grid, start_state, goal, edge_costs, tem_bola, multiplier, model, heuristic)
+        open_list = self._open_list
+        open_list.clear()
+        if heuristic is None:
+            dx, dy = abs(goal_x - start_x), abs(goal_y - start_y)
+            open_list.append((diagonal * dx + straight * (dy - dx) if dx < dy else diagonal * dy + straight * (dx - dy),
+                              0.0, start_state))
+        else:
+            open_list.append((heuristic[start_state], 0.0, start_state))
+        expansions = 0
+        pushes = 1
+
+        while open_list:
+            _, g, state = heapq.heappop(open_list)
+            if g > g_score[state]:
+                continue  # entrada desatualizada: o estado já foi melhorado
+
+            cell, heading = divmod(state, NUM_HEADINGS)
+            if cell == goal:
+                path = _reconstruct_states(grid, parent, state)
+                open_list.clear()
+                return SearchResult(path, g, expansions, pushes)
+            if dominance is not None:
+                base = cell * NUM_HEADINGS
+                dominated = False
+                for other, margin in dominance[heading]:
+                    if closed[base + other] == generation and g_score[base + other] + margin <= g:
+                        dominated = True
+                        break
+                if dominated:
+                    continue  # outra direção já expandida nesta célula é pelo menos tão boa
+                closed[state] = generation
+            expansions += 1
+
+            row = steps[heading]
+            for move in range(8):
+                next_cell = cell + offsets[move]
+                if blocked[next_cell]:
+                    continue
+                tentative_g = g + (row[move] + danger[next_cell]) * multiplier
+                next_state = next_cell * NUM_HEADINGS + move
+                if stamp[next_state] != generation or tentative_g < g_score[next_state]:
+                    if dominance is not None:
+                        next_base = next_cell * NUM_HEADINGS
+                        dominated = False
+                        for other, margin in dominance[move]:
+                            if (closed[next_base + other] == generation
+                                    and g_score[next_base + other] + margin <= tentative_g):
+                                dominated = True
+                                break
+                        if dominated:
+                            continue
+                    stamp[next_state] = generation
+                    g_score[next_state] = tentative_g
+                    parent[next_state] = state
+                    if heuristic is None:
+                        if h_stamp[next_cell] != generation:
+                            h_stamp[next_cell] = generation
+                            y, x = divmod(next_cell, stride)
+                            dx, dy = abs(goal_x - x), abs(goal_y - y)
+                            h_value[next_cell] = (diagonal * dx + straight * (dy - dx) if dx < dy
+                                                  else diagonal * dy + straight * (dx - dy))
+                        h = h_value[next_cell]
+                    else:
+                        h = heuristic[next_state]
+                        if h == unreachable:
+                            continue  # não alcança o objetivo
+                    heapq.heappush(open_list, (tentative_g + h, tentative_g, next_state))
+                    pushes += 1
+
+        return SearchResult(Path(stride=grid.stride), float('inf'), expansions, pushes)  # No path found
+
+    def _search_instrumented(self, grid: 'OccupancyGrid', start_state: int, goal: int, steps, multiplier: float,
+                             danger: List[float], model: 'CostModel', heuristic, dominance,
+                             stats: SearchStats) -> 'SearchResult':
+        """
+        Mesmo laço de search (estratégias "full" e "pruned"), contando e medindo
+        cada etapa em `stats`. Fica separado para o laço normal não ter nenhum teste
+        a mais por estado.
+        """
+        clock = time.perf_counter
+        started = clock()
+        blocked, offsets, stride = grid.blocked, grid.offsets, grid.stride
+        generation = self._generation
+        g_score, parent, stamp, closed = self._g_score, self._parent, self._stamp, self._closed
+        goal_y, goal_x = divmod(goal, stride)
+        straight = model.straight_cost * multiplier
+        diagonal = min(model.diagonal_cost, 2 * model.straight_cost) * multiplier
+        position = grid.position
+
+        def state_h(cell, state):
+            if heuristic is not None:
+                return heuristic[state]
+            y, x = divmod(cell, stride)
+            dx, dy = abs(goal_x - x), abs(goal_y - y)
+            return diagonal * dx + straight * (dy - dx) if dx < dy else diagonal * dy + straight * (dx - dy)
+
+        open_list = [(state_h(start_state // NUM_HEADINGS, start_state), 0.0, start_state)]
+        stats.pushes += 1
+        cost_time = heap_time = 0.0
+        result = None
+
+        while open_list:
+            t0 = clock()
+            f, g, state = heapq.heappop(open_list)
+            heap_time += clock() - t0
+            if g > g_score[state]:
+                stats.stale_pops += 1
                 continue
-            
-            # NOVO: Calcula custo considerando todos os fatores
-            movement_cost = calculate_movement_cost(
-                current_pos=current_pos,
-                next_pos=neighbor_pos,
-                previous_pos=current_node['parent']['position'] if current_node['parent'] else None,
-                tem_bola=tem_bola,
-                obstaculos=obstaculos
+
+            cell, heading = divmod(state, NUM_HEADINGS)
+            if cell == goal:
+                result = SearchResult(_reconstruct_states(grid, parent, state), g, stats.expansions, stats.pushes)
+                break
+            if dominance is not None:
+                base = cell * NUM_HEADINGS
+                if any(closed[base + other] == generation and g_score[base + other] + margin <= g
+                       for other, margin in dominance[heading]):
+                    stats.pruned += 1
+                    continue
+                closed[state] = generation
+            stats.expansions += 1
+            stats.expanded.append((position(cell), heading, g, f - g))
+            stats.open_sizes.append(len(open_list))
+
+            row = steps[heading]
+            for move in range(8):
+                t0 = clock()
+                next_cell = cell + offsets[move]
+                if blocked[next_cell]:
+                    cost_time += clock() - t0
+                    continue
+                tentative_g = g + (row[move] + danger[next_cell]) * multiplier
+                next_state = next_cell * NUM_HEADINGS + move
+                improved = stamp[next_state] != generation or tentative_g < g_score[next_state]
+                if improved and dominance is not None:
+                    next_base = next_cell * NUM_HEADINGS
+                    if any(closed[next_base + other] == generation and g_score[next_base + other] + margin <= tentative_g
+                           for other, margin in dominance[move]):
+                        stats.pruned += 1
+                        improved = False
+                if not improved:
+                    cost_time += clock() - t0
+                    continue
+                stamp[next_state] = generation
+                g_score[next_state] = tentative_g
+                parent[next_state] = state
+                h = state_h(next_cell, next_state)
+                cost_time += clock() - t0
+                if h == float('inf'):
+                    continue  # não alcança o objetivo
+                t0 = clock()
+                heapq.heappush(open_list, (tentative_g + h, tentative_g, next_state))
+                heap_time += clock() - t0
+                stats.pushes += 1
+                if len(open_list) > stats.max_open:
+                    stats.max_open = len(open_list)
+
+        stats.cost_time_s += cost_time
+        stats.heap_time_s += heap_time
+        stats.total_time_s += clock() - started
+        if result is None:
+            result = SearchResult(Path(stride=stride), float('inf'), stats.expansions, stats.pushes)
+        return result
+
+    def _search_table(self, grid: 'OccupancyGrid', start_state: int, goal: int, table: 'EdgeCostTable',
+                      tem_bola: bool, multiplier: float, model: 'CostModel', heuristic) -> 'SearchResult':
+        """
+        Laço de search (estratégia "full") com os custos de EdgeCostTable: as
+        arestas de cada estado são os vizinhos livres da célula (table.neighbors)
+        com os custos já prontos (table.rows), sem teste da grade nem aritmética.
+        """
+        stride = grid.stride
+        neighbors, rows = table.neighbors, table.rows(tem_bola)
+        generation = self._generation
+        unreachable = float('inf')
+        g_score, parent, stamp = self._g_score, self._parent, self._stamp
+        h_value, h_stamp = self._h_value, self._h_stamp
+        goal_y, goal_x = divmod(goal, stride)
+        straight = model.straight_cost * multiplier
+        diagonal = min(model.diagonal_cost, 2 * model.straight_cost) * multiplier
+
+        open_list = self._open_list
+        open_list.clear()
+        if heuristic is None:
+            start_y, start_x = divmod(start_state // NUM_HEADINGS, stride)
+            dx, dy = abs(goal_x - start_x), abs(goal_y - start_y)
+            open_list.append((diagonal * dx + straight * (dy - dx) if dx < dy else diagonal * dy + straight * (dx - dy),
+                              0.0, start_state))
+        else:
+            open_list.append((heuristic[start_state], 0.0, start_state))
+        expansions = 0
+        pushes = 1
+
+        while open_list:
+            _, g, state = heapq.heappop(open_list)
+            if g > g_score[state]:
+                continue  # entrada desatualizada: o estado já foi melhorado
+
+            cell = state // NUM_HEADINGS
+            if cell == goal:
+                path = _reconstruct_states(grid, parent, state)
+                open_list.clear()
+                return SearchResult(path, g, expansions, pushes)
+            expansions += 1
+
+            for (next_state, next_cell), cost in zip(neighbors[cell], rows[state]):
+                tentative_g = g + cost
+                if stamp[next_state] != generation or tentative_g < g_score[next_state]:
+                    stamp[next_state] = generation
+                    g_score[next_state] = tentative_g
+                    parent[next_state] = state
+                    if heuristic is None:
+                        if h_stamp[next_cell] != generation:
+                            h_stamp[next_cell] = generation
+                            y, x = divmod(next_cell, stride)
+                            dx, dy = abs(goal_x - x), abs(goal_y - y)
+                            h_value[next_cell] = (diagonal * dx + straight * (dy - dx) if dx < dy
+                                                  else diagonal * dy + straight * (dx - dy))
+                        h = h_value[next_cell]
+                    else:
+                        h = heuristic[next_state]
+                        if h == unreachable:
+                            continue  # não alcança o objetivo
+                    heapq.heappush(open_list, (tentative_g + h, tentative_g, next_state))
+                    pushes += 1
+
+        return SearchResult(Path(stride=grid.stride), float('inf'), expansions, pushes)  # No path found
+
+    def search_anytime(self, grid: 'OccupancyGrid', pos_inicial: Tuple[int, int], pos_objetivo: Tuple[int, int],
+                       tem_bola: bool = False, danger_field: 'DangerField' = None,
+                       cost_model: 'CostModel' = None, start_heading: int = None, deadline_us: float = None,
+                       max_expansions: int = None, epsilon: float = 2.5,
+                       epsilon_step: float = 0.5) -> 'AnytimeResult':
+        """
+        ARA*: A* ponderado (f = g + epsilon * h) repetido com epsilon cada vez menor,
+        reaproveitando os g-scores da passada anterior, até epsilon = 1 ou até o
+        orçamento acabar. Devolve o melhor caminho achado até ali.
+
+        h é a octile vezes o multiplicador de bola, consistente com o modelo de
+        custo, então cada passada completa termina com custo <= epsilon * ótimo.
+        `bound` é esse epsilon, apertado pela cota do ARA* (custo / min(g + h) dos
+        estados ainda abertos ou inconsistentes); optimal=True quando chega a 1. Um
+        caminho achado no meio de uma passada interrompida vem com bound=inf.
+
+        O relógio (deadline_us) e as expansões (max_expansions) são conferidos antes
+        de cada expansão, e a cada 256 estados na montagem da fila de uma passada.
+        Liberar as entradas das filas também leva tempo (~0,2 µs cada), então as
+        expansões param cedo o bastante para reconstruir o caminho (~2 µs por passo)
+        e liberar tudo o que a chamada alocou (veja _release), e o coletor de lixo
+        fica desligado durante a chamada (a coleta adiada roda na próxima alocação
+        de quem chamou). Isso não é garantia de tempo real: os custos por entrada
+        são estimativas (RELEASE_NS, HEAPIFY_NS), e se o sistema tirar a CPU do
+        processo no meio da chamada ela atrasa o mesmo tanto (milissegundos numa
+        máquina compartilhada).
+        """
+        deadline = None if deadline_us is None else time.perf_counter_ns() + int(deadline_us * 1000)
+        if (grid.largura, grid.altura) != (self.largura, self.altura):
+            raise ValueError(
+                f"Planner {self.largura}x{self.altura} não serve para o grid {grid.largura}x{grid.altura}"
             )
-            
-            tentative_g = current_node['g'] + movement_cost
-            
-            # Create or update neighbor
-            if neighbor_pos not in open_dict:
-                neighbor = create_node(
-                    position=neighbor_pos,
-                    g=tentative_g,
-                    h=euclidean_distance(neighbor_pos, pos_objetivo),
-                    parent=current_node
-                )
-                heapq.heappush(open_list, (neighbor['f'], neighbor_pos))
-                open_dict[neighbor_pos] = neighbor
-            elif tentative_g < open_dict[neighbor_pos]['g']:
-                # Found a better path to the neighbor
-                neighbor = open_dict[neighbor_pos]
-                neighbor['g'] = tentative_g
-                neighbor['f'] = tentative_g + neighbor['h']
-                neighbor['parent'] = current_node
-    
-    return []  # No path found
+        # Uma coleta completa do GC leva dezenas de ms; com prazo ela fica para depois da chamada
+        with _GC_PAUSE if deadline is not None else nullcontext():
+            return self._anytime(grid, pos_inicial, pos_objetivo, tem_bola, danger_field, cost_model, start_heading,
+                                 deadline, max_expansions, epsilon, epsilon_step)
+
+    # Custos estimados por entrada de fila (com folga) para liberar e para heapify,
+    # usados para reservar no prazo o tempo desse trabalho, que não é interrompível
+    RELEASE_NS = 250
+    HEAPIFY_NS = 250
+
+    def _anytime(self, grid, pos_inicial, pos_objetivo, tem_bola, danger_field, cost_model, start_heading,
+                 deadline, max_expansions, epsilon, epsilon_step) -> 'AnytimeResult':
+        """Laço do ARA* de search_anytime; `deadline` é o prazo absoluto em ns"""
+        self._trim_discarded()
+        blocked = grid.blocked
+        offsets = grid.offsets
+        stride = grid.stride
+        danger = danger_field.padded() if danger_field is not None else self._zero_danger
+        model = cost_model or DEFAULT_COST_MODEL
+        steps = model.step_costs(tem_bola)
+        multiplier = model.multiplier(tem_bola)
+        straight = model.straight_cost * multiplier
+        diagonal = min(model.diagonal_cost, 2 * model.straight_cost) * multiplier
+        release_ns, heapify_ns = self.RELEASE_NS, self.HEAPIFY_NS
+
+        start = grid.index(*pos_inicial)
+        goal = grid.index(*pos_objetivo)
+        if blocked[goal]:
+            return AnytimeResult(Path(stride=grid.stride), float('inf'), 0, 0, float('inf'), False, 0)
+
+        self._generation += 1
+        generation = self._generation
+        g_score, parent, stamp, closed = self._g_score, self._parent, self._stamp, self._closed
+        h_value, h_stamp = self._h_value, self._h_stamp
+        goal_y, goal_x = divmod(goal, stride)
+        start_y, start_x = divmod(start, stride)
+        if deadline is not None:
+            # Folga para reconstruir o caminho: ~1 µs por passo, até o dobro da distância
+            stop_at = deadline - 2000 * max(abs(start_x - goal_x), abs(start_y - goal_y))
+
+        def heuristic(cell):
+            if h_stamp[cell] != generation:
+                h_stamp[cell] = generation
+                y, x = divmod(cell, stride)
+                dx, dy = abs(x - goal_x), abs(y - goal_y)
+                h_value[cell] = diagonal * dx + straight * (dy - dx) if dx < dy else diagonal * dy + straight * (dx - dy)
+            return h_value[cell]
+
+        start_state = start * NUM_HEADINGS + (HEADING_NONE if start_heading is None else start_heading)
+        stamp[start_state] = generation
+        g_score[start_state] = 0.0
+        parent[start_state] = -1
+        if start == goal:
+            return AnytimeResult(Path([start], grid.stride), 0.0, 0, 0, 1.0, True, 1)
+
+        best_state, best_cost = -1, float('inf')
+        open_list = [(epsilon * heuristic(start), 0.0, start_state)]
+        incons = []
+        retained = 0  # entradas desta chamada já em self._discarded, a liberar no fim
+        expansions = 0
+        pushes = 1
+        iterations = 0
+        bound = float('inf')  # sem passada completa não há garantia
+        out_of_budget = False
+
+        while True:
+            # Cada passada usa uma marca nova em `closed`; as anteriores deixam de valer
+            self._generation += 1
+            closed_mark = self._generation
+            while open_list:
+                f, g, state = open_list[0]
+                if g > g_score[state] or closed[state] == closed_mark:
+                    heapq.heappop(open_list)  # desatualizada ou já expandida nesta passada
+                    continue
+                if f >= best_cost:
+                    break
+                # Com prazo, para a tempo de liberar tudo o que esta chamada alocou
+                if ((max_expansions is not None and expansions >= max_expansions)
+                        or (deadline is not None
+                            and time.perf_counter_ns() + release_ns * (len(open_list) + retained) >= stop_at)):
+                    out_of_budget = True
+                    break
+                heapq.heappop(open_list)
+                closed[state] = closed_mark
+                expansions += 1
+
+                cell, heading = divmod(state, NUM_HEADINGS)
+                row = steps[heading]
+                for move in range(8):
+                    next_cell = cell + offsets[move]
+                    if blocked[next_cell]:
+                        continue
+                    tentative_g = g + (row[move] + danger[next_cell]) * multiplier
+                    next_state = next_cell * NUM_HEADINGS + move
+                    if stamp[next_state] != generation or tentative_g < g_score[next_state]:
+                        stamp[next_state] = generation
+                        g_score[next_state] = tentative_g
+                        parent[next_state] = state
+                        if next_cell == goal:
+                            if tentative_g < best_cost:
+                                best_state, best_cost = next_state, tentative_g
+                        elif closed[next_state] == closed_mark:
+                            incons.append(next_state)  # volta na próxima passada
+                        else:
+                            heapq.heappush(open_list, (tentative_g + epsilon * heuristic(next_cell),
+                                                       tentative_g, next_state))
+                            pushes += 1
+            if out_of_budget:
+                break
+            iterations += 1
+            # Passada completa: custo <= epsilon * ótimo. A cota do ARA* aperta isso com
+            # min(g + h) dos estados que ainda podem melhorar algum caminho
+            bound = epsilon
+            if epsilon <= 1.0:
+                break
+            # Monta a fila da próxima passada: ~1 µs por entrada, mais liberar a fila
+            # velha e a nova. Só começa se o prazo comportar, e o relógio é conferido a
+            # cada 256 estados contra um limite que reserva o tempo de liberar as duas
+            if deadline is not None:
+                entries = len(open_list) + len(incons)
+                build_until = stop_at - release_ns * (2 * entries + retained)
+                if time.perf_counter_ns() + 1000 * entries >= build_until:
+                    break
+            next_epsilon = max(1.0, epsilon - epsilon_step)
+            pending = set(incons)
+            for count, (_, g, state) in enumerate(open_list):
+                if deadline is not None and not count & 255 and time.perf_counter_ns() >= build_until:
+                    out_of_budget = True
+                    break
+                if g <= g_score[state] and closed[state] != closed_mark:
+                    pending.add(state)
+            lower = float('inf')
+            next_open = []
+            if not out_of_budget:
+                for count, state in enumerate(pending):
+                    if deadline is not None and not count & 255 and time.perf_counter_ns() >= build_until:
+                        out_of_budget = True
+                        break
+                    g = g_score[state]
+                    h = heuristic(state // NUM_HEADINGS)
+                    if g + h < lower:
+                        lower = g + h
+                    next_open.append((g + next_epsilon * h, g, state))
+            # heapify não é interrompível: só roda se a estimativa couber no prazo
+            if (not out_of_budget and deadline is not None
+                    and time.perf_counter_ns() + heapify_ns * len(next_open) >= build_until):
+                out_of_budget = True
+            if out_of_budget or lower >= best_cost:
+                self._discarded.append(next_open)  # a fila nova não chega a ser usada
+                if not out_of_budget:
+                    bound = 1.0
+                break
+            bound = min(bound, best_cost / lower)
+
+            epsilon = next_epsilon
+            self._discarded.append(open_list)  # entradas antigas: liberadas por _release
+            retained += len(open_list)
+            open_list = next_open
+            heapq.heapify(open_list)
+            incons = []
+            pending = next_open = None
+        self._discarded.append(open_list)
+        open_list = incons = pending = None
+
+        if best_state == -1:
+            result = AnytimeResult(Path(stride=grid.stride), float('inf'), expansions, pushes, float('inf'), False,
+                                   iterations)
+        else:
+            result = AnytimeResult(_reconstruct_states(grid, parent, best_state), best_cost, expansions, pushes,
+                                   bound, bound <= 1.0, iterations)
+        # Com o caminho pronto, o tempo reservado até o prazo vai para liberar as filas
+        self._release(deadline)
+        return result
+
+    # Teto de entradas em filas descartadas que ficam para as próximas chamadas; só
+    # é atingido se várias chamadas seguidas estourarem a estimativa de _release
+    DISCARD_LIMIT = 50_000
+    RELEASE_BLOCK = 32
+
+    def _release(self, deadline):
+        """
+        Libera as filas descartadas pelo ARA* em blocos de RELEASE_BLOCK entradas,
+        enquanto o bloco seguinte ainda couber no prazo. As expansões já param com
+        tempo reservado para isso, então normalmente tudo é liberado; o que sobrar
+        fica para a próxima chamada.
+        """
+        discarded = self._discarded
+        block = self.RELEASE_BLOCK
+        margin = self.RELEASE_NS * block
+        while discarded:
+            if deadline is not None and time.perf_counter_ns() + margin >= deadline:
+                return
+            entries = discarded[-1]
+            del entries[-block:]
+            if not entries:
+                discarded.pop()
+
+    def _trim_discarded(self):
+        """
+        Libera, sem olhar prazo, o que passa de DISCARD_LIMIT entradas nas filas
+        descartadas, para que sobras de chamadas que estouraram a estimativa não
+        se acumulem sem fim.
+        """
+        discarded = self._discarded
+        excess = sum(len(entries) for entries in discarded) - self.DISCARD_LIMIT
+        while excess > 0:
+            entries = discarded[0]
+            if len(entries) <= excess:
+                excess -= len(entries)
+                discarded.pop(0)
+            else:
+                del entries[-excess:]
+                excess = 0
+
+    def _bidirectional(self, grid: 'OccupancyGrid', start_state: int, goal: int, steps, multiplier: float,
+                       danger: List[float], model: 'CostModel') -> 'SearchResult':
+        """
+        A* bidirecional sobre os mesmos estados (célula, direção de chegada).
+
+        A busca reversa guarda, para cada estado, o custo dele até o objetivo e o
+        próximo estado do caminho; os estados (objetivo, qualquer direção) começam
+        com custo zero. Cada vez que um lado alcança um estado já visto pelo outro,
+        mu = g_frente + g_trás é um caminho completo.
+
+        As chaves usam o potencial médio p(v) = (octile(v, objetivo) - octile(v, início)) / 2:
+        a frente ordena por g + p(v) e a busca reversa por g - p(v). Octile é consistente
+        mesmo com rotação e perigo (que só somam custo), a média de dois potenciais
+        consistentes também é, e com potenciais opostos nos dois lados vale o critério
+        de parada do Dijkstra bidirecional: menor chave da frente + menor chave de trás >= mu.
+        """
+        if self._backward is None:
+            states = len(self._g_score)
+            self._backward = ([float('inf')] * states, [-1] * states, [0] * states)
+        g_back, next_state_of, stamp_back = self._backward
+        g_score, parent, stamp = self._g_score, self._parent, self._stamp
+        generation = self._generation
+        blocked = grid.blocked
+        offsets = grid.offsets
+        stride = grid.stride
+        straight = model.straight_cost * multiplier
+        diagonal = min(model.diagonal_cost, 2 * model.straight_cost) * multiplier
+
+        start = start_state // NUM_HEADINGS
+        start_y, start_x = divmod(start, stride)
+        goal_y, goal_x = divmod(goal, stride)
+
+        def potential(cell):
+            y, x = divmod(cell, stride)
+            dx, dy = abs(x - goal_x), abs(y - goal_y)
+            to_goal = diagonal * dx + straight * (dy - dx) if dx < dy else diagonal * dy + straight * (dx - dy)
+            dx, dy = abs(x - start_x), abs(y - start_y)
+            to_start = diagonal * dx + straight * (dy - dx) if dx < dy else diagonal * dy + straight * (dx - dy)
+            return (to_goal - to_start) / 2
+
+        forward = self._open_list
+        forward.clear()
+        forward.append((potential(start), 0.0, start_state))
+        backward = []
+        for heading in range(NUM_HEADINGS):
+            state = goal * NUM_HEADINGS + heading
+            stamp_back[state] = generation
+            g_back[state] = 0.0
+            next_state_of[state] = -1
+            if heading != HEADING_NONE:
+                backward.append((-potential(goal), 0.0, state))
+
+        mu = g_back[start_state] if stamp_back[start_state] == generation else float('inf')
+        meet = start_state
+        expansions = 0
+        pushes = 1 + len(backward)
+
+        while forward and backward and forward[0][0] + backward[0][0] < mu:
+            expansions += 1
+            if forward[0][0] <= backward[0][0]:
+                _, g, state = heapq.heappop(forward)
+                if g > g_score[state]:
+                    expansions -= 1
+                    continue
+                cell, heading = divmod(state, NUM_HEADINGS)
+                row = steps[heading]
+                for move in range(8):
+                    next_cell = cell + offsets[move]
+                    if blocked[next_cell]:
+                        continue
+                    tentative_g = g + (row[move] + danger[next_cell]) * multiplier
+                    next_state = next_cell * NUM_HEADINGS + move
+                    if stamp[next_state] != generation or tentative_g < g_score[next_state]:
+                        stamp[next_state] = generation
+                        g_score[next_state] = tentative_g
+                        parent[next_state] = state
+                        heapq.heappush(forward, (tentative_g + potential(next_cell), tentative_g, next_state))
+                        pushes += 1
+                        if stamp_back[next_state] == generation and tentative_g + g_back[next_state] < mu:
+                            mu = tentative_g + g_back[next_state]
+                            meet = next_state
+            else:
+                _, g, state = heapq.heappop(backward)
+                if g > g_back[state]:
+                    expansions -= 1
+                    continue
+                # Predecessores de (célula, m): (célula - offsets[m], h) para toda direção h
+                cell, move = divmod(state, NUM_HEADINGS)
+                prev_cell = cell - offsets[move]
+                if move == HEADING_NONE or blocked[prev_cell]:
+                    continue
+                entry = danger[cell]
+                base = prev_cell * NUM_HEADINGS
+                for heading in range(NUM_HEADINGS):
+                    prev_state = base + heading
+                    if heading == HEADING_NONE and prev_state != start_state:
+                        continue  # estados sem direção só existem no início
+                    tentative_g = g + (steps[heading][move] + entry) * multiplier
+                    if stamp_back[prev_state] != generation or tentative_g < g_back[prev_state]:
+                        stamp_back[prev_state] = generation
+                        g_back[prev_state] = tentative_g
+                        next_state_of[prev_state] = state
+                        heapq.heappush(backward, (tentative_g - potential(prev_cell), tentative_g, prev_state))
+                        pushes += 1
+                        if stamp[prev_state] == generation and tentative_g + g_score[prev_state] < mu:
+                            mu = tentative_g + g_score[prev_state]
+                            meet = prev_state
+        forward.clear()
+
+        if mu == float('inf'):
+            return SearchResult(Path(stride=grid.stride), mu, expansions, pushes)
+        path = _reconstruct_states(grid, parent, meet)
+        state = next_state_of[meet]
+        while state != -1:
+            path.cells.append(state // NUM_HEADINGS)
+            state = next_state_of[state]
+        return SearchResult(path, mu, expansions, pushes)
+
+def _reconstruct_states(grid: 'OccupancyGrid', parent: List[int], state: int) -> 'Path':
+    cells = array('i')
+    while state != -1:
+        cells.append(state // NUM_HEADINGS)
+        state = parent[state]
+    cells.reverse()
+    return Path(cells, grid.stride)
 
 def create_node(position: Tuple[int, int], g: float = float('inf'), 
                 h: float = 0.0, parent: dict = None) -> dict:
@@ -135,14 +1074,25 @@ def euclidean_distance(pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
     x2, y2 = pos2
     return sqrt((x2-x1)**2 + (y2 - y1)**2)
 
-def get_avaiable_neighbors(grid_dims: List[int], position: Tuple[int,int], obstaculos: List[Tuple[int,int]] = None) -> List[Tuple[int,int]]:
+def octile_distance(pos1: Tuple[int, int], pos2: Tuple[int, int], cost_model: 'CostModel' = None) -> float:
+    """
+    Menor custo base entre duas células num grid de 8 vizinhos (diagonais primeiro, depois retas)
+    """
+    model = cost_model or DEFAULT_COST_MODEL
+    dx = abs(pos2[0] - pos1[0])
+    dy = abs(pos2[1] - pos1[1])
+    diagonal = min(model.diagonal_cost, 2 * model.straight_cost)
+    return diagonal * min(dx, dy) + model.straight_cost * (max(dx, dy) - min(dx, dy))
+
+def get_avaiable_neighbors(grid_dims: List[int], position: Tuple[int,int],
+                           obstaculos: 'List[Tuple[int,int]] | OccupancyGrid' = None) -> List[Tuple[int,int]]:
     """
     Retorna as posições vizinhas válidas (dentro dos limites e sem obstáculos)
     
     Args:
         grid_dims: [largura, altura] do grid
         position: posição atual (x, y)
-        obstaculos: lista de posições com obstáculos
+        obstaculos: OccupancyGrid do campo (ou lista de posições com obstáculos)
     """
     x, y = position
     largura, altura = grid_dims
@@ -150,17 +1100,14 @@ def get_avaiable_neighbors(grid_dims: List[int], position: Tuple[int,int], obsta
     if obstaculos is None:
         obstaculos = []
     
-    possible_moves = [
-        (x+1, y), (x-1, y),    # Direita, Esquerda
-        (x, y+1), (x, y-1),    # Cima, Baixo
-        (x+1, y+1), (x-1, y-1), # Diagonais: Nordeste e Sudoeste
-        (x+1, y-1), (x-1, y+1)  #           Sudeste e Noroeste
-    ]
+    grid = as_occupancy_grid(obstaculos, largura, altura)
+    blocked = grid.blocked
+    index = grid.index(x, y)
 
+    # A borda bloqueada da grade dispensa a checagem de limites
     return [
-        (nx, ny) for nx, ny in possible_moves
-        if 0 <= nx < largura and 0 <= ny < altura
-        and (nx, ny) not in obstaculos
+        (x + dx, y + dy) for (dx, dy), offset in zip(MOVES, grid.offsets)
+        if not blocked[index + offset]
     ]
 
 def reconstruct_path(goal_node: Dict) -> List[Tuple[int,int]]:
@@ -175,7 +1122,8 @@ def reconstruct_path(goal_node: Dict) -> List[Tuple[int,int]]:
 
 def calculate_movement_cost(current_pos: Tuple[int, int], next_pos: Tuple[int, int], 
                           previous_pos: Tuple[int, int] = None, tem_bola: bool = False,
-                          obstaculos: List[Tuple[int, int]] = None) -> float:
+                          obstaculos: List[Tuple[int, int]] = None,
+                          danger_field: 'DangerField' = None, cost_model: 'CostModel' = None) -> float:
     """
     Calcula o custo de movimento considerando:
     - Custo básico de deslocamento (vertical/horizontal vs diagonal)
@@ -184,42 +1132,56 @@ def calculate_movement_cost(current_pos: Tuple[int, int], next_pos: Tuple[int, i
     - Zona de perigo próxima a obstáculos
     """
     
-    # NÍVEL BÁSICO: Custo base do movimento
-    dx = abs(next_pos[0] - current_pos[0])
-    dy = abs(next_pos[1] - current_pos[1])
+    model = cost_model or DEFAULT_COST_MODEL
+
+    # NÍVEL BÁSICO + NÍVEL 1 + NÍVEL 2: custo base e de rotação vêm da tabela do modelo
+    heading = heading_of(previous_pos, current_pos)
+    move = heading_of(current_pos, next_pos)
     
-    # Movimento diagonal custa mais que reto
-    if dx == 1 and dy == 1:
-        base_cost = 1.414  # sqrt(2) - custo diagonal
+    # NÍVEL 3: Zona de perigo (lookup O(1) quando o campo já foi calculado)
+    if danger_field is not None:
+        danger_cost = danger_field.cost(next_pos)
     else:
-        base_cost = 1.0    # custo vertical/horizontal
-    
-    # NÍVEL 1: Custo de rotação
-    rotation_cost = 0.0
-    if previous_pos is not None:
-        rotation_cost = calculate_rotation_penalty(previous_pos, current_pos, next_pos)
+        danger_cost = calculate_danger_zone_cost(next_pos, obstaculos, model) if obstaculos else 0.0
     
-    # NÍVEL 2: Multiplicador por estado (com bola)
-    state_multiplier = 1.0
-    if tem_bola:
-        state_multiplier = 1.5  # Robô mais cuidadoso com a bola
-        rotation_cost *= 2.0    # Penalidade de rotação ainda maior
-    
-    # NÍVEL 3: Zona de perigo
-    danger_cost = calculate_danger_zone_cost(next_pos, obstaculos) if obstaculos else 0.0
-    
-    total_cost = (base_cost + rotation_cost + danger_cost) * state_multiplier
+    return model.movement_cost(heading, move, danger_cost, tem_bola)
+
+def calculate_path_cost(path: List[Tuple[int, int]], tem_bola: bool = False,
+                        obstaculos: List[Tuple[int, int]] = None,
+                        danger_field: 'DangerField' = None, cost_model: 'CostModel' = None) -> float:
+    """
+    Custo total de um caminho (começando na posição inicial) segundo calculate_movement_cost
+    """
+    total_cost = 0.0
+    for i in range(1, len(path)):
+        total_cost += calculate_movement_cost(
+            current_pos=path[i-1],
+            next_pos=path[i],
+            previous_pos=path[i-2] if i > 1 else None,
+            tem_bola=tem_bola,
+            obstaculos=obstaculos,
+            danger_field=danger_field,
+            cost_model=cost_model
+        )
     return total_cost
 
 def calculate_rotation_penalty(prev_pos: Tuple[int, int], current_pos: Tuple[int, int], 
-                             next_pos: Tuple[int, int]) -> float:
+                             next_pos: Tuple[int, int], cost_model: 'CostModel' = None) -> float:
     """
-    Calcula a penalidade de rotação baseada na mudança de direção
+    Calcula a penalidade de rotação baseada na mudança de direção (consulta à tabela do modelo)
+    """
+    model = cost_model or DEFAULT_COST_MODEL
+    heading = heading_of(prev_pos, current_pos)
+    if heading == HEADING_NONE:
+        return 0.0  # Se é o primeiro movimento, não há penalidade
+    return model.rotation[heading][heading_of(current_pos, next_pos)]
+
+def rotation_penalty_for_angle(dir1: Tuple[int, int], dir2: Tuple[int, int],
+                               penalties: Tuple[float, ...] = (0.0, 0.3, 0.6, 1.0, 2.0)) -> float:
+    """
+    Penalidade de rotação entre dois vetores de direção, usada para montar a tabela do CostModel.
+    `penalties` são as penalidades de: reto, curva suave, média, fechada e inversão.
     """
-    # Calcula os vetores de direção
-    dir1 = (current_pos[0] - prev_pos[0], current_pos[1] - prev_pos[1])
-    dir2 = (next_pos[0] - current_pos[0], next_pos[1] - current_pos[1])
-    
     # Se é o primeiro movimento, não há penalidade
     if dir1 == (0, 0):
         return 0.0
@@ -235,21 +1197,23 @@ def calculate_rotation_penalty(prev_pos: Tuple[int, int], current_pos: Tuple[int
         return 0.0
     
     cos_angle = dot_product / (magnitude1 * magnitude2)
+    straight, gentle, medium, sharp, reverse = penalties
     
     # Penalidades baseadas no ângulo de rotação
     if cos_angle > 0.9:      # ~0° - movimento reto
-        return 0.0
+        return straight
     elif cos_angle > 0.7:    # ~45° - curva suave
-        return 0.3
+        return gentle
     elif cos_angle > 0:      # 45°-90° - curva média
-        return 0.6
+        return medium
     elif cos_angle > -0.7:   # 90°-135° - curva fechada
-        return 1.0
+        return sharp
     else:                    # 135°-180° - inversão de marcha
-        return 2.0
+        return reverse
 
 def calculate_danger_zone_cost(position: Tuple[int, int], 
-                              obstaculos: List[Tuple[int, int]]) -> float:
+                              obstaculos: 'List[Tuple[int, int]] | OccupancyGrid',
+                              cost_model: 'CostModel' = None) -> float:
     """
     Calcula o custo adicional por estar em zona de perigo (próximo a obstáculos)
     """
@@ -262,17 +1226,563 @@ def calculate_danger_zone_cost(position: Tuple[int, int],
         distance = euclidean_distance(position, obs_pos)
         min_distance = min(min_distance, distance)
     
+    return danger_cost_for_distance(min_distance, (cost_model or DEFAULT_COST_MODEL).danger_tiers)
+
+def danger_cost_for_distance(min_distance: float,
+                             tiers: Tuple[Tuple[float, float], ...] = DEFAULT_DANGER_TIERS) -> float:
+    """
+    Converte a distância até o obstáculo mais próximo no custo de perigo: o custo
+    da primeira faixa que alcança essa distância (com as padrão: 3.0 adjacente,
+    2.0 na diagonal, 1.0 a 2 células, 0.5 a ~2.5 células)
+    """
     # Zona de perigo: quanto mais próximo do obstáculo, maior o custo
-    if min_distance <= 1.0:        # Adjacente ao obstáculo
-        return 3.0
-    elif min_distance <= 1.414:    # Diagonal do obstáculo
-        return 2.0
-    elif min_distance <= 2.0:      # 2 células de distância
-        return 1.0
-    elif min_distance <= 2.5:      # ~2.5 células de distância
-        return 0.5
-    else:
-        return 0.0
+    for max_distance, cost in tiers:
+        if min_distance <= max_distance:
+            return cost
+    return 0.0
+
+def heading_of(from_pos: Tuple[int, int], to_pos: Tuple[int, int]) -> int:
+    """
+    Índice em MOVES do passo from_pos -> to_pos (HEADING_NONE se não houve movimento)
+    """
+    if from_pos is None or from_pos == to_pos:
+        return HEADING_NONE
+    return HEADING_INDEX[(to_pos[0] - from_pos[0], to_pos[1] - from_pos[1])]
+
+class CostModel:
+    """
+    Modelo de custo de movimento com as tabelas pré-calculadas.
+
+    Como só existem 8x8 pares de direções, custo base e penalidade de rotação
+    (e a versão dobrada para quando o robô tem a bola) são montados uma única
+    vez; cada relaxamento de aresta vira duas consultas de tabela. O mesmo
+    objeto é usado pela busca, pelos simuladores e pelo debug, então os números
+    sempre batem.
+    """
+
+    def __init__(self, straight_cost: float = 1.0, diagonal_cost: float = 1.414,
+                 rotation_penalties: Tuple[float, ...] = (0.0, 0.3, 0.6, 1.0, 2.0),
+                 ball_multiplier: float = 1.5, ball_rotation_multiplier: float = 2.0,
+                 danger_tiers: Tuple[Tuple[float, float], ...] = DEFAULT_DANGER_TIERS):
+        self.straight_cost = straight_cost
+        self.diagonal_cost = diagonal_cost
+        self.rotation_penalties = tuple(rotation_penalties)
+        self.ball_multiplier = ball_multiplier
+        self.ball_rotation_multiplier = ball_rotation_multiplier
+        # NÍVEL 3: faixas de perigo (distância máxima, custo), usadas pelos DangerField do modelo
+        self.danger_tiers = tuple((float(distance), float(cost)) for distance, cost in danger_tiers)
+        if any(a[0] > b[0] for a, b in zip(self.danger_tiers, self.danger_tiers[1:])):
+            raise ValueError("As faixas de perigo precisam estar em ordem crescente de distância")
+        # A octile da busca supõe que nenhum passo custa menos que o reto e que nada
+        # soma custo negativo; fora disso ela superestima e o A* perde a otimalidade
+        for nome in ("straight_cost", "diagonal_cost", "ball_multiplier"):
+            if not getattr(self, nome) > 0:
+                raise ValueError(f"{nome} precisa ser positivo")
+        if diagonal_cost < straight_cost:
+            raise ValueError("diagonal_cost não pode ser menor que straight_cost")
+        if len(self.rotation_penalties) != 5 or self.rotation_penalties[0] < 0 or any(
+                a > b for a, b in zip(self.rotation_penalties, self.rotation_penalties[1:])):
+            raise ValueError("rotation_penalties são 5 valores não negativos e não decrescentes (reto -> ré)")
+        if ball_rotation_multiplier < 0 or any(cost < 0 for _, cost in self.danger_tiers):
+            raise ValueError("ball_rotation_multiplier e os custos de perigo não podem ser negativos")
+        self._danger_fields = OrderedDict()  # (fingerprint, largura, altura) -> DangerField
+
+        # NÍVEL BÁSICO: custo base de cada movimento
+        self.base = [diagonal_cost if dx != 0 and dy != 0 else straight_cost for dx, dy in MOVES]
+
+        # NÍVEL 1: rotation[direção de chegada][próximo movimento]; HEADING_NONE não penaliza
+        self.rotation = [
+            [rotation_penalty_for_angle(MOVES[heading], move, self.rotation_penalties) for move in MOVES]
+            for heading in range(len(MOVES))
+        ]
+        self.rotation.append([0.0] * len(MOVES))
+
+        # NÍVEL 2: com bola a rotação é multiplicada antes de somar ao custo base
+        self._steps = {}
+        for tem_bola in (False, True):
+            rotation_multiplier = ball_rotation_multiplier if tem_bola else 1.0
+            self._steps[tem_bola] = [
+                [self.base[move] + row[move] * rotation_multiplier for move in range(len(MOVES))]
+                for row in self.rotation
+            ]
+        self._multipliers = {False: 1.0, True: ball_multiplier}
+
+        # Margem de dominância entre direções: max sobre os movimentos de quanto sair
+        # de h1 custa a mais que sair de h2. _dominance[tem_bola][h2] lista (h1, margem)
+        self._dominance = {}
+        for tem_bola in (False, True):
+            self._dominance[tem_bola] = [
+                [(h1, self.dominance_margin(h1, h2, tem_bola)) for h1 in range(NUM_HEADINGS) if h1 != h2]
+                for h2 in range(NUM_HEADINGS)
+            ]
+
+    def key(self) -> tuple:
+        """Parâmetros que definem o modelo; modelos com a mesma chave dão os mesmos custos"""
+        return (self.straight_cost, self.diagonal_cost, self.rotation_penalties,
+                self.ball_multiplier, self.ball_rotation_multiplier, self.danger_tiers)
+
+    def step_costs(self, tem_bola: bool) -> List[List[float]]:
+        """Custo base + rotação, indexado por [direção de chegada][movimento]"""
+        return self._steps[bool(tem_bola)]
+
+    def multiplier(self, tem_bola: bool) -> float:
+        return self._multipliers[bool(tem_bola)]
+
+    def dominance(self, tem_bola: bool) -> List[List[Tuple[int, float]]]:
+        """Para cada direção h2, os pares (h1, margem) usados pela estratégia 'pruned'"""
+        return self._dominance[bool(tem_bola)]
+
+    def dominance_margin(self, h1: int, h2: int, tem_bola: bool = False) -> float:
+        """Chegar em h1 com g1 domina chegar em h2 com g2 quando g1 + margem <= g2"""
+        steps = self._steps[bool(tem_bola)]
+        return max(a - b for a, b in zip(steps[h1], steps[h2])) * self._multipliers[bool(tem_bola)]
+
+    def movement_cost(self, heading: int, move: int, danger_cost: float = 0.0, tem_bola: bool = False) -> float:
+        return (self._steps[bool(tem_bola)][heading][move] + danger_cost) * self._multipliers[bool(tem_bola)]
+
+    def danger_cost(self, min_distance: float) -> float:
+        return danger_cost_for_distance(min_distance, self.danger_tiers)
+
+    def danger_field(self, obstaculos, largura_grid: int, altura_grid: int) -> 'DangerField':
+        """
+        DangerField destes obstáculos com as faixas do modelo, guardado num cache
+        pequeno por modelo (chave: fingerprint da grade). O campo devolvido é
+        compartilhado: quem precisa de DangerField.update deve montar o seu.
+        """
+        grid = as_occupancy_grid(obstaculos, largura_grid, altura_grid)
+        chave = (grid.fingerprint(), largura_grid, altura_grid)
+        field = self._danger_fields.get(chave)
+        if field is None:
+            field = self._danger_fields[chave] = DangerField(grid, largura_grid, altura_grid, self.danger_tiers)
+            if len(self._danger_fields) > 8:
+                self._danger_fields.popitem(last=False)
+        else:
+            self._danger_fields.move_to_end(chave)
+        return field
+
+DEFAULT_COST_MODEL = CostModel()
+
+class OccupancyGrid:
+    """
+    Grade de ocupação compacta: um bytearray com uma borda de uma célula marcada
+    como bloqueada, de modo que checar obstáculo e limites é um único acesso por índice.
+
+    Continua se comportando como a lista de obstáculos original para quem só itera
+    sobre ela ou testa `pos in obstaculos`.
+    """
+
+    def __init__(self, largura_grid: int, altura_grid: int, obstaculos: List[Tuple[int, int]] = ()):
+        self.largura = largura_grid
+        self.altura = altura_grid
+        self.stride = largura_grid + 2
+        self.blocked = bytearray(b'\x01') * (self.stride * (altura_grid + 2))
+        # Deslocamento de índice de cada movimento em MOVES
+        self.offsets = [dy * self.stride + dx for dx, dy in MOVES]
+
+        for y in range(altura_grid):
+            inicio = self.index(0, y)
+            self.blocked[inicio:inicio + largura_grid] = bytes(largura_grid)
+
+        self._fingerprint = None
+        self.obstacles = []
+        for x, y in obstaculos:
+            if 0 <= x < largura_grid and 0 <= y < altura_grid and not self.blocked[self.index(x, y)]:
+                self.blocked[self.index(x, y)] = 1
+                self.obstacles.append((x, y))
+
+    @classmethod
+    def from_blocked(cls, largura_grid: int, altura_grid: int, blocked: bytes) -> 'OccupancyGrid':
+        """Reconstrói a grade a partir do bytearray `blocked` de outra (ex: recebido por outro processo)"""
+        padded = np.frombuffer(blocked, dtype=np.uint8).reshape(altura_grid + 2, largura_grid + 2)
+        ys, xs = np.nonzero(padded[1:-1, 1:-1])
+        return cls(largura_grid, altura_grid, list(zip(xs.tolist(), ys.tolist())))
+
+    def crop(self, x0: int, y0: int, largura: int, altura: int) -> 'OccupancyGrid':
+        """Grade só com a janela [x0, x0+largura) x [y0, y0+altura), em coordenadas locais"""
+        obstaculos = [(x - x0, y - y0) for y in range(y0, y0 + altura) for x in range(x0, x0 + largura)
+                      if self.blocked[self.index(x, y)]]
+        return OccupancyGrid(largura, altura, obstaculos)
+
+    def fingerprint(self) -> bytes:
+        """Hash curto do conteúdo da grade, calculado uma vez (chave de caches de planos)"""
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.blake2b(self.blocked, digest_size=16).digest()
+        return self._fingerprint
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.stride + x + 1
+
+    def position(self, index: int) -> Tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return x - 1, y - 1
+
+    def mask(self) -> np.ndarray:
+        """Máscara booleana largura x altura dos obstáculos (sem a borda)"""
+        padded = np.frombuffer(bytes(self.blocked), dtype=np.uint8).reshape(self.altura + 2, self.stride)
+        return padded[1:-1, 1:-1].T.astype(bool)
+
+    def add_obstacle(self, position: Tuple[int, int]) -> bool:
+        """Marca a célula como obstáculo; retorna False se ela já estava ocupada"""
+        x, y = position
+        if not (0 <= x < self.largura and 0 <= y < self.altura) or self.blocked[self.index(x, y)]:
+            return False
+        self.blocked[self.index(x, y)] = 1
+        self.obstacles.append((x, y))
+        self._fingerprint = None
+        return True
+
+    def remove_obstacle(self, position: Tuple[int, int]) -> bool:
+        """Libera a célula; retorna False se ela não era um obstáculo"""
+        if position not in self:
+            return False
+        x, y = position
+        self.blocked[self.index(x, y)] = 0
+        self.obstacles.remove((x, y))
+        self._fingerprint = None
+        return True
+
+    def __contains__(self, position) -> bool:
+        x, y = position
+        return 0 <= x < self.largura and 0 <= y < self.altura and bool(self.blocked[self.index(x, y)])
+
+    def __iter__(self):
+        return iter(self.obstacles)
+
+    def __len__(self) -> int:
+        return len(self.obstacles)
+
+def as_occupancy_grid(obstaculos, largura_grid: int, altura_grid: int) -> OccupancyGrid:
+    """
+    Devolve a OccupancyGrid dos obstáculos, convertendo listas apenas uma vez
+    """
+    if isinstance(obstaculos, OccupancyGrid):
+        if (obstaculos.largura, obstaculos.altura) != (largura_grid, altura_grid):
+            raise ValueError(
+                f"OccupancyGrid {obstaculos.largura}x{obstaculos.altura} não corresponde "
+                f"ao grid {largura_grid}x{altura_grid}"
+            )
+        return obstaculos
+    return OccupancyGrid(largura_grid, altura_grid, obstaculos)
+
+class Path:
+    """
+    Caminho compacto: os índices com borda (OccupancyGrid.index) das células num
+    array('i'), mais um cursor para a próxima posição a consumir.
+
+    Se comporta como a lista de tuplas (x, y) de antes para quem lê (len, índice,
+    fatias, iteração, comparação com listas), mas popleft() só avança o cursor
+    (O(1), contra O(n) de list.pop(0)) e fatias copiam só os inteiros. As posições
+    já consumidas saem de len/iteração, mas continuam no array para cost() saber
+    de que direção o robô chegou.
+    """
+
+    __slots__ = ("cells", "stride", "_cursor")
+
+    def __init__(self, cells=(), stride: int = 0, cursor: int = 0):
+        self.cells = cells if isinstance(cells, array) else array('i', cells)
+        self.stride = stride
+        self._cursor = cursor
+
+    @classmethod
+    def from_positions(cls, positions, largura_grid: int) -> 'Path':
+        """Converte uma lista de tuplas (x, y) de um campo com esta largura"""
+        stride = largura_grid + 2
+        return cls([(y + 1) * stride + x + 1 for x, y in positions], stride)
+
+    def _position(self, cell: int) -> Tuple[int, int]:
+        y, x = divmod(cell, self.stride)
+        return x - 1, y - 1
+
+    def __len__(self) -> int:
+        return len(self.cells) - self._cursor
+
+    def __bool__(self) -> bool:
+        return len(self.cells) > self._cursor
+
+    def __iter__(self):
+        stride = self.stride
+        for cell in self.cells[self._cursor:]:
+            y, x = divmod(cell, stride)
+            yield x - 1, y - 1
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            # Desloca a fatia pelo cursor e corta o array uma vez só: custa o tamanho
+            # da fatia, não o do caminho
+            indices = range(*item.indices(len(self)))
+            if not indices:
+                return Path(stride=self.stride)
+            first = indices[0] + self._cursor
+            last = indices[-1] + self._cursor
+            if indices.step > 0:
+                stop = last + 1
+            else:
+                stop = last - 1 if last else None  # fatia invertida até o índice 0 do array
+            return Path(self.cells[first:stop:indices.step], self.stride)
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("índice fora do caminho")
+        return self._position(self.cells[self._cursor + item])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Path) and other.stride == self.stride:
+            return self.cells[self._cursor:] == other.cells[other._cursor:]
+        try:
+            return len(self) == len(other) and all(a == tuple(b) for a, b in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Path({list(self)!r})"
+
+    def popleft(self) -> Tuple[int, int]:
+        """Remove e devolve a próxima posição em O(1)"""
+        if self._cursor >= len(self.cells):
+            raise IndexError("popleft de caminho vazio")
+        self._cursor += 1
+        return self._position(self.cells[self._cursor - 1])
+
+    def copy(self) -> 'Path':
+        """Cópia independente só com as posições ainda não consumidas"""
+        return Path(self.cells[self._cursor:], self.stride)
+
+    def cost(self, start: int = 0, end: int = None, tem_bola: bool = False, danger_field: 'DangerField' = None,
+             cost_model: 'CostModel' = None) -> float:
+        """
+        Custo dos passos da posição `start` até a `end` (padrão: a última), com os
+        mesmos custos de a_star_search. A direção de chegada em `start` vem da
+        posição anterior no array, mesmo que já consumida.
+        """
+        model = cost_model or DEFAULT_COST_MODEL
+        steps = model.step_costs(tem_bola)
+        stride = self.stride
+        move_of = {dy * stride + dx: move for move, (dx, dy) in enumerate(MOVES)}
+        danger = danger_field.padded() if danger_field is not None else None
+        first = self._cursor + start
+        last = len(self.cells) - 1 if end is None else self._cursor + end
+        heading = HEADING_NONE if first == 0 else move_of[self.cells[first] - self.cells[first - 1]]
+        total = 0.0
+        for i in range(first, last):
+            move = move_of[self.cells[i + 1] - self.cells[i]]
+            total += steps[heading][move] + (danger[self.cells[i + 1]] if danger is not None else 0.0)
+            heading = move
+        return total * model.multiplier(tem_bola)
+
+class DangerField:
+    """
+    Campo de custo de perigo pré-calculado para um conjunto fixo de obstáculos.
+
+    Faz uma transformada de distância truncada sobre a máscara de obstáculos
+    (só importa o raio da última faixa de perigo com custo) e guarda o custo de
+    cada célula numa matriz largura x altura, consultada em O(1) durante o A*.
+    As faixas padrão são as de DEFAULT_DANGER_TIERS; CostModel.danger_field
+    monta o campo com as do modelo.
+    """
+
+    def __init__(self, obstaculos: 'List[Tuple[int, int]] | OccupancyGrid', largura_grid: int, altura_grid: int,
+                 danger_tiers: Tuple[Tuple[float, float], ...] = DEFAULT_DANGER_TIERS):
+        self.largura = largura_grid
+        self.altura = altura_grid
+        self.tiers = tuple(danger_tiers)
+        self.radius = max((distance for distance, cost in self.tiers if cost), default=0.0)
+
+        alcance = int(self.radius)
+        fora_do_alcance = 2 * (alcance + 1) ** 2  # maior que qualquer distância² da janela
+
+        mascara = as_occupancy_grid(obstaculos, largura_grid, altura_grid).mask()
+
+        # Menor distância² até um obstáculo, com borda para os deslocamentos
+        dist2 = np.full((largura_grid + 2 * alcance, altura_grid + 2 * alcance),
+                        fora_do_alcance, dtype=np.int32)
+        for dx in range(-alcance, alcance + 1):
+            for dy in range(-alcance, alcance + 1):
+                d2 = dx * dx + dy * dy
+                if sqrt(d2) > self.radius:
+                    continue
+                janela = dist2[alcance + dx:alcance + dx + largura_grid,
+                               alcance + dy:alcance + dy + altura_grid]
+                np.minimum(janela, np.where(mascara, d2, fora_do_alcance), out=janela)
+        dist2 = dist2[alcance:alcance + largura_grid, alcance:alcance + altura_grid]
+
+        self.values = np.zeros((largura_grid, altura_grid), dtype=np.float64)
+        for d2 in np.unique(dist2):
+            if d2 != fora_do_alcance:
+                self.values[dist2 == d2] = danger_cost_for_distance(sqrt(int(d2)), self.tiers)
+
+        # Listas aninhadas: indexação em Python puro é mais rápida que em np.ndarray
+        self._lookup = self.values.tolist()
+        self._padded = None
+        self._padded_array = None
+        self._fingerprint = None
+
+    def cost(self, position: Tuple[int, int]) -> float:
+        x, y = position
+        return self._lookup[x][y]
+
+    def crop(self, x0: int, y0: int, largura: int, altura: int) -> 'DangerField':
+        """
+        Campo só com a janela [x0, x0+largura) x [y0, y0+altura), em coordenadas locais.
+        Os custos continuam contando os obstáculos de fora da janela.
+        """
+        recorte = DangerField.__new__(DangerField)
+        recorte.largura = largura
+        recorte.altura = altura
+        recorte.tiers = self.tiers
+        recorte.radius = self.radius
+        recorte.values = self.values[x0:x0 + largura, y0:y0 + altura].copy()
+        recorte._lookup = recorte.values.tolist()
+        recorte._padded = None
+        recorte._padded_array = None
+        recorte._fingerprint = None
+        return recorte
+
+    def fingerprint(self) -> bytes:
+        """Hash curto dos custos do campo, calculado uma vez por versão (chave de caches de planos)"""
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.blake2b(self.values.tobytes(), digest_size=16).digest()
+        return self._fingerprint
+
+    def padded(self) -> List[float]:
+        """Custos numa lista plana alinhada com os índices da OccupancyGrid"""
+        if self._padded is None:
+            padded = np.zeros((self.altura + 2, self.largura + 2), dtype=np.float64)
+            padded[1:-1, 1:-1] = self.values.T
+            self._padded = padded.ravel().tolist()
+        return self._padded
+
+    def padded_array(self) -> np.ndarray:
+        """Os custos de padded() num array float64 (para o backend compilado), mantido por update"""
+        if self._padded_array is None:
+            self._padded_array = np.array(self.padded(), dtype=np.float64)
+        return self._padded_array
+
+    def update(self, grid: 'OccupancyGrid', positions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Recalcula o perigo ao redor das células que mudaram na `grid` (obstáculos
+        adicionados ou removidos) e retorna as posições cujo custo mudou.
+        Só a janela de `radius` em volta de cada mudança é revisitada.
+        """
+        alcance = int(self.radius)
+        janela = [(dx, dy) for dx in range(-alcance, alcance + 1) for dy in range(-alcance, alcance + 1)
+                  if sqrt(dx * dx + dy * dy) <= self.radius]
+        revisar = {(x + dx, y + dy) for x, y in positions for dx, dy in janela
+                   if 0 <= x + dx < self.largura and 0 <= y + dy < self.altura}
+
+        blocked = grid.blocked
+        mudaram = []
+        for x, y in revisar:
+            # A borda de grid.blocked conta como obstáculo: só olha índices dentro do campo
+            index = grid.index(x, y)
+            menor = min((sqrt(dx * dx + dy * dy) for dx, dy in janela
+                         if 0 <= x + dx < self.largura and 0 <= y + dy < self.altura
+                         and blocked[index + dy * grid.stride + dx]), default=float('inf'))
+            custo = danger_cost_for_distance(menor, self.tiers)
+            if custo != self._lookup[x][y]:
+                self.values[x, y] = custo
+                self._lookup[x][y] = custo
+                if self._padded is not None:
+                    self._padded[grid.index(x, y)] = custo
+                if self._padded_array is not None:
+                    self._padded_array[grid.index(x, y)] = custo
+                mudaram.append((x, y))
+        if mudaram:
+            self._fingerprint = None
+        return mudaram
+
+class EdgeCostTable:
+    """
+    Custo de toda aresta do A* pré-calculado para um campo fixo (grade, campo de
+    perigo e modelo de custo), para as duas situações de bola.
+
+    O custo de sair do estado (célula, direção de chegada) pelo movimento m,
+    (passo[direção][m] + perigo[célula + m]) * multiplicador, é constante enquanto
+    o campo não muda. `tensor(tem_bola)` guarda esses valores em float32,
+    largura x altura x 9 x 8 (a 9ª direção é HEADING_NONE, inf nas arestas para
+    células bloqueadas). Para o laço do A* (Planner.search com edge_costs) a tabela fica
+    numa forma fatorada sem as arestas bloqueadas: os vizinhos livres de cada
+    célula, (estado seguinte, célula seguinte), uma vez só, e por estado a tupla
+    dos custos alinhada com eles. Cada aresta vira duas consultas de tupla, sem
+    teste da grade, soma de perigo nem multiplicação.
+
+    A busca normal já usa a forma mais compacta (passo[9][8] do CostModel mais
+    perigo por célula, O(células)); a tabela troca memória por tempo, ~30 MB
+    por situação de bola num campo de 100x100. `build_s` é o tempo de montagem,
+    a comparar com o ganho por consulta (veja benchmark.comparar_tabela_arestas).
+    """
+
+    def __init__(self, obstaculos, largura_grid: int, altura_grid: int, danger_field: 'DangerField' = None,
+                 cost_model: 'CostModel' = None):
+        started = time.perf_counter()
+        self.grid = as_occupancy_grid(obstaculos, largura_grid, altura_grid)
+        self.model = cost_model or DEFAULT_COST_MODEL
+        if danger_field is None and self.grid:
+            danger_field = self.model.danger_field(self.grid, largura_grid, altura_grid)
+        self.danger_field = danger_field
+        self.fingerprint = self.grid.fingerprint()
+
+        blocked, offsets = self.grid.blocked, self.grid.offsets
+        cells = len(blocked)
+        fechada = np.frombuffer(bytes(blocked), dtype=np.uint8).astype(bool)
+        danger = np.array(danger_field.padded()) if danger_field is not None else np.zeros(cells)
+        # Célula de destino de cada (célula, movimento); só as células da borda,
+        # que nunca são expandidas, apontariam para fora do array
+        destinos = np.clip(np.arange(cells)[:, None] + np.array(offsets)[None, :], 0, cells - 1)
+        perigo = danger[destinos][:, None, :]
+
+        # Vizinhos livres de cada célula, na ordem de MOVES. Células bloqueadas
+        # também entram: a busca normal deixa o robô sair de uma posição inicial
+        # que virou obstáculo
+        self.neighbors: List[tuple] = [()] * cells
+        abertos = [None] * cells
+        for cell in range(cells):
+            if not all(0 <= cell + offset < cells for offset in offsets):
+                continue  # borda da grade
+            abertos[cell] = [move for move in range(len(MOVES)) if not blocked[cell + offsets[move]]]
+            self.neighbors[cell] = tuple(((cell + offsets[move]) * NUM_HEADINGS + move, cell + offsets[move])
+                                         for move in abertos[cell])
+
+        self._rows = {}
+        self._tensors = {}
+        for tem_bola in (False, True):
+            steps = np.array(self.model.step_costs(tem_bola))[None, :, :]
+            # Mesma ordem de operações do laço de Planner.search: custos idênticos bit a bit
+            custos = (steps + perigo) * self.model.multiplier(tem_bola)
+            rows = [()] * (cells * NUM_HEADINGS)
+            for cell, moves in enumerate(abertos):
+                if moves:
+                    for heading, row in enumerate(custos[cell][:, moves].tolist()):
+                        rows[cell * NUM_HEADINGS + heading] = tuple(row)
+            self._rows[tem_bola] = rows
+            custos = np.where(fechada[destinos][:, None, :], np.inf, custos)
+            self._tensors[tem_bola] = (custos.reshape(altura_grid + 2, largura_grid + 2, NUM_HEADINGS, len(MOVES))
+                                       [1:-1, 1:-1].transpose(1, 0, 2, 3).astype(np.float32))
+        self.build_s = time.perf_counter() - started
+
+    def rows(self, tem_bola: bool = False) -> List[tuple]:
+        """Por estado, os custos das arestas livres, alinhados com neighbors[célula]"""
+        return self._rows[bool(tem_bola)]
+
+    def tensor(self, tem_bola: bool = False) -> np.ndarray:
+        """Custos em float32, [x][y][direção de chegada][movimento] (inf se o destino é bloqueado)"""
+        return self._tensors[bool(tem_bola)]
+
+    def matches(self, grid: 'OccupancyGrid') -> bool:
+        """True se a tabela foi montada para esta grade e ela não mudou desde então"""
+        return (grid.largura, grid.altura) == (self.grid.largura, self.grid.altura) \
+            and grid.fingerprint() == self.fingerprint
+
+    def nbytes(self) -> int:
+        """Memória aproximada da forma fatorada e dos tensores das duas situações de bola"""
+        total = sys.getsizeof(self.neighbors) + sum(
+            sys.getsizeof(vizinhos) + len(vizinhos) * (sys.getsizeof((0, 0)) + 2 * sys.getsizeof(1 << 20))
+            for vizinhos in self.neighbors if vizinhos)
+        for tem_bola in (False, True):
+            rows = self._rows[tem_bola]
+            total += sys.getsizeof(rows) + sum(sys.getsizeof(row) + len(row) * sys.getsizeof(0.0)
+                                               for row in rows if row)
+            total += self._tensors[tem_bola].nbytes
+        return total
 
     # -------------------------------------------------------- #
     # O código abaixo é um EXEMPLO SIMPLES de um robô que apenas anda para frente.
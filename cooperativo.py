@@ -0,0 +1,233 @@
+# PLANEJAMENTO COOPERATIVO - EDROM 2025
+# Com vários robôs no campo, caminhos planejados um a um com
+# candidato.encontrar_caminho se cruzam. Aqui os robôs são planejados em ordem de
+# prioridade num espaço (célula, direção de chegada, tick): cada caminho pronto
+# reserva suas células no tempo e os robôs seguintes desviam delas, esperando
+# ou contornando (A* cooperativo com tabela de reservas).
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+import candidato
+from candidato import HEADING_NONE, NUM_HEADINGS, SearchResult
+
+INF = float('inf')
+
+class ReservationTable:
+    """
+    Reservas (célula, tick) e (aresta, tick) dos robôs já planejados.
+
+    As chaves são inteiros (tick * células + célula, no índice com borda da
+    OccupancyGrid) num dict, então consultar e reservar são O(1) qualquer que
+    seja o tamanho do time ou do horizonte. Só ticks até `horizon` são
+    reservados (no horizonte só valem os estacionados); um robô que termina o
+    caminho fica "estacionado" na célula final do tick de chegada em diante.
+    """
+
+    def __init__(self, grid: candidato.OccupancyGrid, horizon: int = 64):
+        if horizon < 2:
+            raise ValueError("O horizonte precisa de pelo menos 2 ticks")
+        self.grid = grid
+        self.horizon = horizon
+        self._cells = len(grid.blocked)
+        self._vertices: Dict[int, int] = {}  # tick * células + célula -> robô
+        self._edges: Dict[int, int] = {}     # (tick * células + origem) * células + destino -> robô
+        self._parked: Dict[int, Tuple[int, int]] = {}  # célula -> (tick de chegada, robô)
+        self._last_tick: Dict[int, int] = {}  # célula -> último tick reservado nela
+
+    def clear(self):
+        self._vertices.clear()
+        self._edges.clear()
+        self._parked.clear()
+        self._last_tick.clear()
+
+    def reserve_path(self, robot: int, path: List[Tuple[int, int]], pos_inicial: Tuple[int, int],
+                     start_tick: int = 0, park: bool = True):
+        """
+        Reserva o caminho de `robot` saindo de pos_inicial em start_tick, uma
+        posição por tick (posições repetidas são esperas). Com park=True a célula
+        final continua reservada depois da chegada.
+        """
+        index = self.grid.index
+        cell = index(*pos_inicial)
+        tick = start_tick
+        self.reserve(robot, cell, tick)
+        for position in path:
+            next_cell = index(*position)
+            tick += 1
+            if tick < self.horizon:
+                self.reserve(robot, next_cell, tick)
+                if next_cell != cell:
+                    self._edges[(tick * self._cells + cell) * self._cells + next_cell] = robot
+            cell = next_cell
+        if park:
+            self._parked[cell] = (min(tick, self.horizon), robot)
+
+    def reserve(self, robot: int, cell: int, tick: int):
+        """Reserva a célula (índice com borda) para `robot` no tick"""
+        self._vertices[tick * self._cells + cell] = robot
+        if tick > self._last_tick.get(cell, -1):
+            self._last_tick[cell] = tick
+
+    def owner(self, cell: int, tick: int) -> Optional[int]:
+        """Robô que ocupa a célula no tick (reserva ou estacionado), ou None"""
+        robot = self._vertices.get(tick * self._cells + cell)
+        if robot is not None:
+            return robot
+        parked = self._parked.get(cell)
+        if parked is not None and tick >= parked[0]:
+            return parked[1]
+        return None
+
+    def is_free(self, cell: int, tick: int, robot: int = None) -> bool:
+        owner = self.owner(cell, tick)
+        return owner is None or owner == robot
+
+    def is_swap(self, cell: int, next_cell: int, tick: int, robot: int = None) -> bool:
+        """True se outro robô faz next_cell -> cell chegando no mesmo tick (troca de lugar)"""
+        owner = self._edges.get((tick * self._cells + next_cell) * self._cells + cell)
+        return owner is not None and owner != robot
+
+    def can_stay(self, cell: int, tick: int, robot: int = None) -> bool:
+        """True se `robot` pode ficar em `cell` de `tick` em diante"""
+        parked = self._parked.get(cell)
+        if parked is not None and parked[1] != robot:
+            return False
+        if self._last_tick.get(cell, -1) < tick:
+            return True
+        return all(self.is_free(cell, t, robot) for t in range(tick, self._last_tick[cell] + 1))
+
+class CooperativePlanner:
+    """
+    A* cooperativo: planeja os robôs em ordem de prioridade, cada um evitando as
+    reservas dos anteriores.
+
+    O estado é (célula, direção de chegada, tick), com os mesmos custos de
+    movimento de candidato.a_star_search mais a ação de esperar (custo
+    `wait_cost` vezes o multiplicador de bola). Depois de `horizon` ticks não há
+    mais reservas e o tick deixa de contar, então a busca vira o A* comum até o
+    objetivo. Um robô sem caminho fica parado e é reservado onde está.
+    """
+
+    def __init__(self, obstaculos, largura_grid, altura_grid, cost_model=None, danger_field=None,
+                 horizon: int = 64, wait_cost: float = 1.0):
+        self.largura = largura_grid
+        self.altura = altura_grid
+        self.grid = candidato.as_occupancy_grid(obstaculos, largura_grid, altura_grid)
+        self.model = cost_model or candidato.DEFAULT_COST_MODEL
+        if danger_field is None and self.grid:
+            danger_field = self.model.danger_field(self.grid, largura_grid, altura_grid)
+        self.danger_field = danger_field
+        self.horizon = horizon
+        self.wait_cost = wait_cost
+        self.reservations = ReservationTable(self.grid, horizon)
+
+    def plan(self, robots) -> List[candidato.Path]:
+        """
+        Planeja `robots`, uma lista de (pos_inicial, pos_objetivo, tem_bola) ou
+        (pos_inicial, pos_objetivo, tem_bola, fica) em ordem de prioridade, a partir
+        do tick 0. Com fica=False (ex: robô que sai de campo ao marcar) o robô não
+        estaciona no objetivo. Retorna um caminho por robô com uma posição por
+        tick (esperas repetem a posição): caminho[i] é a posição no tick i + 1, então,
+        ao contrário de candidato.encontrar_caminho, a posição inicial não entra.
+        """
+        robots = [tuple(robot) + (True,) * (4 - len(robot)) for robot in robots]
+        self.reservations.clear()
+        index = self.grid.index
+        # Ninguém entra na célula atual de outro robô no primeiro tick
+        for robot, (pos_inicial, _, _, _) in enumerate(robots):
+            self.reservations.reserve(robot, index(*pos_inicial), 0)
+            self.reservations.reserve(robot, index(*pos_inicial), 1)
+
+        paths = []
+        for robot, (pos_inicial, pos_objetivo, tem_bola, fica) in enumerate(robots):
+            result = self.search(robot, pos_inicial, pos_objetivo, tem_bola, stay=fica)
+            paths.append(result.path)
+            self.reservations.reserve_path(robot, result.path, pos_inicial, park=fica or not result.path)
+        return paths
+
+    def search(self, robot: int, pos_inicial: Tuple[int, int], pos_objetivo: Tuple[int, int],
+               tem_bola: bool = False, start_heading: int = None, stay: bool = True) -> SearchResult:
+        """
+        A* no espaço-tempo de `robot`, respeitando as reservas atuais. Com
+        stay=True só aceita chegar ao objetivo quando dá para ficar nele.
+        """
+        grid = self.grid
+        blocked, offsets, stride = grid.blocked, grid.offsets, grid.stride
+        danger = self.danger_field.padded() if self.danger_field is not None else [0.0] * len(blocked)
+        steps = self.model.step_costs(tem_bola)
+        multiplier = self.model.multiplier(tem_bola)
+        wait = self.wait_cost * multiplier
+        straight = self.model.straight_cost * multiplier
+        diagonal = min(self.model.diagonal_cost, 2 * self.model.straight_cost) * multiplier
+        reservations = self.reservations
+        horizon = self.horizon
+        cells = len(blocked)
+
+        start = grid.index(*pos_inicial)
+        goal = grid.index(*pos_objetivo)
+        if blocked[goal]:
+            return SearchResult(candidato.Path(stride=grid.stride), INF, 0, 0)
+        goal_y, goal_x = divmod(goal, stride)
+
+        def heuristic(cell):
+            y, x = divmod(cell, stride)
+            dx, dy = abs(x - goal_x), abs(y - goal_y)
+            return diagonal * min(dx, dy) + straight * abs(dx - dy)
+
+        # Estado: (tick * células + célula) * NUM_HEADINGS + direção
+        start_state = start * NUM_HEADINGS + (HEADING_NONE if start_heading is None else start_heading)
+        g_score = {start_state: 0.0}
+        parent = {start_state: -1}
+        open_list = [(heuristic(start), 0.0, start_state)]
+        expansions = 0
+        pushes = 1
+
+        while open_list:
+            _, g, state = heapq.heappop(open_list)
+            if g > g_score[state]:
+                continue
+            spacetime, heading = divmod(state, NUM_HEADINGS)
+            tick, cell = divmod(spacetime, cells)
+            if cell == goal and (not stay or reservations.can_stay(cell, tick, robot)):
+                return SearchResult(self._reconstruct(parent, state, cells), g, expansions, pushes)
+            expansions += 1
+
+            next_tick = min(tick + 1, horizon)
+            base = next_tick * cells
+            row = steps[heading]
+            for move in range(9):
+                if move == 8:
+                    next_cell, next_heading, cost = cell, heading, wait
+                    if tick == horizon:
+                        continue  # sem reservas, esperar não ajuda
+                else:
+                    next_cell = cell + offsets[move]
+                    if blocked[next_cell]:
+                        continue
+                    next_heading = move
+                    cost = (row[move] + danger[next_cell]) * multiplier
+                if not reservations.is_free(next_cell, next_tick, robot):
+                    continue
+                if move != 8 and reservations.is_swap(cell, next_cell, tick + 1, robot):
+                    continue
+                tentative_g = g + cost
+                next_state = (base + next_cell) * NUM_HEADINGS + next_heading
+                if tentative_g < g_score.get(next_state, INF):
+                    g_score[next_state] = tentative_g
+                    parent[next_state] = state
+                    heapq.heappush(open_list, (tentative_g + heuristic(next_cell), tentative_g, next_state))
+                    pushes += 1
+
+        return SearchResult(candidato.Path(stride=grid.stride), INF, expansions, pushes)
+
+    def _reconstruct(self, parent: Dict[int, int], state: int, cells: int) -> candidato.Path:
+        """
+        Posições por tick até `state`, sem a inicial. Depois do horizonte o tick
+        não avança mais, então cada passo conta como um tick a partir daí.
+        """
+        path = candidato.Path(stride=self.grid.stride)
+        while parent[state] != -1:
+            path.cells.append((state // NUM_HEADINGS) % cells)
+            state = parent[state]
+        path.cells.reverse()
+        return path
@@ -0,0 +1,147 @@
+# CUSTO ATÉ O OBJETIVO - EDROM 2025
+# Depois que o robô pega a bola o objetivo (o gol) não muda mais no episódio.
+# Em vez de rodar um A* novo a cada replanejamento, um Dijkstra reverso a partir
+# do gol calcula de uma vez o custo ótimo de todo estado (célula, direção de
+# chegada) até ele, com o mesmo modelo de custo de candidato.a_star_search.
+import heapq
+from typing import Optional, Tuple
+
+import candidato
+from candidato import HEADING_NONE, NUM_HEADINGS
+
+INF = float('inf')
+SEM_PASSO = 255  # marca em _next_move de estado sem caminho (ou já no objetivo)
+
+class CostToGoMap:
+    """
+    Mapa de custo até pos_objetivo para todos os estados da grade.
+
+    `heuristic` é a lista de custos indexada pelo estado de candidato
+    (índice_da_célula * NUM_HEADINGS + direção) e serve como heurística perfeita
+    para candidato.a_star_search. next_step lê o próximo passo ótimo de qualquer
+    posição em O(1). O mapa vale para a grade do momento em que foi montado:
+    is_valid compara o fingerprint dela e rebuild recalcula depois de mudanças.
+    """
+
+    def __init__(self, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False,
+                 danger_field=None, cost_model=None):
+        self.pos_objetivo = tuple(pos_objetivo)
+        self.largura = largura_grid
+        self.altura = altura_grid
+        self.tem_bola = tem_bola
+        self.model = cost_model or candidato.DEFAULT_COST_MODEL
+        self.heuristic = []
+        self._next_move = bytearray()
+        self._fingerprint = None
+        self.rebuild(obstaculos, danger_field)
+
+    def rebuild(self, obstaculos, danger_field=None):
+        """Recalcula o mapa para a grade atual (ex: depois que obstáculos mudaram)"""
+        grid = candidato.as_occupancy_grid(obstaculos, self.largura, self.altura)
+        if danger_field is None and grid:
+            danger_field = self.model.danger_field(grid, self.largura, self.altura)
+        self.grid = grid
+        self._fingerprint = grid.fingerprint()
+
+        blocked = grid.blocked
+        offsets = grid.offsets
+        danger = danger_field.padded() if danger_field is not None else [0.0] * len(blocked)
+        steps = self.model.step_costs(self.tem_bola)
+        multiplier = self.model.multiplier(self.tem_bola)
+
+        states = len(blocked) * NUM_HEADINGS
+        values = [INF] * states
+        next_move = bytearray([SEM_PASSO]) * states
+        self.heuristic = values
+        self._next_move = next_move
+
+        goal = grid.index(*self.pos_objetivo)
+        if blocked[goal]:
+            return
+
+        open_list = []
+        for heading in range(NUM_HEADINGS):
+            values[goal * NUM_HEADINGS + heading] = 0.0
+            if heading != HEADING_NONE:
+                open_list.append((0.0, goal * NUM_HEADINGS + heading))
+
+        # Dijkstra nas arestas invertidas: o estado (célula, m) é alcançado a partir de
+        # (célula - offsets[m], h) para qualquer direção h, pagando steps[h][m] + perigo.
+        # Estados sem direção só aparecem como origem, então recebem custo mas não abrem.
+        while open_list:
+            cost, state = heapq.heappop(open_list)
+            if cost > values[state]:
+                continue
+            cell, move = divmod(state, NUM_HEADINGS)
+            prev_cell = cell - offsets[move]
+            if blocked[prev_cell]:
+                continue
+            entry = danger[cell]
+            base = prev_cell * NUM_HEADINGS
+            for heading in range(NUM_HEADINGS):
+                pred = base + heading
+                new_cost = cost + (steps[heading][move] + entry) * multiplier
+                if new_cost < values[pred]:
+                    values[pred] = new_cost
+                    next_move[pred] = move
+                    if heading != HEADING_NONE:
+                        heapq.heappush(open_list, (new_cost, pred))
+
+    def is_valid(self, obstaculos) -> bool:
+        """True se `obstaculos` ainda é a grade usada para montar o mapa"""
+        grid = candidato.as_occupancy_grid(obstaculos, self.largura, self.altura)
+        return grid.fingerprint() == self._fingerprint
+
+    def invalidate(self):
+        """Marca o mapa como desatualizado até o próximo rebuild"""
+        self._fingerprint = None
+
+    def _state(self, position, heading) -> int:
+        return self.grid.index(*position) * NUM_HEADINGS + (HEADING_NONE if heading is None else heading)
+
+    def cost(self, position: Tuple[int, int], heading: int = None) -> float:
+        """Custo ótimo de `position` até o objetivo (inf se não houver caminho)"""
+        return self.heuristic[self._state(position, heading)]
+
+    def next_step(self, position: Tuple[int, int], heading: int = None) -> Optional[Tuple[int, int]]:
+        """Próxima posição no caminho ótimo, ou None no objetivo ou sem caminho"""
+        move = self._next_move[self._state(position, heading)]
+        if move == SEM_PASSO:
+            return None
+        dx, dy = candidato.MOVES[move]
+        return (position[0] + dx, position[1] + dy)
+
+    def path_from(self, position: Tuple[int, int], heading: int = None) -> candidato.Path:
+        """
+        Caminho ótimo de `position` até o objetivo, no formato de
+        candidato.encontrar_caminho (vazio se não houver caminho).
+        """
+        path = candidato.Path(stride=self.grid.stride)
+        state = self._state(position, heading)
+        if self.heuristic[state] == INF:
+            return path
+        offsets = self.grid.offsets
+        next_move = self._next_move
+        cells = path.cells
+        cell = state // NUM_HEADINGS
+        cells.append(cell)
+        move = next_move[state]
+        while move != SEM_PASSO:
+            cell += offsets[move]
+            cells.append(cell)
+            move = next_move[cell * NUM_HEADINGS + move]
+        return path
+
+    def final_heading(self, position: Tuple[int, int], heading: int = None) -> int:
+        """Direção em que o caminho ótimo a partir de `position` chega ao objetivo"""
+        state = self._state(position, heading)
+        offsets = self.grid.offsets
+        next_move = self._next_move
+        cell = state // NUM_HEADINGS
+        last = state % NUM_HEADINGS
+        move = next_move[state]
+        while move != SEM_PASSO:
+            cell += offsets[move]
+            last = move
+            move = next_move[cell * NUM_HEADINGS + move]
+        return last
@@ -0,0 +1,226 @@
+# FRENTE DE ONDA VETORIZADA - EDROM 2025
+# Mapas de custo do campo inteiro (custo para chegar a cada célula a partir de
+# uma origem) para análise, calculados com operações de array do NumPy em vez
+# do laço de heap célula a célula de candidato.a_star_search.
+from typing import Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+import candidato
+from candidato import HEADING_NONE, MOVES, NUM_HEADINGS
+
+INF = np.inf
+
+class _Lines:
+    """
+    Reorganiza arrays largura x altura em linhas retas na direção (dx, dy): no
+    resultado, andar um passo na direção é avançar uma posição no eixo 0.
+    Direções negativas são espelhadas e verticais transpostas (só vistas); as
+    diagonais usam uma vista inclinada de um buffer com borda, em que cada
+    coluna é uma diagonal do campo.
+    """
+
+    def __init__(self, largura: int, altura: int, dx: int, dy: int):
+        self.largura = largura
+        self.altura = altura
+        self.dx = dx
+        self.dy = dy
+        self.diagonal = dx != 0 and dy != 0
+        self._buffers = {}
+
+    def _orient(self, array):
+        if self.dx < 0:
+            array = array[::-1]
+        if self.dy < 0:
+            array = array[:, ::-1]
+        if self.dx == 0:
+            array = array.T
+        return array
+
+    def _unorient(self, array):
+        if self.dx == 0:
+            array = array.T
+        if self.dy < 0:
+            array = array[:, ::-1]
+        if self.dx < 0:
+            array = array[::-1]
+        return array
+
+    def _skewed(self, buffer):
+        # buffer[x, largura + y] guarda a célula (x, y); com passo de linha +1 elemento,
+        # a coluna j da vista é a diagonal y - x = j - largura
+        largura, altura = self.largura, self.altura
+        return as_strided(buffer, shape=(largura, largura + altura),
+                          strides=(buffer.strides[0] + buffer.strides[1], buffer.strides[1]))
+
+    def to_lines(self, array, pad, reuse=False):
+        """
+        Vista de `array` em linhas da direção. Nas diagonais a vista é sobre um buffer
+        com borda `pad`; com reuse=True o buffer é mantido entre chamadas (o resultado
+        anterior deixa de valer) para evitar alocar e preencher a borda de novo.
+        """
+        array = self._orient(array)
+        if not self.diagonal:
+            return array
+        largura, altura = self.largura, self.altura
+        buffer = self._buffers.get(pad) if reuse else None
+        if buffer is None:
+            buffer = np.full((largura + 1, largura + altura + 1), pad, dtype=array.dtype)
+            if reuse:
+                self._buffers[pad] = buffer
+        buffer[:largura, largura:largura + altura] = array
+        return self._skewed(buffer)
+
+    def from_lines(self, lines):
+        """Inverso de to_lines; nas diagonais devolve uma vista de um buffer reaproveitado"""
+        if not self.diagonal:
+            return self._unorient(lines)
+        largura, altura = self.largura, self.altura
+        buffer = self._buffers.get(None)
+        if buffer is None:
+            buffer = self._buffers[None] = np.empty((largura + 1, largura + altura + 1), dtype=lines.dtype)
+        self._skewed(buffer)[...] = lines
+        return self._unorient(buffer[:largura, largura:largura + altura])
+
+class WavefrontMap:
+    """
+    Custo mínimo para chegar a cada estado (célula, direção de chegada) a partir
+    de pos_inicial, com o mesmo modelo de custo de candidato.a_star_search.
+
+    `costs` tem forma (NUM_HEADINGS, largura, altura) e é indexado por
+    [direção, x, y]; `cost_map` é o mínimo sobre as direções (inf onde não há
+    caminho). path_to extrai um caminho ótimo até qualquer célula.
+    """
+
+    def __init__(self, pos_inicial, costs: np.ndarray, steps, multiplier: float, danger: np.ndarray,
+                 iterations: int):
+        self.pos_inicial = tuple(pos_inicial)
+        self.costs = costs
+        self.cost_map = costs.min(axis=0)
+        self.iterations = iterations
+        self._steps = steps
+        self._multiplier = multiplier
+        self._danger = danger
+
+    def cost(self, position: Tuple[int, int]) -> float:
+        return float(self.cost_map[position])
+
+    def path_to(self, position: Tuple[int, int]) -> candidato.Path:
+        """
+        Caminho ótimo de pos_inicial até `position`, no formato de
+        candidato.encontrar_caminho (Path vazio se não houver caminho). Volta a partir do
+        destino escolhendo, a cada passo, o estado anterior cujo custo mais o do
+        movimento reproduz o custo atual.
+        """
+        position = tuple(position)
+        largura = self.costs.shape[1]
+        if self.cost_map[position] == INF:
+            return candidato.Path(stride=largura + 2)
+        heading = int(self.costs[(slice(None),) + position].argmin())
+        path = [position]
+        movimentos = np.array(self._steps)
+        while self.costs[(heading,) + position] != 0:  # só o estado inicial tem custo zero
+            dx, dy = MOVES[heading]
+            previous = (position[0] - dx, position[1] - dy)
+            target = self.costs[(heading,) + position]
+            entry = self._danger[position]
+            candidates = self.costs[(slice(None),) + previous] + (movimentos[:, heading] + entry) * self._multiplier
+            heading = int(np.abs(candidates - target).argmin())
+            position = previous
+            path.append(position)
+        return candidato.Path.from_positions(path[::-1], largura)
+
+def compute_cost_map(pos_inicial, obstaculos, largura_grid, altura_grid, tem_bola=False, danger_field=None,
+                     cost_model=None, start_heading=None, max_iterations=None) -> WavefrontMap:
+    """
+    Frente de onda vetorizada sobre o estado (célula, direção de chegada).
+
+    Cada iteração faz duas relaxações sobre arrays (largura x altura):
+      1. virada: para cada movimento m, B[m] = min_h (G[h] + custo de sair em m vindo de h),
+         que inclui a rotação (e o multiplicador de bola);
+      2. reta: B[m] é propagado em linha reta na direção m somando base + perigo de
+         cada célula de chegada. Como andar reto não paga rotação, o mínimo sobre
+         trechos retos de qualquer comprimento é um mínimo acumulado
+         (np.minimum.accumulate) ao longo de cada linha da direção m, com as somas
+         de custo da linha calculadas uma vez antes do laço.
+    Assim cada iteração acrescenta uma curva aos caminhos considerados, e o laço
+    para quando nenhuma célula melhora (tipicamente algumas dezenas de iterações).
+    """
+    grid = candidato.as_occupancy_grid(obstaculos, largura_grid, altura_grid)
+    model = cost_model or candidato.DEFAULT_COST_MODEL
+    if danger_field is None and grid:
+        danger_field = model.danger_field(grid, largura_grid, altura_grid)
+    steps = model.step_costs(tem_bola)
+    multiplier = model.multiplier(tem_bola)
+
+    danger = danger_field.values if danger_field is not None else np.zeros((largura_grid, altura_grid))
+    livre = ~grid.mask()
+    # Custo de entrar em cada célula por perigo, inf nas bloqueadas
+    entrada = np.where(livre, danger * multiplier, INF)
+
+    pos_inicial = tuple(pos_inicial)
+    costs = np.full((NUM_HEADINGS, largura_grid, altura_grid), INF)
+    if not livre[pos_inicial]:
+        return WavefrontMap(pos_inicial, costs, steps, multiplier, danger, 0)
+    start_heading = HEADING_NONE if start_heading is None else start_heading
+    costs[(start_heading,) + pos_inicial] = 0.0
+
+    saida = np.array(steps) * multiplier  # [direção de chegada, movimento]
+    bloqueado = ~livre
+
+    # Por direção, as linhas retas do campo e, ao longo delas, a soma acumulada do
+    # custo de andar reto (base + perigo) reiniciada a cada célula bloqueada
+    # (`acumulado`), e o número de bloqueios já vistos (`trecho`)
+    direcoes = []
+    for move, (dx, dy) in enumerate(MOVES):
+        linhas = _Lines(largura_grid, altura_grid, dx, dy)
+        bloqueado_l = linhas.to_lines(bloqueado, True)
+        entrada_l = linhas.to_lines(entrada, INF)
+        soma = np.cumsum(np.where(bloqueado_l, 0.0, saida[move, move] + entrada_l), axis=0)
+        acumulado = soma - np.maximum.accumulate(np.where(bloqueado_l, soma, 0.0), axis=0)
+        trecho = np.cumsum(bloqueado_l, axis=0, dtype=float)
+        direcoes.append((linhas, entrada_l, acumulado, trecho))
+    maior_reta = max(float(acumulado.max()) for _, _, acumulado, _ in direcoes)
+    maior_passo = float(saida.max()) + float(entrada[livre].max()) + maior_reta
+
+    partida = np.empty((largura_grid, altura_grid))
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        iterations += 1
+        melhorou = False
+        # `separador` afasta os trechos entre bloqueios para que um único mínimo
+        # acumulado por linha não atravesse obstáculos; precisa superar qualquer custo
+        # que apareça nesta iteração (cada movimento acrescenta no máximo maior_passo)
+        teto = float(costs.max(initial=0.0, where=np.isfinite(costs)))
+        separador = 2.0 ** np.ceil(np.log2(4 * (teto + len(MOVES) * maior_passo) + 1))
+        for move, (linhas, entrada_l, acumulado, trecho) in enumerate(direcoes):
+            # 1. virada: melhor custo para sair de cada célula pelo movimento `move`.
+            # Sem direção só existe o estado inicial, tratado à parte.
+            np.add(costs[0], saida[0, move], out=partida)
+            for heading in range(1, len(MOVES)):
+                np.minimum(partida, costs[heading] + saida[heading, move], out=partida)
+            partida[pos_inicial] = min(partida[pos_inicial], costs[(start_heading,) + pos_inicial]
+                                       + saida[start_heading, move])
+
+            # 2. reta: chegar em c depois de sair de s e andar reto custa
+            # partida[s] + entrada[s+1] + acumulado[c] - acumulado[s+1], então o mínimo
+            # sobre todos os s do mesmo trecho é um mínimo acumulado ao longo da linha
+            partida_l = linhas.to_lines(partida, INF, reuse=True)
+            chave = np.empty(partida_l.shape)
+            chave[0] = INF
+            np.add(partida_l[:-1], entrada_l[1:], out=chave[1:])
+            deslocamento = acumulado + trecho * separador
+            chave -= deslocamento
+            np.minimum.accumulate(chave, axis=0, out=chave)
+            chave += deslocamento
+            chave[chave > separador / 2] = INF
+            valor = linhas.from_lines(chave)
+
+            if (valor < costs[move]).any():
+                np.minimum(costs[move], valor, out=costs[move])
+                melhorou = True
+        if not melhorou:
+            break
+
+    return WavefrontMap(pos_inicial, costs, steps, multiplier, danger, iterations)
@@ -0,0 +1,199 @@
+# HEURÍSTICAS - EDROM 2025
+# Heurísticas para candidato.a_star_search derivadas do modelo de custo, e uma
+# verificação que compara qualquer heurística com o custo exato até o objetivo.
+#
+# Todas devolvem listas indexadas pelo estado da busca (índice_da_célula *
+# NUM_HEADINGS + direção), o formato do argumento `heuristic` de Planner.search.
+import heapq
+import random
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+import candidato
+from candidato import NUM_HEADINGS
+from custo_ate_objetivo import CostToGoMap
+
+INF = float('inf')
+
+def _coordinates(grid: candidato.OccupancyGrid):
+    """x e y de cada índice da grade com borda (a borda fica com -1 e largura/altura)"""
+    y, x = np.divmod(np.arange(len(grid.blocked)), grid.stride)
+    return x - 1, y - 1
+
+def _per_state(cell_values: np.ndarray) -> List[float]:
+    return np.repeat(cell_values, NUM_HEADINGS).tolist()
+
+def euclidean_heuristic(grid: candidato.OccupancyGrid, pos_objetivo: Tuple[int, int]) -> List[float]:
+    """
+    Distância euclidiana até o objetivo, a heurística original de
+    encontrar_caminho. Ignora o multiplicador de bola e, como a diagonal custa
+    1.414 < sqrt(2), superestima um pouco passos diagonais (não é consistente,
+    então o A* pode reabrir estados). Fica aqui só para comparação.
+    """
+    x, y = _coordinates(grid)
+    return _per_state(np.hypot(x - pos_objetivo[0], y - pos_objetivo[1]))
+
+def octile_heuristic(grid: candidato.OccupancyGrid, pos_objetivo: Tuple[int, int], tem_bola: bool = False,
+                     cost_model: candidato.CostModel = None) -> List[float]:
+    """
+    Octile até o objetivo vezes o multiplicador de bola: o custo base mínimo de
+    qualquer caminho (rotação e perigo só somam), então é admissível e
+    consistente. É a heurística padrão de Planner.search.
+    """
+    model = cost_model or candidato.DEFAULT_COST_MODEL
+    multiplier = model.multiplier(tem_bola)
+    x, y = _coordinates(grid)
+    dx = np.abs(x - pos_objetivo[0])
+    dy = np.abs(y - pos_objetivo[1])
+    diagonal = min(model.diagonal_cost, 2 * model.straight_cost)
+    values = (diagonal * np.minimum(dx, dy) + model.straight_cost * np.abs(dx - dy)) * multiplier
+    return _per_state(values)
+
+class LandmarkHeuristic:
+    """
+    Heurística ALT (A*, landmarks e desigualdade triangular) para um campo fixo.
+
+    Para cada landmark L guarda o custo de L até toda célula e de toda célula até
+    L num grafo de células relaxado: cada passo custa base + perigo da célula de
+    chegada, sem rotação, que nunca é mais caro que o passo real. Pela desigualdade
+    triangular, max(d(L, objetivo) - d(L, v), d(v, L) - d(objetivo, L)) é uma cota
+    inferior de d(v, objetivo); vezes o multiplicador de bola, é uma cota inferior do
+    custo real. O resultado é o máximo entre ela e a octile.
+
+    A montagem roda 2 Dijkstras por landmark (segundos em campos de 200x200) e só
+    compensa quando o campo não muda e há muitas consultas; cada consulta depois
+    custa operações de array sobre as células.
+    """
+
+    def __init__(self, obstaculos, largura_grid, altura_grid, n_landmarks: int = 8, danger_field=None,
+                 cost_model=None, seed: int = 0):
+        self.grid = candidato.as_occupancy_grid(obstaculos, largura_grid, altura_grid)
+        self.model = cost_model or candidato.DEFAULT_COST_MODEL
+        if danger_field is None and self.grid:
+            danger_field = self.model.danger_field(self.grid, largura_grid, altura_grid)
+        self._danger = danger_field.padded() if danger_field is not None else [0.0] * len(self.grid.blocked)
+        self.landmarks: List[Tuple[int, int]] = []
+        self._from = []  # custo landmark -> célula, por landmark
+        self._to = []    # custo célula -> landmark, por landmark
+
+        livres = [index for index, blocked in enumerate(self.grid.blocked) if not blocked]
+        if not livres:
+            return
+        # Seleção pelo mais distante: o primeiro é a célula livre mais longe de uma
+        # célula sorteada; cada próximo maximiza a distância ao landmark mais próximo
+        rng = random.Random(seed)
+        nearest = self._dijkstra(rng.choice(livres), reverse=False)
+        for _ in range(min(n_landmarks, len(livres))):
+            finite = np.where(np.isfinite(nearest), nearest, -1.0)
+            landmark = int(finite.argmax())
+            if finite[landmark] < 0:
+                break
+            self.landmarks.append(self.grid.position(landmark))
+            self._from.append(self._dijkstra(landmark, reverse=False))
+            self._to.append(self._dijkstra(landmark, reverse=True))
+            # Distância ao landmark mais próximo (zero nos já escolhidos)
+            nearest = self._from[0].copy() if len(self._from) == 1 else np.minimum(nearest, self._from[-1])
+
+    def _dijkstra(self, source: int, reverse: bool) -> np.ndarray:
+        """Custos (sem multiplicador) de source até cada célula, ou de cada célula até source"""
+        blocked, offsets, danger = self.grid.blocked, self.grid.offsets, self._danger
+        base = self.model.base
+        values = [INF] * len(blocked)
+        values[source] = 0.0
+        open_list = [(0.0, source)]
+        while open_list:
+            cost, cell = heapq.heappop(open_list)
+            if cost > values[cell]:
+                continue
+            for move in range(8):
+                if reverse:
+                    # Aresta prev -> cell paga a entrada em cell
+                    other = cell - offsets[move]
+                    step = base[move] + danger[cell]
+                else:
+                    other = cell + offsets[move]
+                    step = base[move] + danger[other]
+                if blocked[other]:
+                    continue
+                new_cost = cost + step
+                if new_cost < values[other]:
+                    values[other] = new_cost
+                    heapq.heappush(open_list, (new_cost, other))
+        return np.array(values)
+
+    def cell_bounds(self, pos_objetivo: Tuple[int, int], tem_bola: bool = False) -> np.ndarray:
+        """Cota inferior do custo de cada célula (índice com borda) até o objetivo"""
+        goal = self.grid.index(*pos_objetivo)
+        bound = np.zeros(len(self.grid.blocked))
+        for custo_de, custo_ate in zip(self._from, self._to):
+            # Termos com custo infinito não limitam nada
+            with np.errstate(invalid='ignore'):
+                frente = custo_de[goal] - custo_de
+                tras = custo_ate - custo_ate[goal]
+            np.maximum(bound, np.where(np.isfinite(frente), frente, 0.0), out=bound)
+            np.maximum(bound, np.where(np.isfinite(tras), tras, 0.0), out=bound)
+        return bound * self.model.multiplier(tem_bola)
+
+    def heuristic(self, pos_objetivo: Tuple[int, int], tem_bola: bool = False) -> List[float]:
+        """Lista por estado para Planner.search: max(ALT, octile)"""
+        octile = np.array(octile_heuristic(self.grid, pos_objetivo, tem_bola, self.model)[::NUM_HEADINGS])
+        return _per_state(np.maximum(self.cell_bounds(pos_objetivo, tem_bola), octile))
+
+class HeuristicCheck(NamedTuple):
+    states: int              # estados com caminho até o objetivo conferidos
+    overestimates: int       # estados com h > custo exato (não admissível)
+    max_overestimate: float
+    inconsistencies: int     # arestas com h(s) > custo(s, s') + h(s')
+    max_inconsistency: float
+
+    @property
+    def admissible(self) -> bool:
+        return self.overestimates == 0
+
+    @property
+    def consistent(self) -> bool:
+        return self.inconsistencies == 0
+
+def check_heuristic(heuristic: List[float], grid: candidato.OccupancyGrid, pos_objetivo: Tuple[int, int],
+                    tem_bola: bool = False, danger_field=None, cost_model=None,
+                    tolerance: float = 1e-9) -> HeuristicCheck:
+    """
+    Confere uma heurística por estado contra o modelo de custo, para o objetivo
+    dado: o custo exato de todo estado até o objetivo vem de CostToGoMap
+    (Dijkstra reverso), e cada aresta do grafo (célula, direção) é testada quanto
+    à consistência. Prova admissibilidade e consistência neste campo.
+    """
+    model = cost_model or candidato.DEFAULT_COST_MODEL
+    if danger_field is None and grid:
+        danger_field = model.danger_field(grid, grid.largura, grid.altura)
+    exact = CostToGoMap(pos_objetivo, grid, grid.largura, grid.altura, tem_bola, danger_field, model).heuristic
+    blocked, offsets = grid.blocked, grid.offsets
+    danger = danger_field.padded() if danger_field is not None else [0.0] * len(blocked)
+    steps = model.step_costs(tem_bola)
+    multiplier = model.multiplier(tem_bola)
+
+    states = overestimates = inconsistencies = 0
+    max_overestimate = max_inconsistency = 0.0
+    for cell, cell_blocked in enumerate(blocked):
+        if cell_blocked:
+            continue
+        for heading in range(NUM_HEADINGS):
+            state = cell * NUM_HEADINGS + heading
+            if exact[state] == INF:
+                continue
+            states += 1
+            h = heuristic[state]
+            if h > exact[state] + tolerance:
+                overestimates += 1
+                max_overestimate = max(max_overestimate, h - exact[state])
+            row = steps[heading]
+            for move in range(8):
+                next_cell = cell + offsets[move]
+                if blocked[next_cell]:
+                    continue
+                gap = h - (row[move] + danger[next_cell]) * multiplier - heuristic[next_cell * NUM_HEADINGS + move]
+                if gap > tolerance:
+                    inconsistencies += 1
+                    max_inconsistency = max(max_inconsistency, gap)
+    return HeuristicCheck(states, overestimates, max_overestimate, inconsistencies, max_inconsistency)
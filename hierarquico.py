@@ -0,0 +1,298 @@
+# PLANEJAMENTO HIERÁRQUICO (HPA*) - EDROM 2025
+# Para campos em resolução fina (milhões de células) um A* plano por tick é lento
+# demais. O campo é dividido em clusters; a busca roda primeiro num grafo pequeno
+# de entradas entre clusters e só depois o caminho é detalhado célula a célula,
+# apenas nos clusters por onde ele passa.
+import heapq
+from typing import Dict, List, Tuple
+
+import candidato
+from candidato import HEADING_NONE
+from custo_ate_objetivo import CostToGoMap
+
+INF = float('inf')
+
+class HierarchicalPlanner:
+    """
+    HPA* sobre o mesmo modelo de custo de candidato.a_star_search.
+
+    Cada fronteira entre dois clusters vizinhos tem entradas (pares de células
+    livres, uma de cada lado). Dentro de um cluster, o custo de qualquer estado
+    (célula, direção de chegada) até cada entrada vem de um CostToGoMap montado no
+    recorte do cluster, com base, rotação e perigo iguais aos de
+    calculate_movement_cost. Como a direção faz parte do estado, a rotação na
+    junção entre dois trechos é cobrada exatamente. As tabelas de um cluster são
+    montadas quando a busca abstrata passa por ele pela primeira vez, ou todas de
+    uma vez com precompute().
+
+    Em cada trecho livre de fronteira fica uma entrada a cada `entrance_spacing`
+    células (e uma nas pontas). O caminho pode sair um pouco mais caro que o do
+    A* plano, porque só essas entradas atravessam fronteiras e sempre em linha
+    reta; se a abstração não achar caminho, a busca plana é usada. update_obstacles refaz só as fronteiras e tabelas dos
+    clusters afetados.
+    """
+
+    def __init__(self, obstaculos, largura_grid, altura_grid, cluster_size=16, entrance_spacing=3,
+                 cost_model=None):
+        # Cópia própria da grade: ela é alterada a cada update_obstacles
+        self.grid = candidato.OccupancyGrid(largura_grid, altura_grid, list(obstaculos))
+        self.model = cost_model or candidato.DEFAULT_COST_MODEL
+        # Campo próprio (não o do cache do modelo): é alterado com a grade
+        self.danger_field = candidato.DangerField(self.grid, largura_grid, altura_grid, self.model.danger_tiers)
+        self.largura = largura_grid
+        self.altura = altura_grid
+        self.cluster_size = cluster_size
+        self.entrance_spacing = entrance_spacing
+        self.clusters_x = -(-largura_grid // cluster_size)
+        self.clusters_y = -(-altura_grid // cluster_size)
+
+        self._borders = {}     # ('x' | 'y', cx, cy) -> [(célula deste lado, célula do vizinho), ...]
+        self._crossings = {}   # entrada -> [(entrada do outro lado, movimento), ...]
+        self._entrances = {}   # cluster -> entradas dele (cache)
+        self._local = {}       # cluster -> (x0, y0, largura, altura, grade recortada, perigo recortado)
+        self._tables = {}      # (cluster, tem_bola) -> {entrada: CostToGoMap}
+
+        self.expansions = 0
+        self.tables_built = 0
+
+        for cx in range(self.clusters_x):
+            for cy in range(self.clusters_y):
+                if cx + 1 < self.clusters_x:
+                    self._build_border(('x', cx, cy))
+                if cy + 1 < self.clusters_y:
+                    self._build_border(('y', cx, cy))
+
+    # ------------------------------------------------------------------ #
+    # Clusters e entradas
+    def _cluster_of(self, position) -> Tuple[int, int]:
+        return position[0] // self.cluster_size, position[1] // self.cluster_size
+
+    def _border_keys(self, cluster):
+        cx, cy = cluster
+        for key in (('x', cx - 1, cy), ('x', cx, cy), ('y', cx, cy - 1), ('y', cx, cy)):
+            if key in self._borders:
+                yield key
+
+    def _build_border(self, key) -> bool:
+        """(Re)calcula as entradas de uma fronteira; retorna True se elas mudaram"""
+        kind, cx, cy = key
+        size = self.cluster_size
+        if kind == 'x':
+            xa = (cx + 1) * size - 1
+            pares = [((xa, y), (xa + 1, y)) for y in range(cy * size, min((cy + 1) * size, self.altura))]
+            move = candidato.HEADING_INDEX[(1, 0)]
+            back = candidato.HEADING_INDEX[(-1, 0)]
+        else:
+            ya = (cy + 1) * size - 1
+            pares = [((x, ya), (x, ya + 1)) for x in range(cx * size, min((cx + 1) * size, self.largura))]
+            move = candidato.HEADING_INDEX[(0, 1)]
+            back = candidato.HEADING_INDEX[(0, -1)]
+
+        # Trechos contínuos de pares livres dos dois lados
+        entradas = []
+        trecho = []
+        for a, b in pares + [(None, None)]:
+            if a is not None and a not in self.grid and b not in self.grid:
+                trecho.append((a, b))
+                continue
+            if len(trecho) > self.entrance_spacing:
+                entradas += trecho[:-1:self.entrance_spacing] + [trecho[-1]]
+            elif trecho:
+                entradas.append(trecho[len(trecho) // 2])
+            trecho = []
+
+        antigas = self._borders.get(key)
+        if antigas == entradas:
+            return False
+        for a, b in antigas or ():
+            self._crossings[a].remove((b, move))
+            self._crossings[b].remove((a, back))
+        for a, b in entradas:
+            self._crossings.setdefault(a, []).append((b, move))
+            self._crossings.setdefault(b, []).append((a, back))
+        self._borders[key] = entradas
+
+        vizinho = (cx + 1, cy) if kind == 'x' else (cx, cy + 1)
+        for cluster in ((cx, cy), vizinho):
+            self._invalidate(cluster, entrances=True)
+        return True
+
+    def _cluster_entrances(self, cluster) -> List[Tuple[int, int]]:
+        if cluster not in self._entrances:
+            entradas = set()
+            for key in self._border_keys(cluster):
+                for a, b in self._borders[key]:
+                    entradas.add(a if self._cluster_of(a) == cluster else b)
+            self._entrances[cluster] = sorted(entradas)
+        return self._entrances[cluster]
+
+    def _local_view(self, cluster):
+        """Recorte da grade e do campo de perigo de um cluster, com a origem dele"""
+        if cluster not in self._local:
+            x0, y0 = cluster[0] * self.cluster_size, cluster[1] * self.cluster_size
+            largura = min(self.cluster_size, self.largura - x0)
+            altura = min(self.cluster_size, self.altura - y0)
+            self._local[cluster] = (x0, y0, largura, altura, self.grid.crop(x0, y0, largura, altura),
+                                    self.danger_field.crop(x0, y0, largura, altura))
+        return self._local[cluster]
+
+    def _local_map(self, cluster, position, tem_bola) -> CostToGoMap:
+        """Custo até `position` de todo estado dentro do cluster"""
+        x0, y0, largura, altura, grid, perigo = self._local_view(cluster)
+        return CostToGoMap((position[0] - x0, position[1] - y0), grid, largura, altura, tem_bola,
+                           perigo, self.model)
+
+    def _cluster_maps(self, cluster, tem_bola) -> Dict[Tuple[int, int], CostToGoMap]:
+        """Tabelas de custo até cada entrada do cluster, montadas na primeira consulta"""
+        key = (cluster, bool(tem_bola))
+        if key not in self._tables:
+            self._tables[key] = {entrada: self._local_map(cluster, entrada, tem_bola)
+                                 for entrada in self._cluster_entrances(cluster)}
+            self.tables_built += 1
+        return self._tables[key]
+
+    def precompute(self, tem_bola_values=(False, True)) -> int:
+        """Monta de uma vez as tabelas de todos os clusters; retorna quantas foram montadas"""
+        antes = self.tables_built
+        for cx in range(self.clusters_x):
+            for cy in range(self.clusters_y):
+                for tem_bola in tem_bola_values:
+                    self._cluster_maps((cx, cy), tem_bola)
+        return self.tables_built - antes
+
+    def _invalidate(self, cluster, entrances=False):
+        self._tables.pop((cluster, False), None)
+        self._tables.pop((cluster, True), None)
+        if entrances:
+            self._entrances.pop(cluster, None)
+        else:
+            self._local.pop(cluster, None)
+
+    # ------------------------------------------------------------------ #
+    # API pública
+    def plan(self, pos_inicial, pos_objetivo, tem_bola=False, start_heading=None) -> candidato.SearchResult:
+        """
+        Busca no grafo de entradas e detalha o resultado em células. `expansions`
+        conta os estados abstratos expandidos.
+        """
+        pos_inicial, pos_objetivo = tuple(pos_inicial), tuple(pos_objetivo)
+        if pos_objetivo in self.grid:
+            return candidato.SearchResult(candidato.Path(stride=self.grid.stride), INF, 0, 0)
+        if pos_inicial == pos_objetivo:
+            return candidato.SearchResult(candidato.Path.from_positions([pos_inicial], self.largura), 0.0, 0, 0)
+
+        steps = self.model.step_costs(tem_bola)
+        multiplier = self.model.multiplier(tem_bola)
+        straight = self.model.straight_cost * multiplier
+        diagonal = min(self.model.diagonal_cost, 2 * self.model.straight_cost) * multiplier
+        danger = self.danger_field.cost
+        goal_x, goal_y = pos_objetivo
+
+        def heuristic(position):
+            dx, dy = abs(position[0] - goal_x), abs(position[1] - goal_y)
+            return diagonal * min(dx, dy) + straight * abs(dx - dy)
+
+        goal_cluster = self._cluster_of(pos_objetivo)
+        goal_map = self._local_map(goal_cluster, pos_objetivo, tem_bola)
+        goal_state = (pos_objetivo, HEADING_NONE, True)
+
+        # Estado abstrato: (célula, direção de chegada, chegou por dentro do cluster).
+        # Quem acabou de entrar num cluster (ou o início) segue até as entradas dele;
+        # quem chegou a uma entrada por dentro só pode atravessar a fronteira.
+        start_state = (pos_inicial, HEADING_NONE if start_heading is None else start_heading, False)
+        g_score = {start_state: 0.0}
+        parent = {start_state: None}
+        open_list = [(heuristic(pos_inicial), 0.0, start_state)]
+        expansions = 0
+        pushes = 1
+
+        def relax(state, g, origem):
+            nonlocal pushes
+            if g < g_score.get(state, INF):
+                g_score[state] = g
+                parent[state] = origem
+                heapq.heappush(open_list, (g + heuristic(state[0]), g, state))
+                pushes += 1
+
+        while open_list:
+            _, g, state = heapq.heappop(open_list)
+            if g > g_score[state]:
+                continue
+            if state == goal_state:
+                break
+            expansions += 1
+            position, heading, interno = state
+            cluster = self._cluster_of(position)
+            x0, y0 = self._local_view(cluster)[:2]
+            local = (position[0] - x0, position[1] - y0)
+
+            if cluster == goal_cluster:
+                relax(goal_state, g + goal_map.cost(local, heading), (state, goal_map, x0, y0))
+            if not interno:
+                for entrada, mapa in self._cluster_maps(cluster, tem_bola).items():
+                    custo = mapa.cost(local, heading)
+                    if entrada != position and custo != INF:
+                        relax((entrada, mapa.final_heading(local, heading), True), g + custo,
+                              (state, mapa, x0, y0))
+            for vizinho, move in self._crossings.get(position, ()):
+                relax((vizinho, move, False), g + (steps[heading][move] + danger(vizinho)) * multiplier,
+                      (state, None, 0, 0))
+
+        self.expansions = expansions
+        if goal_state not in parent:
+            # A abstração perdeu a passagem (ex: entrada isolada dentro do cluster)
+            return candidato.a_star_search(self.grid, pos_inicial, pos_objetivo, tem_bola, self.danger_field,
+                                           self.model, start_heading)
+        return candidato.SearchResult(self._refine(parent, goal_state), g_score[goal_state], expansions, pushes)
+
+    def _refine(self, parent, goal_state) -> candidato.Path:
+        """Detalha a sequência de estados abstratos em células, trecho a trecho"""
+        trechos = []
+        state = goal_state
+        while parent[state] is not None:
+            anterior, mapa, x0, y0 = parent[state]
+            trechos.append((anterior, state, mapa, x0, y0))
+            state = anterior
+
+        path = [state[0]]
+        for anterior, state, mapa, x0, y0 in reversed(trechos):
+            if mapa is None:
+                path.append(state[0])  # travessia de fronteira: um passo
+                continue
+            position, heading, _ = anterior
+            local = mapa.path_from((position[0] - x0, position[1] - y0), heading)
+            path.extend((x + x0, y + y0) for x, y in local[1:])
+        return candidato.Path.from_positions(path, self.largura)
+
+    def encontrar_caminho(self, pos_inicial, pos_objetivo, tem_bola=False) -> List[Tuple[int, int]]:
+        """Mesmo formato de retorno de candidato.encontrar_caminho"""
+        return self.plan(pos_inicial, pos_objetivo, tem_bola).path
+
+    def update_obstacles(self, added=(), removed=()) -> List[Tuple[int, int]]:
+        """
+        Aplica adversários que entraram (`added`) ou saíram (`removed`) de células.
+        Refaz as fronteiras dos clusters onde a ocupação mudou e descarta as tabelas
+        dos clusters cuja ocupação, perigo ou entradas mudaram. Retorna esses clusters.
+        """
+        grid = self.grid
+        added = [pos for pos in added if pos not in grid]
+        removed = [pos for pos in removed if pos in grid]
+        if not added and not removed:
+            return []
+
+        for pos in removed:
+            grid.remove_obstacle(pos)
+        for pos in added:
+            grid.add_obstacle(pos)
+        mudaram = self.danger_field.update(grid, added + removed)
+
+        ocupacao = {self._cluster_of(pos) for pos in added + removed}
+        sujos = ocupacao | {self._cluster_of(pos) for pos in mudaram}
+        for cluster in sujos:
+            self._invalidate(cluster)
+        for cluster in ocupacao:
+            for key in list(self._border_keys(cluster)):
+                if self._build_border(key):
+                    kind, cx, cy = key
+                    sujos |= {(cx, cy), (cx + 1, cy) if kind == 'x' else (cx, cy + 1)}
+        return sorted(sujos)
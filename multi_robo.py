@@ -0,0 +1,93 @@
+# PLANEJAMENTO DO TIME - EDROM 2025
+# Vários robôs do mesmo time planejam no mesmo campo. Em vez de cada um chamar
+# candidato.encontrar_caminho com a lista de obstáculos (que refaz a grade de
+# ocupação e o campo de perigo a cada chamada), o campo é montado uma vez e
+# todas as consultas do tick são planejadas sobre ele.
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Tuple
+
+import candidato
+from planejamento_lote import PlanResult, plan_many
+
+EXECUTORES = ("serial", "thread", "process")
+
+class TeamPlan(NamedTuple):
+    results: List[PlanResult]  # na ordem das consultas
+    setup_s: float   # montagem da grade e do campo de perigo (uma vez para o time)
+    search_s: float  # tempo de parede de todas as buscas
+
+    @property
+    def paths(self) -> List[List[Tuple[int, int]]]:
+        return [resultado.path for resultado in self.results]
+
+class TeamPlanner:
+    """
+    Planejador do time para um campo: OccupancyGrid e DangerField são montados
+    no construtor e compartilhados por todas as consultas de plan().
+
+    Cada consulta é (pos_inicial, pos_objetivo) ou (pos_inicial, pos_objetivo,
+    tem_bola). Os robôs são planejados independentemente; conflitos entre os
+    caminhos não são tratados aqui.
+    """
+
+    def __init__(self, obstaculos, largura_grid, altura_grid, cost_model=None, danger_field=None):
+        t0 = time.perf_counter()
+        self.largura = largura_grid
+        self.altura = altura_grid
+        self.cost_model = cost_model
+        self.grid = candidato.as_occupancy_grid(obstaculos, largura_grid, altura_grid)
+        if danger_field is None and self.grid:
+            danger_field = (cost_model or candidato.DEFAULT_COST_MODEL).danger_field(self.grid, largura_grid,
+                                                                                     altura_grid)
+        self.danger_field = danger_field
+        self.setup_s = time.perf_counter() - t0
+
+    def _planejar(self, consulta) -> PlanResult:
+        pos_inicial, pos_objetivo, tem_bola = _normalizar(consulta)
+        t0 = time.perf_counter()
+        resultado = candidato.a_star_search(self.grid, pos_inicial, pos_objetivo, tem_bola,
+                                            self.danger_field, self.cost_model)
+        return PlanResult(resultado.path, resultado.cost, resultado.expansions, resultado.pushes,
+                          time.perf_counter() - t0)
+
+    def plan(self, queries, executor="serial", workers=None) -> TeamPlan:
+        """
+        Planeja todas as consultas sobre o campo compartilhado.
+
+        executor="serial" roda tudo nesta thread; "thread" usa um ThreadPoolExecutor
+        (cada thread tem seu próprio candidato.Planner); "process" usa
+        planejamento_lote.plan_many, que envia a grade uma vez a cada processo
+        (lá o campo de perigo é refeito uma vez por processo).
+        """
+        if executor not in EXECUTORES:
+            raise ValueError(f"executor desconhecido: {executor!r} (use um de {EXECUTORES})")
+        queries = [_normalizar(consulta) for consulta in queries]
+
+        t0 = time.perf_counter()
+        if executor == "serial" or len(queries) <= 1:
+            results = [self._planejar(consulta) for consulta in queries]
+        elif executor == "thread":
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._planejar, queries))
+        else:
+            dims = (self.largura, self.altura)
+            tarefas = [(inicio, objetivo, self.grid, dims, tem_bola) for inicio, objetivo, tem_bola in queries]
+            results = plan_many(tarefas, workers=workers, cost_model=self.cost_model)
+        return TeamPlan(results, self.setup_s, time.perf_counter() - t0)
+
+    def encontrar_caminhos(self, queries, executor="serial", workers=None) -> List[List[Tuple[int, int]]]:
+        """Caminhos de cada consulta, no formato de candidato.encontrar_caminho"""
+        return self.plan(queries, executor, workers).paths
+
+def _normalizar(consulta):
+    if len(consulta) == 2:
+        pos_inicial, pos_objetivo = consulta
+        return tuple(pos_inicial), tuple(pos_objetivo), False
+    pos_inicial, pos_objetivo, tem_bola = consulta
+    return tuple(pos_inicial), tuple(pos_objetivo), bool(tem_bola)
+
+def plan_team(queries, obstaculos, largura_grid, altura_grid, cost_model=None, executor="serial",
+              workers=None) -> TeamPlan:
+    """Atalho: monta o TeamPlanner do campo e planeja as consultas de uma vez"""
+    return TeamPlanner(obstaculos, largura_grid, altura_grid, cost_model).plan(queries, executor, workers)
@@ -0,0 +1,94 @@
+# PERFIS DE CUSTO - EDROM 2025
+# Perfis declarativos (JSON ou TOML, na pasta perfis/) com os pesos do modelo
+# de custo: custos base, penalidades de rotação, multiplicadores de bola e
+# faixas de perigo. Cada perfil é compilado uma vez num candidato.CostModel
+# (tabelas de custo e cache de campos de perigo próprios) e guardado por nome,
+# então trocar de perfil entre consultas é só passar outro cost_model.
+import json
+import os
+from typing import Dict, List
+
+import candidato
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: só perfis em JSON
+    tomllib = None
+
+PASTA_PERFIS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perfis")
+EXTENSOES = (".json", ".toml")
+
+# Ordem das penalidades em CostModel.rotation_penalties
+ROTACOES = ("straight", "gentle", "medium", "sharp", "reverse")
+CAMPOS = {"name", "description", "straight_cost", "diagonal_cost", "rotation_penalties",
+          "ball_multiplier", "ball_rotation_multiplier", "danger_tiers"}
+
+_compilados: Dict[str, candidato.CostModel] = {}
+
+def read_profile(caminho: str) -> dict:
+    """Lê o arquivo do perfil (JSON ou TOML, pela extensão) sem validar"""
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == ".json":
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    if extensao == ".toml":
+        if tomllib is None:
+            raise ValueError(f"Perfis TOML precisam de Python 3.11+ (tomllib): {caminho}")
+        with open(caminho, "rb") as arquivo:
+            return tomllib.load(arquivo)
+    raise ValueError(f"Extensão de perfil desconhecida: {caminho!r} (use uma de {EXTENSOES})")
+
+def compile_profile(perfil: dict) -> candidato.CostModel:
+    """
+    Valida o dicionário do perfil e monta o CostModel. Campos ausentes ficam
+    com os valores padrão do CostModel; campos desconhecidos são erro. Os valores
+    são conferidos pelo próprio CostModel (ex: diagonal_cost >= straight_cost).
+    """
+    desconhecidos = set(perfil) - CAMPOS
+    if desconhecidos:
+        raise ValueError(f"Campos desconhecidos no perfil: {sorted(desconhecidos)}")
+    parametros = {chave: valor for chave, valor in perfil.items() if chave not in ("name", "description")}
+
+    rotacoes = parametros.get("rotation_penalties")
+    if isinstance(rotacoes, dict):
+        faltando = [nome for nome in ROTACOES if nome not in rotacoes]
+        if faltando or len(rotacoes) != len(ROTACOES):
+            raise ValueError(f"rotation_penalties precisa exatamente de {ROTACOES}")
+        parametros["rotation_penalties"] = tuple(float(rotacoes[nome]) for nome in ROTACOES)
+    elif rotacoes is not None and len(rotacoes) != len(ROTACOES):
+        raise ValueError(f"rotation_penalties precisa de {len(ROTACOES)} valores {ROTACOES}")
+
+    if "danger_tiers" in parametros:
+        faixas = parametros["danger_tiers"]
+        if any(len(faixa) != 2 or faixa[0] < 0 or faixa[1] < 0 for faixa in faixas):
+            raise ValueError("danger_tiers é uma lista de [distância máxima, custo] não negativos")
+        parametros["danger_tiers"] = tuple((float(distancia), float(custo)) for distancia, custo in faixas)
+    return candidato.CostModel(**parametros)
+
+def load_profile(caminho: str) -> candidato.CostModel:
+    """Lê e compila um perfil de um arquivo"""
+    return compile_profile(read_profile(caminho))
+
+def _arquivo(nome: str) -> str:
+    for extensao in EXTENSOES:
+        caminho = os.path.join(PASTA_PERFIS, nome + extensao)
+        if os.path.exists(caminho):
+            return caminho
+    raise ValueError(f"Perfil desconhecido: {nome!r} (disponíveis: {list_profiles()})")
+
+def get_profile(nome: str) -> candidato.CostModel:
+    """
+    CostModel do perfil `nome` da pasta perfis/, compilado na primeira vez e
+    reaproveitado depois (o mesmo objeto, com o mesmo cache de campos de perigo)
+    """
+    modelo = _compilados.get(nome)
+    if modelo is None:
+        modelo = _compilados[nome] = load_profile(_arquivo(nome))
+    return modelo
+
+def list_profiles() -> List[str]:
+    """Nomes dos perfis disponíveis na pasta perfis/"""
+    if not os.path.isdir(PASTA_PERFIS):
+        return []
+    return sorted(os.path.splitext(arquivo)[0] for arquivo in os.listdir(PASTA_PERFIS)
+                  if os.path.splitext(arquivo)[1].lower() in EXTENSOES)
@@ -0,0 +1,90 @@
+# PLANEJAMENTO EM LOTE - EDROM 2025
+# Distribui muitas consultas de caminho entre processos (ex: varreduras de
+# parâmetros de custo feitas offline).
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Tuple
+
+import candidato
+
+class PlanResult(NamedTuple):
+    path: List[Tuple[int, int]]
+    cost: float
+    expansions: int
+    pushes: int
+    tempo_s: float  # tempo da busca desta consulta (sem montagem do campo)
+
+# Estado de cada processo trabalhador, preenchido pelo initializer
+_campos = []          # (largura, altura, bytes da grade) de cada campo distinto
+_campos_montados = {}  # id do campo -> (OccupancyGrid, DangerField)
+_cost_model = None
+
+def _inicializar_trabalhador(campos, cost_model):
+    global _campos, _cost_model
+    _campos = campos
+    _campos_montados.clear()
+    _cost_model = cost_model
+
+def _campo(campo_id):
+    """Grade e campo de perigo do campo, montados uma vez por processo"""
+    if campo_id not in _campos_montados:
+        largura_grid, altura_grid, blocked = _campos[campo_id]
+        grid = candidato.OccupancyGrid.from_blocked(largura_grid, altura_grid, blocked)
+        modelo = _cost_model or candidato.DEFAULT_COST_MODEL
+        _campos_montados[campo_id] = (grid, modelo.danger_field(grid, largura_grid, altura_grid))
+    return _campos_montados[campo_id]
+
+def _planejar(tarefa):
+    campo_id, pos_inicial, pos_objetivo, tem_bola = tarefa
+    grid, campo_perigo = _campo(campo_id)
+    t0 = time.perf_counter()
+    resultado = candidato.a_star_search(grid, pos_inicial, pos_objetivo, tem_bola, campo_perigo, _cost_model)
+    return PlanResult(resultado.path, resultado.cost, resultado.expansions, resultado.pushes,
+                      time.perf_counter() - t0)
+
+def _separar_campos(queries):
+    """
+    Troca os obstáculos de cada consulta pelo id de um campo distinto, para que
+    cada grade seja enviada aos trabalhadores uma única vez.
+    """
+    campos = []
+    ids = {}
+    tarefas = []
+    for pos_inicial, pos_objetivo, obstaculos, dims, tem_bola in queries:
+        largura_grid, altura_grid = dims
+        if isinstance(obstaculos, candidato.OccupancyGrid):
+            chave = id(obstaculos)
+        else:
+            chave = (largura_grid, altura_grid, frozenset(obstaculos))
+        if chave not in ids:
+            grid = candidato.as_occupancy_grid(obstaculos, largura_grid, altura_grid)
+            ids[chave] = len(campos)
+            campos.append((largura_grid, altura_grid, bytes(grid.blocked)))
+        tarefas.append((ids[chave], pos_inicial, pos_objetivo, tem_bola))
+    return campos, tarefas
+
+def plan_many(queries, workers=None, cost_model=None, chunksize=None) -> List[PlanResult]:
+    """
+    Planeja uma lista de consultas (pos_inicial, pos_objetivo, obstaculos,
+    (largura, altura), tem_bola) em um ProcessPoolExecutor.
+
+    Os campos distintos vão para os trabalhadores uma vez, pelo initializer do
+    pool; cada tarefa carrega só o id do campo e as posições. Os resultados voltam
+    na ordem das consultas, com o tempo de busca de cada uma. Com workers=1 tudo
+    roda no próprio processo.
+    """
+    campos, tarefas = _separar_campos(queries)
+    if not tarefas:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _inicializar_trabalhador(campos, cost_model)
+        return [_planejar(tarefa) for tarefa in tarefas]
+
+    if chunksize is None:
+        chunksize = max(1, len(tarefas) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_trabalhador,
+                             initargs=(campos, cost_model)) as executor:
+        return list(executor.map(_planejar, tarefas, chunksize=chunksize))
@@ -0,0 +1,292 @@
+# REPLANEJAMENTO INCREMENTAL - EDROM 2025
+# D* Lite sobre o mesmo estado (célula, direção de chegada) e o mesmo modelo de
+# custo de candidato.a_star_search. Quando adversários andam uma célula por tick,
+# só a parte da árvore de busca afetada pela mudança é refeita.
+import heapq
+from typing import Tuple
+
+import candidato
+from candidato import HEADING_NONE, NUM_HEADINGS
+
+INF = float('inf')
+
+class IncrementalPlanner:
+    """
+    Planejador incremental (D* Lite) de pos_inicial até pos_objetivo.
+
+    A busca roda do objetivo para o robô, então mover o robô (move_start) e
+    adicionar/remover obstáculos (update_obstacles) reaproveitam os valores já
+    calculados. `expansions` guarda as expansões do último plan() e
+    `expansions_history` as de todas as chamadas.
+    """
+
+    def __init__(self, pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid,
+                 tem_bola=False, cost_model=None):
+        # Cópia própria da grade: ela é alterada a cada update_obstacles
+        self.grid = candidato.OccupancyGrid(largura_grid, altura_grid, list(obstaculos))
+        self.model = cost_model or candidato.DEFAULT_COST_MODEL
+        # Campo próprio (não o do cache do modelo): é alterado com a grade
+        self.danger_field = candidato.DangerField(self.grid, largura_grid, altura_grid, self.model.danger_tiers)
+        self.tem_bola = tem_bola
+
+        self._blocked = self.grid.blocked
+        self._offsets = self.grid.offsets
+        self._danger = self.danger_field.padded()  # atualizada no lugar por DangerField.update
+        self._steps = self.model.step_costs(tem_bola)
+        self._multiplier = self.model.multiplier(tem_bola)
+        self._diagonal = min(self.model.diagonal_cost, 2 * self.model.straight_cost) * self._multiplier
+        self._straight = self.model.straight_cost * self._multiplier
+
+        self.goal_cell = self.grid.index(*pos_objetivo)
+        self.start_state = self.grid.index(*pos_inicial) * NUM_HEADINGS + HEADING_NONE
+        self._start_y, self._start_x = divmod(self.start_state // NUM_HEADINGS, self.grid.stride)
+        self.km = 0.0
+
+        self.g = {}
+        self.rhs = {}
+        self._open = []
+        self._open_keys = {}  # estado -> chave atual no heap (as outras entradas estão desatualizadas)
+
+        self.expansions = 0
+        self.expansions_history = []
+
+        for heading in range(NUM_HEADINGS):
+            state = self.goal_cell * NUM_HEADINGS + heading
+            self.rhs[state] = 0.0
+            self._push(state)
+
+    # ------------------------------------------------------------------ #
+    # Grafo de estados
+    def _heuristic(self, state: int) -> float:
+        """Octile do robô até o estado: cota inferior consistente do custo"""
+        y, x = divmod(state // NUM_HEADINGS, self.grid.stride)
+        dx = abs(x - self._start_x)
+        dy = abs(y - self._start_y)
+        if dx < dy:
+            return self._diagonal * dx + self._straight * (dy - dx)
+        return self._diagonal * dy + self._straight * (dx - dy)
+
+    def _successors(self, state: int):
+        cell, heading = divmod(state, NUM_HEADINGS)
+        row = self._steps[heading]
+        for move in range(8):
+            next_cell = cell + self._offsets[move]
+            if not self._blocked[next_cell]:
+                yield next_cell * NUM_HEADINGS + move, (row[move] + self._danger[next_cell]) * self._multiplier
+
+    def _predecessors(self, state: int):
+        """Estados que chegam a `state` com um passo, e o custo desse passo"""
+        cell, move = divmod(state, NUM_HEADINGS)
+        if move == HEADING_NONE or self._blocked[cell]:
+            return
+        prev_cell = cell - self._offsets[move]
+        if self._blocked[prev_cell]:
+            return
+        danger = self._danger[cell]
+        headings = range(NUM_HEADINGS) if prev_cell * NUM_HEADINGS + HEADING_NONE == self.start_state else range(8)
+        for heading in headings:
+            yield prev_cell * NUM_HEADINGS + heading, (self._steps[heading][move] + danger) * self._multiplier
+
+    def _is_goal(self, state: int) -> bool:
+        return state // NUM_HEADINGS == self.goal_cell
+
+    def _compute_rhs(self, state: int) -> float:
+        g = self.g
+        blocked, danger, offsets = self._blocked, self._danger, self._offsets
+        cell, heading = divmod(state, NUM_HEADINGS)
+        row = self._steps[heading]
+        best = INF
+        for move in range(8):
+            next_cell = cell + offsets[move]
+            if blocked[next_cell]:
+                continue
+            g_next = g.get(next_cell * NUM_HEADINGS + move, INF)
+            if g_next < best:
+                value = (row[move] + danger[next_cell]) * self._multiplier + g_next
+                if value < best:
+                    best = value
+        return best
+
+    # ------------------------------------------------------------------ #
+    # Fila de prioridade do D* Lite
+    def _key(self, state: int) -> Tuple[float, float]:
+        best = min(self.g.get(state, INF), self.rhs.get(state, INF))
+        return best + self._heuristic(state) + self.km, best
+
+    def _push(self, state: int):
+        key = self._key(state)
+        self._open_keys[state] = key
+        heapq.heappush(self._open, (key[0], key[1], state))
+
+    def _update_vertex(self, state: int):
+        if self.g.get(state, INF) != self.rhs.get(state, INF):
+            self._push(state)
+        else:
+            self._open_keys.pop(state, None)
+
+    def _top(self):
+        """Remove entradas desatualizadas do topo e retorna (chave, estado) ou None"""
+        while self._open:
+            k1, k2, state = self._open[0]
+            if self._open_keys.get(state) == (k1, k2):
+                return (k1, k2), state
+            heapq.heappop(self._open)
+        return None
+
+    def _compute_shortest_path(self) -> int:
+        expansions = 0
+        g, rhs = self.g, self.rhs
+        start = self.start_state
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            key_old, state = top
+            start_g, start_rhs = g.get(start, INF), rhs.get(start, INF)
+            start_best = min(start_g, start_rhs)
+            # Chave do robô: a heurística dele até ele mesmo é zero
+            if not (key_old < (start_best + self.km, start_best) or start_rhs > start_g):
+                break
+
+            key_new = self._key(state)
+            if key_old < key_new:
+                self._push(state)
+                continue
+
+            heapq.heappop(self._open)
+            del self._open_keys[state]
+            expansions += 1
+            g_state = g.get(state, INF)
+            rhs_state = rhs.get(state, INF)
+
+            if g_state > rhs_state:
+                g[state] = rhs_state
+                for pred, cost in self._predecessors(state):
+                    if not self._is_goal(pred) and cost + rhs_state < rhs.get(pred, INF):
+                        rhs[pred] = cost + rhs_state
+                        self._update_vertex(pred)
+            else:
+                g[state] = INF
+                for pred, cost in self._predecessors(state):
+                    if not self._is_goal(pred) and rhs.get(pred, INF) == cost + g_state:
+                        rhs[pred] = self._compute_rhs(pred)
+                        self._update_vertex(pred)
+                if not self._is_goal(state):
+                    rhs[state] = self._compute_rhs(state)
+                self._update_vertex(state)
+        return expansions
+
+    # ------------------------------------------------------------------ #
+    # API pública
+    def plan(self) -> candidato.Path:
+        """
+        Repara a busca e retorna o caminho da posição atual do robô até o objetivo,
+        no mesmo formato de candidato.encontrar_caminho (vazio se não houver caminho).
+        """
+        self.expansions = self._compute_shortest_path()
+        self.expansions_history.append(self.expansions)
+
+        state = self.start_state
+        if self.rhs.get(state, INF) == INF and not self._is_goal(state):
+            return candidato.Path(stride=self.grid.stride)
+        path = candidato.Path([state // NUM_HEADINGS], self.grid.stride)
+        while not self._is_goal(state):
+            best, best_value = None, INF
+            for succ, cost in self._successors(state):
+                value = cost + self.g.get(succ, INF)
+                if value < best_value:
+                    best, best_value = succ, value
+            if best is None:
+                return candidato.Path(stride=self.grid.stride)
+            state = best
+            path.cells.append(state // NUM_HEADINGS)
+        return path
+
+    def path_cost(self) -> float:
+        """Custo ótimo atual do robô até o objetivo (após plan())"""
+        return 0.0 if self._is_goal(self.start_state) else self.rhs.get(self.start_state, INF)
+
+    def move_start(self, position: Tuple[int, int]):
+        """
+        Atualiza a posição do robô. Um passo para uma célula vizinha mantém a direção
+        de chegada; saltos maiores recomeçam sem direção (sem custo de rotação).
+        """
+        old_cell = self.start_state // NUM_HEADINGS
+        new_cell = self.grid.index(*position)
+        if new_cell == old_cell:
+            return
+        old_position = self.grid.position(old_cell)
+        heading = candidato.HEADING_INDEX.get((position[0] - old_position[0], position[1] - old_position[1]),
+                                              HEADING_NONE)
+
+        old_heuristic_origin = self.start_state
+        self.start_state = new_cell * NUM_HEADINGS + heading
+        self._start_y, self._start_x = divmod(new_cell, self.grid.stride)
+        # km acumula o quanto a heurística antiga superestima em relação à nova origem
+        self.km += self._heuristic(old_heuristic_origin)
+
+        if heading == HEADING_NONE and not self._is_goal(self.start_state):
+            # Estado sem direção não é predecessor de ninguém: calcula direto
+            self.rhs[self.start_state] = self._compute_rhs(self.start_state)
+            self._update_vertex(self.start_state)
+
+    def update_obstacles(self, added=(), removed=()):
+        """
+        Aplica adversários que entraram (`added`) ou saíram (`removed`) de células
+        e marca como inconsistentes só os estados cujas arestas mudaram de custo.
+        """
+        grid = self.grid
+        added = [pos for pos in added if pos not in grid]
+        removed = [pos for pos in removed if pos in grid]
+        if not added and not removed:
+            return
+
+        # Custo de entrar em cada célula da vizinhança afetada, antes da mudança
+        alcance = int(self.danger_field.radius) + 1
+        affected = {grid.index(x + dx, y + dy) for x, y in added + removed
+                    for dx in range(-alcance, alcance + 1) for dy in range(-alcance, alcance + 1)
+                    if 0 <= x + dx < grid.largura and 0 <= y + dy < grid.altura}
+        old_entry = {cell: INF if self._blocked[cell] else self._danger[cell] for cell in affected}
+
+        for pos in removed:
+            grid.remove_obstacle(pos)
+        for pos in added:
+            grid.add_obstacle(pos)
+        self.danger_field.update(grid, added + removed)
+
+        g, rhs = self.g, self.rhs
+        multiplier = self._multiplier
+        for cell in affected:
+            new_entry = INF if self._blocked[cell] else self._danger[cell]
+            if new_entry == old_entry[cell]:
+                continue
+
+            for move in range(8):
+                g_state = g.get(cell * NUM_HEADINGS + move, INF)
+                prev_cell = cell - self._offsets[move]
+                if self._blocked[prev_cell]:
+                    continue
+                headings = range(NUM_HEADINGS) if prev_cell * NUM_HEADINGS + HEADING_NONE == self.start_state \
+                    else range(8)
+                for heading in headings:
+                    pred = prev_cell * NUM_HEADINGS + heading
+                    if self._is_goal(pred):
+                        continue
+                    step = self._steps[heading][move]
+                    old_cost = (step + old_entry[cell]) * multiplier
+                    new_cost = (step + new_entry) * multiplier
+                    if new_cost < old_cost:
+                        if g_state != INF and new_cost + g_state < rhs.get(pred, INF):
+                            rhs[pred] = new_cost + g_state
+                            self._update_vertex(pred)
+                    elif g_state != INF and rhs.get(pred, INF) == old_cost + g_state:
+                        rhs[pred] = self._compute_rhs(pred)
+                        self._update_vertex(pred)
+
+            if (new_entry == INF) != (old_entry[cell] == INF):
+                # A célula abriu ou fechou: os estados nela também mudam de vizinhança
+                for heading in range(NUM_HEADINGS):
+                    state = cell * NUM_HEADINGS + heading
+                    if not self._is_goal(state):
+                        rhs[state] = INF if new_entry == INF else self._compute_rhs(state)
+                        self._update_vertex(state)
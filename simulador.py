@@ -1,9 +1,22 @@
 # SIMULADOR DESAFIO INDIVIDUAL EDROM - 2025
+# python simulador.py                    abre o simulador
+# python simulador.py --robos N          simulador do time com N robôs
+# python simulador.py --sem-tela 1000    roda episódios sem tela e sem espera (veja executar_sem_tela)
+import argparse
 import os
-import pygame
 import sys
+import time
 import candidato
 import random
+from benchmark import resumir
+from cache_planos import PlanCache
+from cooperativo import CooperativePlanner
+from custo_ate_objetivo import CostToGoMap
+
+try:
+    import pygame
+except ImportError:  # sem pygame só o modo --sem-tela funciona
+    pygame = None
 
 # Função auxiliar para carregar recursos
 def carregar_recurso(nome_arquivo):
@@ -54,6 +67,12 @@ COR_GOL = (255, 255, 0)
 COR_PAINEL = (40, 40, 40)
 COR_BOTAO = (80, 80, 80)
 COR_TEXTO_BOTAO = (255, 255, 255)
+COR_CAMINHOS_TIME = [(0, 255, 255), (255, 0, 255), (180, 255, 120), (255, 255, 255)]
+
+# Modelo de custo usado pelo planejador
+MODELO_CUSTO = candidato.DEFAULT_COST_MODEL
+# Consultas repetidas entre episódios não refazem a busca
+CACHE_PLANOS = PlanCache()
 
 # Dimensões da Grade e da Tela
 LARGURA_GRID = 20
@@ -94,15 +113,17 @@ def desenhar_botao(tela, fonte, rect, texto, cor_fundo, cor_texto):
     tela.blit(superficie_texto, rect_texto)
 
 # Lógica
-def resetar_cenario():
+def resetar_cenario(rng=None):
+    """Cenário aleatório novo; `rng` (ex: random.Random(seed)) torna o sorteio reprodutível"""
+    rng = rng or random
     # Posições fixas
     pos_robo = (2, ALTURA_GRID // 2)
     pos_gol = (LARGURA_GRID - 1, ALTURA_GRID // 2)
 
     # Posição da Bola
     while True:
-        pos_bola_x = random.randint(LARGURA_GRID // 2, LARGURA_GRID - 1)
-        pos_bola_y = random.randint(0, ALTURA_GRID - 1)
+        pos_bola_x = rng.randint(LARGURA_GRID // 2, LARGURA_GRID - 1)
+        pos_bola_y = rng.randint(0, ALTURA_GRID - 1)
         pos_bola = (pos_bola_x, pos_bola_y)
         if pos_bola != pos_gol and pos_bola != pos_robo:
             break
@@ -114,8 +135,8 @@ def resetar_cenario():
     
     tentativas = 0
     while len(obstaculos) < MAX_OBSTACULOS:
-        obs_x = random.randint(3, LARGURA_GRID - 1)
-        obs_y = random.randint(0, ALTURA_GRID - 1)
+        obs_x = rng.randint(3, LARGURA_GRID - 1)
+        obs_y = rng.randint(0, ALTURA_GRID - 1)
         pos_obs = (obs_x, obs_y)
 
         dist_do_robo = abs(pos_obs[0] - pos_robo[0]) + abs(pos_obs[1] - pos_robo[1])
@@ -134,10 +155,122 @@ def resetar_cenario():
 
     return {
         "pos_robo": pos_robo, "pos_bola": pos_bola, "pos_gol": pos_gol, "obstaculos": obstaculos,
-        "tem_bola": False, "caminho_atual": [], "simulacao_rodando": False,
-        "mensagem": "Cenário aleatório gerado!"
+        "campo_perigo": candidato.DangerField(obstaculos, LARGURA_GRID, ALTURA_GRID, MODELO_CUSTO.danger_tiers),
+        "mapa_gol": None, "tem_bola": False, "caminho_atual": [], "simulacao_rodando": False,
+        "mensagem": "Cenário aleatório gerado!", "passos": 0, "replanejamentos": 0
     }
 
+def passo(estado):
+    """
+    Avança um tick do robô: planeja se está sem caminho (até a bola, ou até o gol
+    com ela), anda uma posição e confere captura da bola. Retorna True no gol.
+    """
+    if not estado["caminho_atual"]:
+        estado["replanejamentos"] += 1
+        if estado["tem_bola"]:
+            # O gol não muda no episódio: o mapa de custo até ele é montado uma vez
+            mapa_gol = estado["mapa_gol"]
+            if mapa_gol is None or not mapa_gol.is_valid(estado["obstaculos"]):
+                mapa_gol = estado["mapa_gol"] = CostToGoMap(
+                    estado["pos_gol"], estado["obstaculos"], LARGURA_GRID, ALTURA_GRID, tem_bola=True,
+                    danger_field=estado["campo_perigo"], cost_model=MODELO_CUSTO)
+            estado["caminho_atual"] = mapa_gol.path_from(estado["pos_robo"])
+        else:
+            estado["caminho_atual"] = CACHE_PLANOS.encontrar_caminho(
+                pos_inicial=estado["pos_robo"], pos_objetivo=estado["pos_bola"], obstaculos=estado["obstaculos"],
+                largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID, tem_bola=False,
+                danger_field=estado["campo_perigo"], cost_model=MODELO_CUSTO)
+    if estado["caminho_atual"]:
+        estado["pos_robo"] = estado["caminho_atual"].popleft()
+    estado["passos"] += 1
+    if not estado["tem_bola"] and estado["pos_robo"] == estado["pos_bola"]:
+        estado["tem_bola"] = True
+        estado["caminho_atual"] = []
+        estado["mensagem"] = "Bola capturada! Rumo ao gol!"
+    return estado["tem_bola"] and estado["pos_robo"] == estado["pos_gol"]
+
+def executar_sem_tela(episodios=1000, seed=0, max_passos=500):
+    """
+    Roda episódios seguidos com a mesma lógica de main (resetar_cenario, passo,
+    captura e gol), sem pygame, sem clock.tick e sem a espera depois do gol:
+    o ritmo é o do planejador. Um episódio que passa de max_passos ticks (robô
+    sem caminho) conta como travado. Reprodutível por seed.
+    """
+    rng = random.Random(seed)
+    passos, replanejamentos = [], []
+    gols = travados = 0
+    inicio = time.perf_counter()
+    for _ in range(episodios):
+        estado = resetar_cenario(rng)
+        while not passo(estado):
+            if estado["passos"] >= max_passos:
+                travados += 1
+                break
+        else:
+            gols += 1
+            passos.append(estado["passos"])
+        replanejamentos.append(estado["replanejamentos"])
+    duracao = time.perf_counter() - inicio
+    return {
+        "episodios": episodios, "gols": gols, "travados": travados, "duracao_s": duracao,
+        "episodios_por_s": episodios / duracao if duracao > 0 else float('inf'),
+        "passos_ate_gol": resumir(passos), "replanejamentos": resumir(replanejamentos),
+    }
+
+def resetar_cenario_time(n_robos):
+    """
+    Cenário com um time de n_robos: cada robô tem a sua bola e leva ela até o gol.
+    Os obstáculos são os mesmos de resetar_cenario.
+    """
+    estado = resetar_cenario()
+    ocupadas = {estado["pos_gol"], *estado["obstaculos"]}
+    robos = []
+    for i in range(n_robos):
+        pos_robo = (2, (ALTURA_GRID * (i + 1)) // (n_robos + 1))
+        ocupadas.add(pos_robo)
+        while True:
+            pos_bola = (random.randint(LARGURA_GRID // 2, LARGURA_GRID - 1), random.randint(0, ALTURA_GRID - 1))
+            if pos_bola not in ocupadas:
+                break
+        ocupadas.add(pos_bola)
+        robos.append({"pos_robo": pos_robo, "pos_bola": pos_bola, "tem_bola": False, "marcou": False,
+                      "caminho_atual": []})
+    estado["robos"] = robos
+    estado["planejador"] = CooperativePlanner(estado["obstaculos"], LARGURA_GRID, ALTURA_GRID, MODELO_CUSTO,
+                                              estado["campo_perigo"])
+    return estado
+
+def replanejar_time(estado):
+    """
+    Replaneja todos os robôs em campo com o planejador cooperativo. Quem está com
+    a bola tem prioridade; os caminhos saem sincronizados a partir deste tick.
+    """
+    em_campo = [robo for robo in estado["robos"] if not robo["marcou"]]
+    em_campo.sort(key=lambda robo: not robo["tem_bola"])
+    # Quem chega ao gol sai de campo, então não estaciona nele
+    consultas = [(robo["pos_robo"], estado["pos_gol"] if robo["tem_bola"] else robo["pos_bola"], robo["tem_bola"],
+                  not robo["tem_bola"]) for robo in em_campo]
+    for robo, caminho in zip(em_campo, estado["planejador"].plan(consultas)):
+        robo["caminho_atual"] = caminho
+
+def passo_time(estado):
+    """Avança um tick do time; retorna True quando todos marcaram"""
+    em_campo = [robo for robo in estado["robos"] if not robo["marcou"]]
+    if any(not robo["caminho_atual"] for robo in em_campo):
+        replanejar_time(estado)
+    for robo in em_campo:
+        if robo["caminho_atual"]:
+            robo["pos_robo"] = robo["caminho_atual"].popleft()
+        if not robo["tem_bola"] and robo["pos_robo"] == robo["pos_bola"]:
+            robo["tem_bola"] = True
+            robo["caminho_atual"] = []
+            estado["mensagem"] = "Bola capturada! Rumo ao gol!"
+        elif robo["tem_bola"] and robo["pos_robo"] == estado["pos_gol"]:
+            robo["marcou"] = True  # sai de campo e libera o gol para os outros
+            robo["caminho_atual"] = []
+            estado["mensagem"] = "GOL!"
+    return all(robo["marcou"] for robo in estado["robos"])
+
 # Loop do Simulador
 def main():
     pygame.init()
@@ -173,23 +306,11 @@ def main():
                 if botao_reset.collidepoint(event.pos):
                     estado_jogo = resetar_cenario()
 
-        if estado_jogo["simulacao_rodando"]:
-            if not estado_jogo["caminho_atual"]:
-                objetivo_atual = estado_jogo["pos_bola"] if not estado_jogo["tem_bola"] else estado_jogo["pos_gol"]
-                estado_jogo["caminho_atual"] = candidato.encontrar_caminho(
-                    pos_inicial=estado_jogo["pos_robo"], pos_objetivo=objetivo_atual, obstaculos=estado_jogo["obstaculos"],
-                    largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID, tem_bola=estado_jogo["tem_bola"])
-            if estado_jogo["caminho_atual"]:
-                estado_jogo["pos_robo"] = estado_jogo["caminho_atual"].pop(0)
-            if not estado_jogo["tem_bola"] and estado_jogo["pos_robo"] == estado_jogo["pos_bola"]:
-                estado_jogo["tem_bola"] = True
-                estado_jogo["caminho_atual"] = []
-                estado_jogo["mensagem"] = "Bola capturada! Rumo ao gol!"
-            if estado_jogo["tem_bola"] and estado_jogo["pos_robo"] == estado_jogo["pos_gol"]:
-                estado_jogo["mensagem"] = "GOL! Cenário resetado."
-                pygame.display.flip()
-                pygame.time.wait(2000)
-                estado_jogo = resetar_cenario()
+        if estado_jogo["simulacao_rodando"] and passo(estado_jogo):
+            estado_jogo["mensagem"] = "GOL! Cenário resetado."
+            pygame.display.flip()
+            pygame.time.wait(2000)
+            estado_jogo = resetar_cenario()
 
         tela.fill(COR_FUNDO)
         desenhar_grade(tela)
@@ -225,5 +346,90 @@ def main():
         pygame.display.flip()
         clock.tick(5)
 
+def main_time(n_robos=3):
+    """Simulador com um time de n_robos planejado com reservas no espaço-tempo"""
+    pygame.init()
+    tela = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
+    pygame.display.set_caption(f"EDROM - Desafio A* ({n_robos} robôs)")
+    clock = pygame.time.Clock()
+    fonte_botao = pygame.font.Font(None, 28)
+
+    botao_play_pause = pygame.Rect(20, ALTURA_TELA - ALTURA_PAINEL + 10, 120, 40)
+    botao_reset = pygame.Rect(160, ALTURA_TELA - ALTURA_PAINEL + 10, 120, 40)
+
+    estado_jogo = resetar_cenario_time(n_robos)
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if botao_play_pause.collidepoint(event.pos):
+                    estado_jogo["simulacao_rodando"] = not estado_jogo["simulacao_rodando"]
+                    estado_jogo["mensagem"] = "Simulação em andamento..." if estado_jogo["simulacao_rodando"] else "Simulação pausada."
+                if botao_reset.collidepoint(event.pos):
+                    estado_jogo = resetar_cenario_time(n_robos)
+
+        if estado_jogo["simulacao_rodando"] and passo_time(estado_jogo):
+            estado_jogo["mensagem"] = "Todos marcaram! Cenário resetado."
+            pygame.display.flip()
+            pygame.time.wait(2000)
+            estado_jogo = resetar_cenario_time(n_robos)
+
+        tela.fill(COR_FUNDO)
+        desenhar_grade(tela)
+
+        desenhar_retangulo(tela, estado_jogo["pos_gol"], COR_GOL)
+        for obs in estado_jogo["obstaculos"]:
+            desenhar_retangulo(tela, obs, COR_OBSTACULO)
+
+        for i, robo in enumerate(estado_jogo["robos"]):
+            if robo["marcou"]:
+                continue
+            for passo in robo["caminho_atual"]:
+                desenhar_circulo(tela, passo, COR_CAMINHOS_TIME[i % len(COR_CAMINHOS_TIME)], raio_fator=0.15)
+            if robo["tem_bola"]:
+                desenhar_retangulo(tela, robo["pos_robo"], COR_ROBO_COM_BOLA)
+                desenhar_circulo(tela, robo["pos_robo"], COR_BOLA, raio_fator=0.3)
+            else:
+                desenhar_retangulo(tela, robo["pos_robo"], COR_ROBO)
+                desenhar_circulo(tela, robo["pos_bola"], COR_BOLA)
+
+        painel_rect = pygame.Rect(0, ALTURA_GRID * TAMANHO_CELULA, LARGURA_TELA, ALTURA_PAINEL)
+        pygame.draw.rect(tela, COR_PAINEL, painel_rect)
+
+        texto_play = "Pause" if estado_jogo["simulacao_rodando"] else "Play"
+        desenhar_botao(tela, fonte_botao, botao_play_pause, texto_play, COR_BOTAO, COR_TEXTO_BOTAO)
+        desenhar_botao(tela, fonte_botao, botao_reset, "Reset", COR_BOTAO, COR_TEXTO_BOTAO)
+
+        superficie_msg = fonte_botao.render(estado_jogo["mensagem"], True, COR_TEXTO_BOTAO)
+        tela.blit(superficie_msg, (botao_reset.right + 20, botao_reset.centery - superficie_msg.get_height() // 2))
+
+        pygame.display.flip()
+        clock.tick(5)
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Simulador do desafio EDROM")
+    parser.add_argument("--robos", type=int, help="Simulador do time com ROBOS robôs")
+    parser.add_argument("--sem-tela", type=int, metavar="EPISODIOS",
+                        help="Roda EPISODIOS episódios sem tela e sem espera e mostra as estatísticas")
+    parser.add_argument("--seed", type=int, default=0, help="Semente dos cenários do modo --sem-tela")
+    parser.add_argument("--max-passos", type=int, default=500,
+                        help="Ticks até um episódio do modo --sem-tela contar como travado")
+    args = parser.parse_args()
+
+    if args.sem_tela is not None:
+        resumo = executar_sem_tela(args.sem_tela, args.seed, args.max_passos)
+        print(f"{resumo['episodios']} episódios em {resumo['duracao_s']:.2f} s "
+              f"({resumo['episodios_por_s']:.1f} episódios/s): {resumo['gols']} gols, {resumo['travados']} travados")
+        print(f"  passos até o gol: média {resumo['passos_ate_gol']['media']:.1f} | "
+              f"p95 {resumo['passos_ate_gol']['p95']:.0f} | max {resumo['passos_ate_gol']['max']:.0f}")
+        print(f"  replanejamentos por episódio: média {resumo['replanejamentos']['media']:.2f} | "
+              f"max {resumo['replanejamentos']['max']:.0f}")
+    elif pygame is None:
+        sys.exit("O simulador com tela precisa do pygame (o modo --sem-tela funciona sem ele)")
+    elif args.robos is not None:
+        main_time(args.robos)
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,165 @@
+# SUAVIZAÇÃO DE CAMINHOS - EDROM 2025
+# Pós-processamento dos caminhos de candidato.encontrar_caminho: troca as
+# escadinhas de passos de 45° por poucos segmentos longos em qualquer ângulo
+# (string-pulling), com linha de visão conferida na OccupancyGrid.
+#
+# O custo de um caminho por waypoints usa o mesmo modelo de custo, com o robô
+# andando reto entre os waypoints: comprimento do segmento vezes o custo reto,
+# perigo de cada célula atravessada e a penalidade de rotação do ângulo entre
+# segmentos consecutivos (rotation_penalty_for_angle), tudo vezes o
+# multiplicador de bola. Para o caminho original, com waypoints nas curvas,
+# isso é o custo do A* (a menos de diagonal 1.414 contra sqrt(2)).
+from math import hypot
+from typing import List, NamedTuple, Tuple
+
+import candidato
+
+class SmoothedPath(NamedTuple):
+    waypoints: List[Tuple[int, int]]  # posição inicial, curvas que sobraram e objetivo
+    cells: candidato.Path             # waypoints ligados célula a célula (formato de encontrar_caminho)
+    cost_before: float  # custo por waypoints do caminho original (waypoints nas curvas)
+    cost_after: float   # custo por waypoints do caminho suavizado
+    grid_cost_before: float  # custo célula a célula (o do A*) do caminho original
+    grid_cost_after: float   # custo célula a célula de `cells`
+
+def line_cells(inicio: Tuple[int, int], fim: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """
+    Células da reta de inicio até fim por Bresenham, sem a inicial. Cada célula é
+    vizinha (8-conectada) da anterior, então o resultado é um caminho válido da grade.
+    """
+    x0, y0 = inicio
+    x1, y1 = fim
+    dx, dy = abs(x1 - x0), abs(y1 - y0)
+    sx = 1 if x1 > x0 else -1
+    sy = 1 if y1 > y0 else -1
+    erro = dx - dy
+    cells = []
+    x, y = x0, y0
+    for _ in range(max(dx, dy)):
+        dobro = 2 * erro
+        if dobro > -dy:
+            erro -= dy
+            x += sx
+        if dobro < dx:
+            erro += dx
+            y += sy
+        cells.append((x, y))
+    return cells
+
+class PathSmoother:
+    """
+    Suavizador para um campo fixo (grade, campo de perigo e modelo de custo).
+
+    smooth() anda pelas curvas do caminho: a partir do último waypoint aceito
+    tenta ligar direto às curvas seguintes enquanto houver linha de visão e o
+    custo por waypoints do trecho não aumentar, e para depois de `lookahead`
+    curvas recusadas seguidas. Cada teste custa o comprimento da reta, e só as
+    curvas (não todas as células) são candidatas, então caminhos longos com
+    poucas curvas saem baratos.
+    """
+
+    def __init__(self, obstaculos, largura_grid, altura_grid, danger_field=None, cost_model=None,
+                 lookahead: int = 3):
+        self.grid = candidato.as_occupancy_grid(obstaculos, largura_grid, altura_grid)
+        self.model = cost_model or candidato.DEFAULT_COST_MODEL
+        if danger_field is None and self.grid:
+            danger_field = self.model.danger_field(self.grid, largura_grid, altura_grid)
+        self.danger_field = danger_field
+        self.lookahead = lookahead
+
+    def _danger(self, position: Tuple[int, int]) -> float:
+        return self.danger_field.cost(position) if self.danger_field is not None else 0.0
+
+    def _visible(self, inicio: Tuple[int, int], fim: Tuple[int, int]) -> bool:
+        return not any(cell in self.grid for cell in line_cells(inicio, fim))
+
+    def _segment_cost(self, anterior, inicio, fim, tem_bola: bool) -> float:
+        """Custo (sem multiplicador) de andar de inicio até fim chegando de `anterior` (None no início)"""
+        model = self.model
+        custo = hypot(fim[0] - inicio[0], fim[1] - inicio[1]) * model.straight_cost
+        custo += sum(self._danger(cell) for cell in line_cells(inicio, fim))
+        if anterior is not None:
+            entrada = (inicio[0] - anterior[0], inicio[1] - anterior[1])
+            saida = (fim[0] - inicio[0], fim[1] - inicio[1])
+            rotacao = candidato.rotation_penalty_for_angle(entrada, saida, model.rotation_penalties)
+            custo += rotacao * (model.ball_rotation_multiplier if tem_bola else 1.0)
+        return custo
+
+    def waypoint_cost(self, waypoints: List[Tuple[int, int]], tem_bola: bool = False) -> float:
+        """Custo de seguir os waypoints em linha reta, segundo o modelo de custo"""
+        total = 0.0
+        for i in range(1, len(waypoints)):
+            total += self._segment_cost(waypoints[i - 2] if i > 1 else None, waypoints[i - 1], waypoints[i], tem_bola)
+        return total * self.model.multiplier(tem_bola)
+
+    def grid_cost(self, path: List[Tuple[int, int]], tem_bola: bool = False) -> float:
+        """Custo célula a célula (o mesmo de candidato.calculate_path_cost)"""
+        return candidato.calculate_path_cost(path, tem_bola, danger_field=self.danger_field, cost_model=self.model)
+
+    def smooth(self, path: List[Tuple[int, int]], tem_bola: bool = False) -> SmoothedPath:
+        """Suaviza um caminho no formato de encontrar_caminho (com a posição inicial)"""
+        path = [tuple(position) for position in path]
+        corners = corner_points(path)
+        cost_before = self.waypoint_cost(corners, tem_bola)
+        grid_cost_before = self.grid_cost(path, tem_bola)
+        sem_mudanca = candidato.Path.from_positions(path, self.grid.largura)
+        if len(corners) <= 2:
+            return SmoothedPath(corners, sem_mudanca, cost_before, cost_before, grid_cost_before, grid_cost_before)
+
+        waypoints = [corners[0]]
+        anchor = 0
+        while anchor < len(corners) - 1:
+            anterior = waypoints[-2] if len(waypoints) > 1 else None
+            inicio = corners[anchor]
+            # Trecho original de `inicio` até a curva j e dali até a próxima curva
+            # (o segmento seguinte ainda não foi decidido, então conta como no original)
+            original = self._segment_cost(anterior, inicio, corners[anchor + 1], tem_bola)
+            best = anchor + 1
+            recusas = 0
+            for j in range(anchor + 2, len(corners)):
+                original += self._segment_cost(corners[j - 2], corners[j - 1], corners[j], tem_bola)
+                if not self._visible(inicio, corners[j]):
+                    break
+                atalho = self._segment_cost(anterior, inicio, corners[j], tem_bola)
+                depois = corners[j + 1] if j + 1 < len(corners) else None
+                if depois is not None:
+                    atalho += self._segment_cost(inicio, corners[j], depois, tem_bola)
+                    comparado = original + self._segment_cost(corners[j - 1], corners[j], depois, tem_bola)
+                else:
+                    comparado = original
+                if atalho <= comparado + 1e-9:
+                    best = j
+                    recusas = 0
+                else:
+                    recusas += 1
+                    if recusas >= self.lookahead:
+                        break
+            waypoints.append(corners[best])
+            anchor = best
+
+        cost_after = self.waypoint_cost(waypoints, tem_bola)
+        if cost_after > cost_before:
+            # Os testes são locais; se o total piorou, fica o caminho original
+            return SmoothedPath(corners, sem_mudanca, cost_before, cost_before, grid_cost_before, grid_cost_before)
+        cells = [waypoints[0]]
+        for i in range(1, len(waypoints)):
+            cells.extend(line_cells(waypoints[i - 1], waypoints[i]))
+        return SmoothedPath(waypoints, candidato.Path.from_positions(cells, self.grid.largura), cost_before,
+                            cost_after, grid_cost_before, self.grid_cost(cells, tem_bola))
+
+def corner_points(path: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Posição inicial, células onde a direção muda e a final"""
+    if len(path) <= 2:
+        return list(path)
+    corners = [path[0]]
+    for i in range(1, len(path) - 1):
+        if (path[i][0] - path[i - 1][0], path[i][1] - path[i - 1][1]) != \
+                (path[i + 1][0] - path[i][0], path[i + 1][1] - path[i][1]):
+            corners.append(path[i])
+    corners.append(path[-1])
+    return corners
+
+def smooth_path(path, obstaculos, largura_grid, altura_grid, tem_bola=False, danger_field=None,
+                cost_model=None) -> SmoothedPath:
+    """Atalho: suaviza um caminho de encontrar_caminho no campo dado"""
+    return PathSmoother(obstaculos, largura_grid, altura_grid, danger_field, cost_model).smooth(path, tem_bola)
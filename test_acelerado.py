@@ -0,0 +1,49 @@
+# TESTES DE PARIDADE DO BACKEND COMPILADO - EDROM 2025
+# Confere com acelerado.check_parity que o A* de acelerado.py devolve os mesmos
+# caminhos, custos e expansões que o laço Python de candidato.py.
+#
+#   python -m pytest test_acelerado.py   (ou python -m unittest test_acelerado)
+import unittest
+
+import acelerado
+import perfis_custo
+
+SEEDS = (0, 1, 2)
+
+class ParityTest(unittest.TestCase):
+
+    def assertParity(self, relatorio: acelerado.ParityReport):
+        self.assertEqual(relatorio.path_mismatches, 0, relatorio)
+        self.assertEqual(relatorio.cost_mismatches, 0, relatorio)
+        self.assertEqual(relatorio.expansion_mismatches, 0, relatorio)
+        self.assertTrue(relatorio.ok)
+
+    def test_interpreted_kernel(self):
+        # O núcleo sem compilar é o código que o Numba compila; roda sem Numba, em
+        # campos pequenos porque é lento
+        for seed in SEEDS:
+            with self.subTest(seed=seed):
+                self.assertParity(acelerado.check_parity(12, sizes=((20, 15), (30, 20)), seed=seed,
+                                                         backend="interpreted"))
+
+    def test_interpreted_kernel_profiles(self):
+        for nome in perfis_custo.list_profiles():
+            with self.subTest(perfil=nome):
+                self.assertParity(acelerado.check_parity(6, sizes=((20, 15),), seed=3, backend="interpreted",
+                                                         cost_model=perfis_custo.get_profile(nome)))
+
+    @unittest.skipUnless(acelerado.NUMBA_AVAILABLE, "Numba não está instalado")
+    def test_numba_kernel(self):
+        for seed in SEEDS:
+            with self.subTest(seed=seed):
+                self.assertParity(acelerado.check_parity(100, seed=seed, backend="numba"))
+
+    @unittest.skipUnless(acelerado.NUMBA_AVAILABLE, "Numba não está instalado")
+    def test_numba_kernel_profiles(self):
+        for nome in perfis_custo.list_profiles():
+            with self.subTest(perfil=nome):
+                self.assertParity(acelerado.check_parity(50, seed=0, backend="numba",
+                                                         cost_model=perfis_custo.get_profile(nome)))
+
+if __name__ == '__main__':
+    unittest.main()
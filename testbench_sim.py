@@ -32,6 +32,9 @@ COR_CUSTO_ALTO = (255, 0, 0)
 COR_ZONA_PERIGO = (255, 100, 100, 100)
 COR_EXPLORADO = (100, 100, 255, 150)
 
+# Modelo de custo compartilhado com a busca (os custos exibidos batem com os do A*)
+MODELO_CUSTO = candidato.DEFAULT_COST_MODEL
+
 # Dimensões
 LARGURA_GRID = 20
 ALTURA_GRID = 15
@@ -47,7 +50,8 @@ class DebugInfo:
     """Classe para armazenar informações de debug do A*"""
     def __init__(self):
         self.nodes_explored = {}  # posição -> node info
-        self.open_list_history = []
+        self.open_list_history = []  # tamanho da lista aberta a cada expansão
+        self.search_stats = None  # candidato.SearchStats da última busca
         self.path_costs = {}
         self.movement_explanations = {}
         self.current_step = 0
@@ -78,46 +82,60 @@ def carregar_imagem_com_fallback(nome_arquivo, tamanho_fallback=(40, 40)):
         
         return imagem_fallback, str(e)
 
-def encontrar_caminho_com_debug(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False):
+def encontrar_caminho_com_debug(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False,
+                                danger_field=None, cost_model=None):
     """
     Versão modificada do A* que retorna informações de debug
     """
     debug_info = DebugInfo()
+    cost_model = cost_model or candidato.DEFAULT_COST_MODEL
+    
+    if danger_field is None and obstaculos:
+        danger_field = candidato.DangerField(obstaculos, largura_grid, altura_grid, cost_model.danger_tiers)
+
+    # Usar o algoritmo do candidato, com a versão instrumentada da busca
+    caminho, stats = candidato.encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid,
+                                                 tem_bola, danger_field=danger_field, cost_model=cost_model,
+                                                 return_stats=True)
+    debug_info.search_stats = stats
+    debug_info.open_list_history = stats.open_sizes
+    debug_info.nodes_explored = {
+        posicao: {'ordem': ordem, 'g': g, 'h': h, 'f': g + h}
+        for posicao, (ordem, g, h) in stats.closed_cells().items()
+    }
     
-    # Usar o algoritmo do candidato mas capturar informações de debug
-    caminho = candidato.encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola)
-    
-    # Calcular custos para cada célula do caminho
+    # Calcular custos para cada célula do caminho, com o mesmo modelo usado na busca
     if caminho:
         custo_total = 0
         for i in range(len(caminho)):
             current_pos = caminho[i]
-            prev_pos = caminho[i-1] if i > 0 else pos_inicial
-            next_pos = caminho[i+1] if i < len(caminho)-1 else None
+            prev_pos = caminho[i-1] if i > 0 else None
+            before_prev_pos = caminho[i-2] if i > 1 else None
             
-            if hasattr(candidato, 'calculate_movement_cost'):
+            if prev_pos is None:
+                custo = 0.0  # Posição inicial do robô
+            else:
                 custo = candidato.calculate_movement_cost(
-                    prev_pos, current_pos, 
-                    caminho[i-2] if i > 1 else None,
-                    tem_bola, obstaculos
+                    prev_pos, current_pos, before_prev_pos,
+                    tem_bola, obstaculos, danger_field, cost_model
                 )
-            else:
-                # Fallback para distância euclidiana simples
-                custo = candidato.euclidean_distance(prev_pos, current_pos)
             
             custo_total += custo
             debug_info.path_costs[current_pos] = custo
             
             # Explicação do movimento
-            explicacao = gerar_explicacao_movimento(prev_pos, current_pos, next_pos, tem_bola, obstaculos)
+            explicacao = gerar_explicacao_movimento(before_prev_pos, prev_pos, current_pos, tem_bola, obstaculos,
+                                                    cost_model, danger_field)
             debug_info.movement_explanations[current_pos] = explicacao
         
         debug_info.total_cost = custo_total
     
     return caminho, debug_info
 
-def gerar_explicacao_movimento(prev_pos, current_pos, next_pos, tem_bola, obstaculos):
+def gerar_explicacao_movimento(before_prev_pos, prev_pos, current_pos, tem_bola, obstaculos, cost_model=None,
+                               danger_field=None):
     """Gera explicação textual do custo de movimento"""
+    cost_model = cost_model or candidato.DEFAULT_COST_MODEL
     explicacoes = []
     
     # Tipo de movimento
@@ -126,29 +144,34 @@ def gerar_explicacao_movimento(prev_pos, current_pos, next_pos, tem_bola, obstac
         dy = abs(current_pos[1] - prev_pos[1])
         
         if dx == 1 and dy == 1:
-            explicacoes.append("Movimento diagonal (+1.41)")
+            explicacoes.append(f"Movimento diagonal (+{cost_model.diagonal_cost:.2f})")
         else:
-            explicacoes.append("Movimento reto (+1.0)")
+            explicacoes.append(f"Movimento reto (+{cost_model.straight_cost:.1f})")
     
     # Estado do robô
     if tem_bola:
-        explicacoes.append("Com bola (×1.5)")
+        explicacoes.append(f"Com bola (×{cost_model.multiplier(True):.1f})")
     
-    # Zona de perigo
+    # Zona de perigo: o custo cobrado pela busca (campo de perigo ou faixas do modelo)
     if obstaculos:
-        min_dist = min(candidato.euclidean_distance(current_pos, obs) for obs in obstaculos)
-        if min_dist <= 1.0:
-            explicacoes.append("Zona de perigo extrema (+3.0)")
-        elif min_dist <= 1.414:
-            explicacoes.append("Zona de perigo alta (+2.0)")
-        elif min_dist <= 2.0:
-            explicacoes.append("Zona de perigo média (+1.0)")
-        elif min_dist <= 2.5:
-            explicacoes.append("Zona de perigo baixa (+0.5)")
+        if danger_field is not None:
+            perigo = danger_field.cost(current_pos)
+        else:
+            perigo = candidato.calculate_danger_zone_cost(current_pos, obstaculos, cost_model)
+        if perigo > 0:
+            distancia = next((d for d, custo in cost_model.danger_tiers if custo == perigo), None)
+            if distancia is None:
+                explicacoes.append(f"Zona de perigo (+{perigo:.1f})")
+            else:
+                explicacoes.append(f"Zona de perigo, obstáculo a até {distancia:g} (+{perigo:.1f})")
     
     # Rotação
-    if prev_pos and next_pos:
-        explicacoes.append("Custo de rotação calculado")
+    if before_prev_pos and prev_pos:
+        rotacao = candidato.calculate_rotation_penalty(before_prev_pos, prev_pos, current_pos, cost_model)
+        if tem_bola:
+            rotacao *= cost_model.ball_rotation_multiplier
+        if rotacao > 0:
+            explicacoes.append(f"Rotação (+{rotacao:.1f})")
     
     return " | ".join(explicacoes) if explicacoes else "Movimento padrão"
 
@@ -226,6 +249,13 @@ def desenhar_caminho_com_custos(tela, caminho, debug_info):
             custo_texto = f"{debug_info.path_costs[passo]:.1f}"
             desenhar_texto_celula(tela, passo, custo_texto, cor, 14)
 
+def desenhar_explorados(tela, debug_info):
+    """Pinta as células expandidas pela última busca (o conjunto fechado)"""
+    superficie = pygame.Surface((TAMANHO_CELULA, TAMANHO_CELULA), pygame.SRCALPHA)
+    superficie.fill(COR_EXPLORADO)
+    for x, y in debug_info.nodes_explored:
+        tela.blit(superficie, (x * TAMANHO_CELULA, y * TAMANHO_CELULA + ALTURA_PAINEL_SUPERIOR))
+
 def desenhar_zonas_perigo(tela, obstaculos):
     """Desenha zonas de perigo ao redor dos obstáculos"""
     offset_x = 0
@@ -288,6 +318,14 @@ def desenhar_painel_info(tela, estado_jogo, debug_info, fonte):
         f"📏 Passos: {len(estado_jogo['caminho_atual'])}",
         ""
     ]
+    stats = debug_info.search_stats
+    if stats is not None:
+        info_texts[-1:] = [
+            f"🔎 Expansões: {stats.expansions} | Pushes: {stats.pushes}",
+            f"Pops obsoletos: {stats.stale_pops} | Maior fila: {stats.max_open}",
+            f"Tempo: custo {stats.cost_time_s * 1000:.1f} ms | heap {stats.heap_time_s * 1000:.1f} ms",
+            ""
+        ]
     
     for texto in info_texts:
         if texto:  # Pular linhas vazias
@@ -391,7 +429,9 @@ def resetar_cenario():
 
     return {
         "pos_robo": pos_robo, "pos_bola": pos_bola, "pos_gol": pos_gol, 
-        "obstaculos": obstaculos, "tem_bola": False, "caminho_atual": [], 
+        "obstaculos": obstaculos,
+        "campo_perigo": candidato.DangerField(obstaculos, LARGURA_GRID, ALTURA_GRID, MODELO_CUSTO.danger_tiers),
+        "tem_bola": False, "caminho_atual": [], 
         "debug_info": DebugInfo(), "simulacao_rodando": False,
         "mensagem": "🎮 Cenário gerado! Pressione Play para iniciar."
     }
@@ -436,13 +476,14 @@ def main():
                         objetivo_atual = estado_jogo["pos_bola"] if not estado_jogo["tem_bola"] else estado_jogo["pos_gol"]
                         caminho, debug_info = encontrar_caminho_com_debug(
                             estado_jogo["pos_robo"], objetivo_atual, estado_jogo["obstaculos"],
-                            LARGURA_GRID, ALTURA_GRID, estado_jogo["tem_bola"]
+                            LARGURA_GRID, ALTURA_GRID, estado_jogo["tem_bola"], estado_jogo["campo_perigo"],
+                            MODELO_CUSTO
                         )
                         estado_jogo["caminho_atual"] = caminho
                         estado_jogo["debug_info"] = debug_info
                     
                     if estado_jogo["caminho_atual"]:
-                        estado_jogo["pos_robo"] = estado_jogo["caminho_atual"].pop(0)
+                        estado_jogo["pos_robo"] = estado_jogo["caminho_atual"].popleft()
                         estado_jogo["mensagem"] = f"👣 Passo executado. Restam {len(estado_jogo['caminho_atual'])} passos."
 
         # Lógica de simulação automática
@@ -451,13 +492,14 @@ def main():
                 objetivo_atual = estado_jogo["pos_bola"] if not estado_jogo["tem_bola"] else estado_jogo["pos_gol"]
                 caminho, debug_info = encontrar_caminho_com_debug(
                     estado_jogo["pos_robo"], objetivo_atual, estado_jogo["obstaculos"],
-                    LARGURA_GRID, ALTURA_GRID, estado_jogo["tem_bola"]
+                    LARGURA_GRID, ALTURA_GRID, estado_jogo["tem_bola"], estado_jogo["campo_perigo"],
+                    MODELO_CUSTO
                 )
                 estado_jogo["caminho_atual"] = caminho
                 estado_jogo["debug_info"] = debug_info
             
             if estado_jogo["caminho_atual"]:
-                estado_jogo["pos_robo"] = estado_jogo["caminho_atual"].pop(0)
+                estado_jogo["pos_robo"] = estado_jogo["caminho_atual"].popleft()
             
             # Verificar se pegou a bola
             if not estado_jogo["tem_bola"] and estado_jogo["pos_robo"] == estado_jogo["pos_bola"]:
@@ -483,6 +525,9 @@ def main():
         
         # Desenhar zonas de perigo
         desenhar_zonas_perigo(tela, estado_jogo["obstaculos"])
+
+        # Desenhar células exploradas pela última busca
+        desenhar_explorados(tela, estado_jogo["debug_info"])
         
         # Desenhar caminho com custos
         if estado_jogo["caminho_atual"]: